@@ -3,13 +3,53 @@ from .fvMesh import fvMesh
 from .mapParticleToPlane import MapParticleToPlane
 from .ofFileReader import readOpenFOAMFile
 from .ofFileReader import readOpenFOAMDictionary
-from .ofFileWriter import writeOpenFOAMFile
-from .samplePlaneReader import samplePlaneReader
+from .ofFileReader import readParticlePositions
+from .ofFileWriter import writeOpenFOAMFile, writeOpenFOAMFiles
+from .samplePlaneReader import samplePlaneReader, planeMeanVariance, readPlaneSeries
+from . import fvc
+from .volPointInterpolation import volPointInterpolation
+from .polyBoundaryMesh import readPolyBoundaryMesh
+from .patchIntegrals import patchIntegrals, patchIntegralTimeSeries
+from .cuttingPlane import cuttingPlane
+from .sampleLine import sampleLine
+from . import meshQuality
+from .foamToVTK import foamToVTK
+from .particleBinning import particleBinning
+from .decomposedMesh import readDecomposedMesh, decomposedMesh
+from .fvMeshSubset import fvMeshSubset, readCellZones, readCellSet, cellsInBox, cellsInSphere
+from .sharedMesh import sharedMesh, attachSharedMesh
+from .decomposedFieldWriter import decomposedFieldWriter
+from .cloudWriter import writeLagrangianCloud
 
 __all__ = ["sampleLineReader",
            "fvMesh",
            "MapParticleToPlane",
            "readOpenFOAMFile",
            "writeOpenFOAMFile",
+           "writeOpenFOAMFiles",
            "samplePlaneReader",
-           "readOpenFOAMDictionary"]
\ No newline at end of file
+           "planeMeanVariance",
+           "readPlaneSeries",
+           "readOpenFOAMDictionary",
+           "readParticlePositions",
+           "fvc",
+           "volPointInterpolation",
+           "readPolyBoundaryMesh",
+           "patchIntegrals",
+           "patchIntegralTimeSeries",
+           "cuttingPlane",
+           "sampleLine",
+           "meshQuality",
+           "foamToVTK",
+           "particleBinning",
+           "readDecomposedMesh",
+           "decomposedMesh",
+           "fvMeshSubset",
+           "readCellZones",
+           "readCellSet",
+           "cellsInBox",
+           "cellsInSphere",
+           "sharedMesh",
+           "attachSharedMesh",
+           "decomposedFieldWriter",
+           "writeLagrangianCloud"]
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Write Lagrangian clouds, e.g., initial particle distributions generated in
+python, to the lagrangian directory of a case:
+
+    from ofReader.cloudWriter import writeLagrangianCloud
+
+    cells = mesh.findCells(positions)
+    writeLagrangianCloud('path/to/case',0,'sprayCloud',positions,cells,
+                         {'d': d, 'U': U, 'nParticle': nParticle, 'origId': ids})
+
+The positions are written in the legacy format (x y z) celli of the
+Cloud<passiveParticle> class, i.e., the cell label of each particle but no
+barycentric coordinates. The fields are written as scalarField, vectorField
+or labelField depending on their shape and data type.
+
+With a map of the processor of each cell, e.g., the cellDecomposition
+written by decomposePar -cellDist, the cloud is split to the processor
+directories of a decomposed case. The cells of each processor are numbered
+in the order of the global cells, as done by decomposePar.
+"""
+
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from ofReader.fileHeader import FileHeader
+from ofReader.ofFileWriter import writeFoamFileHeader, openOutputFile, compressionLevel
+from ofReader.ofStream import ofStream
+
+# Class of the positions file recognized by FileHeader
+_positionsClass = "Cloud<passiveParticle>"
+
+
+def _fieldHeader(file_header : FileHeader,values):
+    """File header of a particle field with the format of file_header and
+    the type given by the data"""
+    header = FileHeader()
+    header.format = file_header.format
+    header.labelSize = file_header.labelSize
+    header.scalarSize = file_header.scalarSize
+    if np.issubdtype(values.dtype,np.integer):
+        header.type = "label"
+    elif values.ndim == 2 and values.shape[1] == 3:
+        header.type = "vectorField"
+    elif values.ndim == 1:
+        header.type = "scalar"
+    else:
+        raise ValueError(f"Unsupported particle field of shape {values.shape}")
+    return header
+
+
+def _fieldClass(header : FileHeader):
+    return {"label": "labelField", "vectorField": "vectorField", "scalar": "scalarField"}[header.type]
+
+
+def _writePositions(stream : ofStream,positions,cells):
+    """Write the list of the particles in the format (x y z) celli"""
+    header = stream.fileHeader
+    stream.write(f"\n{len(positions):d}\n(")
+    if stream.binary:
+        # Each particle is a new line and the position and cell label
+        # enclosed in brackets, written as one block of records
+        particleDataType = np.dtype([
+            ('opening', 'V2'),
+            ('position', np.dtype(header.scalarDataType).newbyteorder('<'), 3),
+            ('celli', np.dtype(header.labelDataType).newbyteorder('<')),
+            ('closing', 'V1')])
+        particles = np.empty(len(positions),dtype=particleDataType)
+        particles['opening'] = np.void(b"\n(")
+        particles['position'] = positions
+        particles['celli'] = cells
+        particles['closing'] = np.void(b")")
+        stream.writeBinary(particles)
+        stream.write("\n)\n")
+        return
+
+    # The cell labels are exact in the float array of the chunk
+    stream.write("\n")
+    component = f"%.{stream.precision}g"
+    lineFormat = f"({component} {component} {component}) %d\n"
+    for start in range(0,len(positions),ofStream.chunkSize):
+        chunk = np.column_stack([positions[start:start+ofStream.chunkSize],
+                                 cells[start:start+ofStream.chunkSize]])
+        stream.write((lineFormat*len(chunk)) % tuple(chunk.ravel().tolist()))
+    stream.write(")\n")
+
+
+def _writeCloudFiles(args):
+    """Worker function to write the positions and fields of one cloud
+    directory"""
+    cloudPath, location, file_header, positions, cells, fields, precision, level = args
+    os.makedirs(cloudPath,exist_ok=True)
+    written = []
+    files = [("positions",file_header,None)] + \
+        [(name,_fieldHeader(file_header,values),values) for name, values in fields.items()]
+    for name, header, values in files:
+        filePath = os.path.join(cloudPath,name) + ('.gz' if level else '')
+        with openOutputFile(filePath,level) as fp:
+            stream = ofStream(fp,header,precision)
+            if values is None:
+                writeFoamFileHeader(stream,header,name,_positionsClass,location)
+                _writePositions(stream,positions,cells)
+            else:
+                writeFoamFileHeader(stream,header,name,_fieldClass(header),location)
+                stream.writeList(values,"label" if header.type == "label" else "scalar")
+                stream.write("\n")
+        written.append(filePath)
+    return written
+
+
+def writeLagrangianCloud(casePath,time,cloudName,positions,cells,fields=None,file_header=None,**kwargs):
+    """Write the positions and fields of a Lagrangian cloud
+
+    Input:
+    ------
+        casePath : string
+            Path to the case
+        time : string or float
+            Name of the time directory
+        cloudName : string
+            Name of the cloud directory in <time>/lagrangian
+        positions : particle positions of dimension [nParticles,3]
+        cells : cell label of each particle [nParticles]
+        fields : dict
+            Particle fields with the field name as key, e.g., d [nParticles]
+            or U [nParticles,3]. Integer arrays are written as labelField.
+        file_header : FileHeader
+            Format, label and scalar size of the files, ASCII by default
+
+    Optional Parameters:
+    --------------------
+        cellToProcessor : array [nCells]
+            Processor of each global cell. The cloud is split and written
+            to the processor directories of the case.
+        nWorkers : int
+            Number of worker processes writing the processor directories
+        precision : int
+            Significant digits in ASCII format, by default 6
+        compression : int or bool
+            gzip compression level, see writeOpenFOAMFile
+
+    Returns:
+    --------
+        List of the written files
+    """
+    file_header = file_header if file_header is not None else FileHeader()
+    timeName = time if isinstance(time,str) else f'{time:g}'
+    location = f"{timeName}/lagrangian/{cloudName}"
+    precision = kwargs.get('precision',6)
+    level = compressionLevel(kwargs.get('compression',None))
+
+    positions = np.asarray(positions,dtype=float).reshape(-1,3)
+    cells = np.asarray(cells,dtype=np.int64)
+    fields = {name: np.asarray(values) for name, values in (fields or {}).items()}
+    for name, values in fields.items():
+        if len(values) != len(positions):
+            raise ValueError(f"Field {name} has {len(values)} values for {len(positions)} particles")
+
+    cellToProcessor = kwargs.get('cellToProcessor',None)
+    if cellToProcessor is None:
+        cloudPath = os.path.join(casePath,timeName,'lagrangian',cloudName)
+        return _writeCloudFiles((cloudPath,location,file_header,positions,cells,fields,precision,level))
+
+    cellToProcessor = np.asarray(cellToProcessor,dtype=np.int64)
+    if np.any((cells < 0) | (cells >= len(cellToProcessor))):
+        raise ValueError("All particles require a valid cell to split the cloud to the processors")
+
+    # Local cell label of each global cell, the cells of each processor are
+    # in the order of the global cells
+    order = np.argsort(cellToProcessor,kind='stable')
+    nProcessorCells = np.bincount(cellToProcessor)
+    processorStart = np.zeros(len(nProcessorCells)+1,dtype=np.int64)
+    np.cumsum(nProcessorCells,out=processorStart[1:])
+    localCell = np.empty(len(cellToProcessor),dtype=np.int64)
+    localCell[order] = np.arange(len(order)) - processorStart[cellToProcessor[order]]
+
+    particleProcessor = cellToProcessor[cells]
+    tasks = []
+    for proci in range(len(nProcessorCells)):
+        particles = np.nonzero(particleProcessor == proci)[0]
+        cloudPath = os.path.join(casePath,f"processor{proci}",timeName,'lagrangian',cloudName)
+        tasks.append((cloudPath,location,file_header,positions[particles],localCell[cells[particles]],
+                      {name: values[particles] for name, values in fields.items()},precision,level))
+    with ProcessPoolExecutor(max_workers=kwargs.get('nWorkers',None)) as executor:
+        return [filePath for written in executor.map(_writeCloudFiles,tasks) for filePath in written]
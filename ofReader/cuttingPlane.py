@@ -0,0 +1,207 @@
+import numpy as np
+from ofReader.samplePlaneReader import samplePlaneReader
+
+
+class cuttingPlane:
+    """Cut the mesh with a plane and sample cell values on the cut
+
+    The cut is calculated once for the mesh: the points are classified by
+    their signed distance to the plane, only the edges of faces crossing
+    the plane are intersected and the intersection points of each cut cell
+    are ordered to a polygon. Sampling further fields or time steps only
+    gathers the cell values of the cut cells.
+
+    The cut polygons are described in the 2D coordinate system of the
+    plane, given by the point of the plane as origin and the two in-plane
+    axes e1 and e2.
+
+    Usage:
+    ------
+        mesh = fvMesh('path/to/case')
+        plane = cuttingPlane(mesh,point=(0,0,0.1),normal=(0,0,1))
+        for time in ['0.1','0.2']:
+            T = readOpenFOAMFile('path/to/case/'+time+'/T')
+            reader = plane.sample(T)
+            reader.plot(ax)
+    """
+
+    def __init__(self,mesh,point,normal,**kwargs):
+        """Calculate the cut of the mesh
+
+        Input:
+        ------
+            mesh : fvMesh
+            point : point on the plane
+            normal : normal vector of the plane
+
+        Optional Parameters:
+        --------------------
+            e1 : vector
+                Direction of the first in-plane axis. By default the
+                coordinate axis least aligned with the normal is projected
+                on the plane.
+        """
+        self._mesh = mesh
+        self._point = np.asarray(point,dtype=float)
+        self._normal = np.asarray(normal,dtype=float)
+        self._normal = self._normal/np.linalg.norm(self._normal)
+
+        if 'e1' in kwargs:
+            e1 = np.asarray(kwargs['e1'],dtype=float)
+        else:
+            e1 = np.zeros(3)
+            e1[np.argmin(np.abs(self._normal))] = 1.0
+        e1 = e1 - np.dot(e1,self._normal)*self._normal
+        self._e1 = e1/np.linalg.norm(e1)
+        self._e2 = np.cross(self._normal,self._e1)
+
+        self._cut()
+
+    def _cut(self):
+        mesh = self._mesh
+        points = mesh.points
+        d = (points-self._point) @ self._normal
+        # Snap points within round-off distance onto the plane, otherwise
+        # they would create degenerated polygons
+        d[np.abs(d) < 1E-10*np.ptp(points,axis=0).max()] = 0.0
+        # Points on the plane count to the positive side
+        side = d >= 0
+
+        # All face edges as pairs of points a-b
+        offsets, labels = mesh.compactFaces()
+        nextIndex = np.arange(1,len(labels)+1)
+        nextIndex[offsets[1:]-1] = offsets[:-1]
+        crossed = side[labels] != side[labels[nextIndex]]
+        edgeFaces = np.repeat(np.arange(mesh.nFaces),np.diff(offsets))[crossed]
+        a = labels[crossed].astype(np.int64)
+        b = labels[nextIndex[crossed]].astype(np.int64)
+
+        # Intersection points are identified by their edge, or by the point
+        # if the plane passes through a point of the mesh
+        nPoints = len(points)
+        key = np.minimum(a,b)*nPoints + np.maximum(a,b)
+        key = np.where(d[a] == 0,a*nPoints+a,key)
+        key = np.where(d[b] == 0,b*nPoints+b,key)
+        cutKeys, edgeCutPoint = np.unique(key,return_inverse=True)
+        pointA = cutKeys // nPoints
+        pointB = cutKeys % nPoints
+        dA = d[pointA]
+        dB = d[pointB]
+        denominator = np.where(dA == dB,1.0,dA-dB)
+        self._cutPointEdges = np.column_stack((pointA,pointB))
+        self._cutPointWeights = np.where(dA == dB,0.0,dA/denominator)
+        cutPoints3D = points[pointA] + self._cutPointWeights[:,None]*(points[pointB]-points[pointA])
+
+        # Cut points of each cell from the crossed faces of the cell
+        internal = edgeFaces < mesh.nInternalFaces
+        cells = np.concatenate((mesh.owner[edgeFaces],mesh.neighbour[edgeFaces[internal]]))
+        cellPoints = np.concatenate((edgeCutPoint,edgeCutPoint[internal]))
+        pairs = np.unique(cells.astype(np.int64)*len(cutKeys)+cellPoints)
+        cells = pairs // len(cutKeys)
+        cellPoints = pairs % len(cutKeys)
+
+        # Order the points of each cell by their angle around the cell's
+        # cut point average in the plane
+        uv = np.column_stack(((cutPoints3D-self._point) @ self._e1,
+                              (cutPoints3D-self._point) @ self._e2))
+        cutCells, cellIndex, nCellPoints = np.unique(cells,return_inverse=True,return_counts=True)
+        center = np.zeros((len(cutCells),2))
+        for i in range(2):
+            center[:,i] = np.bincount(cellIndex,uv[cellPoints,i])/nCellPoints
+        delta = uv[cellPoints]-center[cellIndex]
+        angle = np.arctan2(delta[:,1],delta[:,0])
+        order = np.lexsort((angle,cellIndex))
+
+        # Cells touching the plane only in a point or an edge have no polygon
+        valid = nCellPoints >= 3
+        keep = valid[cellIndex[order]]
+        polygonPoints = cellPoints[order][keep]
+        nPolygonPoints = nCellPoints[valid]
+
+        # Only keep the cut points used by the polygons
+        usedPoints, polygonPoints = np.unique(polygonPoints,return_inverse=True)
+        self._cutPointEdges = self._cutPointEdges[usedPoints]
+        self._cutPointWeights = self._cutPointWeights[usedPoints]
+        self._points3D = cutPoints3D[usedPoints]
+        self._points = uv[usedPoints]
+
+        self._cutCells = cutCells[valid]
+        self._faceOffsets = np.zeros(len(self._cutCells)+1,dtype=np.int64)
+        np.cumsum(nPolygonPoints,out=self._faceOffsets[1:])
+        self._faceLabels = polygonPoints
+
+        self._pos = self._polygonCenters()
+
+    def _polygonCenters(self):
+        """Area weighted centers of the cut polygons in plane coordinates"""
+        offsets = self._faceOffsets
+        labels = self._faceLabels
+        nFaces = len(offsets)-1
+        faceIndex = np.repeat(np.arange(nFaces),np.diff(offsets))
+        nextIndex = np.arange(1,len(labels)+1)
+        nextIndex[offsets[1:]-1] = offsets[:-1]
+
+        p = self._points[labels]
+        q = self._points[labels[nextIndex]]
+        cross = p[:,0]*q[:,1] - q[:,0]*p[:,1]
+        area = 0.5*np.bincount(faceIndex,cross,minlength=nFaces)
+        center = np.zeros((nFaces,2))
+        for i in range(2):
+            center[:,i] = np.bincount(faceIndex,(p[:,i]+q[:,i])*cross,minlength=nFaces)/(6.0*area)
+        return center
+
+    def sample(self,field):
+        """Sample the cell values of a field on the plane
+
+        Input:
+        ------
+            field : ofVolField or numpy array of the cell values
+
+        Returns:
+        --------
+            samplePlaneReader with the values of the cut polygons
+        """
+        reader = samplePlaneReader()
+        reader.setData(self.values(field),self._pos,self.compactFaces(),self._points)
+        return reader
+
+    def values(self,field):
+        """Cell values of the cut cells, ordered as the cut polygons"""
+        return self._mesh.cellValues(field)[self._cutCells]
+
+    @property
+    def cutCells(self):
+        """Mesh cell of each cut polygon"""
+        return self._cutCells
+
+    @property
+    def pos(self):
+        """Centers of the cut polygons in plane coordinates [nFaces,2]"""
+        return self._pos
+
+    @property
+    def points(self):
+        """Points of the cut polygons in plane coordinates [nPoints,2]"""
+        return self._points
+
+    @property
+    def points3D(self):
+        """Points of the cut polygons in global coordinates [nPoints,3]"""
+        return self._points3D
+
+    @property
+    def faces(self):
+        """Point labels of each cut polygon"""
+        return np.split(self._faceLabels,self._faceOffsets[1:-1])
+
+    def compactFaces(self):
+        """Cut polygons as offsets and point labels"""
+        return self._faceOffsets, self._faceLabels
+
+    @property
+    def e1(self):
+        return self._e1
+
+    @property
+    def e2(self):
+        return self._e2
@@ -0,0 +1,264 @@
+"""
+Write a global field directly to the processor directories of a decomposed
+case, e.g., to restart a decomposed run from a field computed in python
+without writing the global field and running decomposePar:
+
+    from ofReader.decomposedFieldWriter import decomposedFieldWriter
+
+    writer = decomposedFieldWriter('path/to/case')
+    T = readOpenFOAMFile('path/to/case/0/T')
+    ...
+    writer.write(T,'T',time=0,file_header=header,dimensions=[0,0,0,1,0,0,0])
+
+The processor addressing is read once when the writer is created. The
+internal field of each processor is selected by its cellProcAddressing and
+the patch values by the faceProcAddressing. Processor patches get the
+average of the cell values on both sides of the face. The processor files
+are written by a pool of worker processes, or as a single collated file
+processors<N>/<time>/<field> as written by OpenFOAM's collated file
+handler.
+"""
+
+import numpy as np
+import copy
+import io
+import os
+import gzip
+from concurrent.futures import ProcessPoolExecutor
+from ofReader.ofFileReader import readOpenFOAMFile, processorDirectories
+from ofReader.ofBoundaryData import ofBoundaryData, Patch
+from ofReader.ofFileWriter import writeOpenFOAMFile, writeOpenFOAMField, writeFoamFileHeader, fieldClassName, \
+    compressionLevel, openOutputFile
+from ofReader.polyBoundaryMesh import readPolyBoundaryMesh
+
+def _readAddressing(processorPath):
+    """Worker function to read the addressing of one processor"""
+    meshPath = os.path.join(processorPath,'constant','polyMesh')
+    def readLabels(name):
+        return np.asarray(readOpenFOAMFile(os.path.join(meshPath,name)),dtype=np.int64)
+    boundary = readPolyBoundaryMesh(os.path.join(meshPath,'boundary'))
+    return {
+        'cellProcAddressing'    : readLabels('cellProcAddressing'),
+        'faceProcAddressing'    : readLabels('faceProcAddressing'),
+        'boundaryProcAddressing': readLabels('boundaryProcAddressing'),
+        'owner'    : readLabels('owner'),
+        'patches'  : [(patch.name,patch.type,patch.startFace,patch.nFaces) for patch in boundary]}
+
+
+def _writeProcessorField(args):
+    """Worker function to write the field of one processor"""
+    filePath, file_header, data, boundary, dimensions, kwargs = args
+    os.makedirs(os.path.dirname(filePath),exist_ok=True)
+    return writeOpenFOAMFile(filePath,file_header,data,boundary,dimensions,**kwargs)
+
+
+def _processorBlock(args):
+    """Worker function to format the field of one processor as block of a
+    collated file, only the first block has a FoamFile header. With
+    compression the block is a gzip member of the compressed file."""
+    index, name, location, file_header, data, boundary, dimensions, precision, level = args
+    buffer = io.BytesIO()
+    writeOpenFOAMField(buffer,file_header,name,data,boundary,dimensions,
+                       location=location,precision=precision,header=index == 0)
+    content = buffer.getvalue()
+    block = f"\n// Processor{index}\n{len(content):d}\n(".encode() + content + b")\n"
+    return gzip.compress(block,compresslevel=level) if level else block
+
+
+class decomposedFieldWriter:
+    """Write global volume fields to the processor directories of a
+    decomposed case
+
+    Usage:
+    ------
+        writer = decomposedFieldWriter('path/to/case',nWorkers=8)
+        for name, field in fields.items():
+            writer.write(field,name,time=0,file_header=header,dimensions=dims)
+        # Or a single collated file processors8/0/U
+        writer.write(U,'U',time=0,file_header=header,dimensions=dims,collated=True)
+    """
+
+    def __init__(self,casePath,nWorkers=None):
+        """Read the processor addressing of the case
+
+        Input:
+        ------
+            casePath : string
+                Path to the case with the processor directories
+            nWorkers : int
+                Number of worker processes, by default the number of CPUs
+        """
+        self._casePath = casePath
+        self._nWorkers = nWorkers
+        self._processorPaths = processorDirectories(casePath)
+        if not self._processorPaths:
+            raise FileNotFoundError(f"No processor directories found in {casePath}")
+        with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+            self._addressing = list(executor.map(_readAddressing,self._processorPaths))
+        self._nCells = max(int(a['cellProcAddressing'].max(initial=-1)) for a in self._addressing) + 1
+        self._calcPatchAddressing()
+
+    def _calcPatchAddressing(self):
+        """Global start face of each patch and the global cell on the other
+        side of each processor patch face"""
+        self._patchStart = {}
+        self._patchSize = {}
+        faces = []
+        cells = []
+        for a in self._addressing:
+            globalFaces = np.abs(a['faceProcAddressing'])-1
+            for (name, patchType, startFace, nFaces), index in zip(a['patches'],a['boundaryProcAddressing']):
+                patchFaces = globalFaces[startFace:startFace+nFaces]
+                if index >= 0:
+                    self._patchSize[name] = self._patchSize.get(name,0) + nFaces
+                    if nFaces > 0:
+                        self._patchStart[name] = min(self._patchStart.get(name,patchFaces[0]),patchFaces.min())
+                elif patchType == "processor":
+                    faces.append(patchFaces)
+                    cells.append(a['cellProcAddressing'][a['owner'][startFace:startFace+nFaces]])
+
+        # Each internal face on a processor boundary is found on two
+        # processors, the pairs are neighbours after sorting by the face
+        faces = np.concatenate(faces) if faces else np.zeros(0,dtype=np.int64)
+        cells = np.concatenate(cells) if cells else np.zeros(0,dtype=np.int64)
+        order = np.argsort(faces,kind='stable')
+        if len(order) % 2 or np.any(faces[order[0::2]] != faces[order[1::2]]):
+            raise ValueError(f"Unmatched processor patch faces in {self._casePath}")
+        self._otherCell = np.empty_like(cells)
+        self._otherCell[order[0::2]] = cells[order[1::2]]
+        self._otherCell[order[1::2]] = cells[order[0::2]]
+
+    def _cellValues(self,field):
+        internal = np.asarray(getattr(field,'internal_data',field))
+        if internal.ndim == 0 or internal.shape[0] != self._nCells:
+            # Uniform internal field
+            value = internal if internal.ndim == 0 else internal[0]
+            internal = np.broadcast_to(value,(self._nCells,)+value.shape)
+        return internal
+
+    def decompose(self,field):
+        """Split a global field to the processors
+
+        Input:
+        ------
+            field : ofVolField of the global mesh
+
+        Returns:
+        --------
+            List with the internal field and the ofBoundaryData of each
+            processor
+        """
+        internal = self._cellValues(field)
+        globalPatches = field.boundary.patches
+        processorFields = []
+        processorFaces = 0
+        for a in self._addressing:
+            globalFaces = np.abs(a['faceProcAddressing'])-1
+            boundary = ofBoundaryData()
+            for (name, patchType, startFace, nFaces), index in zip(a['patches'],a['boundaryProcAddressing']):
+                if index >= 0:
+                    if name not in globalPatches:
+                        raise ValueError(f"Patch {name} is missing in the boundary of the field")
+                    boundary.patches[name] = self._processorPatch(
+                        globalPatches[name],self._patchSize[name],
+                        globalFaces[startFace:startFace+nFaces]-self._patchStart.get(name,0))
+                    continue
+
+                # Inter-processor patch with the face interpolate of the cell values
+                patch = Patch(name)
+                patch.type = patchType
+                patchCells = a['cellProcAddressing'][a['owner'][startFace:startFace+nFaces]]
+                if patchType == "processor":
+                    otherCells = self._otherCell[processorFaces:processorFaces+nFaces]
+                    processorFaces += nFaces
+                    patch.data = 0.5*(internal[patchCells]+internal[otherCells])
+                else:
+                    patch.data = internal[patchCells]
+                patch.hasValue = True
+                boundary.patches[name] = patch
+            processorFields.append((np.ascontiguousarray(internal[a['cellProcAddressing']]),boundary))
+        return processorFields
+
+    def _processorPatch(self,globalPatch,nFaces,faces):
+        """Copy of the global patch with the values of the given faces"""
+        patch = copy.copy(globalPatch)
+        if globalPatch.hasValue:
+            data = np.asarray(globalPatch.data)
+            # Uniform values are stored as a single entry
+            if len(data) == nFaces and nFaces != 1:
+                patch.data = data[faces]
+        return patch
+
+    def write(self,field,fieldName,time,file_header,dimensions,**kwargs):
+        """Write the global field to the time directory of all processors
+
+        Input:
+        ------
+            field : ofVolField of the global mesh
+            fieldName : string, name of the field file
+            time : string or float, name of the time directory
+            file_header : FileHeader with the format and the data type
+            dimensions : list of the dimension exponents
+
+        Optional Parameters:
+        --------------------
+            collated : bool
+                Write a single file processors<N>/<time>/<fieldName> in
+                the collated format instead of one file per processor,
+                by default False
+            precision : int
+                Significant digits in ASCII format, by default 6
+            compression : int or bool
+                gzip compression level of the files, see writeOpenFOAMFile.
+                The files are compressed by the worker processes.
+
+        Returns:
+        --------
+            List of the written files
+        """
+        timeName = time if isinstance(time,str) else f'{time:g}'
+        options = {'precision'  : kwargs.get('precision',6),
+                   'compression': kwargs.get('compression',None)}
+        processorFields = self.decompose(field)
+
+        if kwargs.get('collated',False):
+            return [self._writeCollated(processorFields,fieldName,timeName,file_header,dimensions,**options)]
+
+        tasks = [(os.path.join(path,timeName,fieldName),file_header,data,boundary,dimensions,options)
+                 for path, (data, boundary) in zip(self._processorPaths,processorFields)]
+        with ProcessPoolExecutor(max_workers=self._nWorkers) as executor:
+            return list(executor.map(_writeProcessorField,tasks))
+
+    def _writeCollated(self,processorFields,fieldName,timeName,file_header,dimensions,precision,compression):
+        """Write the processor fields as blocks of a decomposedBlockData
+        file. Each block stores the file content of one processor, the
+        first block with the FoamFile header of the field. Compressed
+        blocks are concatenated gzip members, which form a valid gzip file."""
+        level = compressionLevel(compression)
+        tasks = [(i,fieldName,timeName,file_header,data,boundary,dimensions,precision,level)
+                 for i, (data, boundary) in enumerate(processorFields)]
+        with ProcessPoolExecutor(max_workers=self._nWorkers) as executor:
+            blocks = list(executor.map(_processorBlock,tasks))
+
+        directory = os.path.join(self._casePath,f"processors{len(blocks)}",timeName)
+        os.makedirs(directory,exist_ok=True)
+        filePath = os.path.join(directory,fieldName+('.gz' if level else ''))
+        formatName = "binary" if file_header.format.lower() == "binary" else "ascii"
+        header = io.BytesIO()
+        writeFoamFileHeader(header,file_header,fieldName,"decomposedBlockData",timeName,
+                            {'data.format': formatName,
+                             'data.class' : fieldClassName(file_header,processorFields[0][0])})
+        # The blocks are already compressed
+        with openOutputFile(filePath) as fp:
+            fp.write(gzip.compress(header.getvalue(),compresslevel=level) if level else header.getvalue())
+            for block in blocks:
+                fp.write(block)
+        return filePath
+
+    @property
+    def nProcs(self):
+        return len(self._processorPaths)
+
+    @property
+    def processorPaths(self):
+        return self._processorPaths
@@ -0,0 +1,259 @@
+"""
+Read the mesh of a decomposed case from the processor directories, e.g.,
+if the undecomposed mesh in constant/polyMesh was deleted:
+
+    from ofReader.decomposedMesh import readDecomposedMesh, decomposedMesh
+
+    # Merge all processor meshes to the global mesh
+    mesh = readDecomposedMesh('path/to/case')
+
+    # Or keep the processor meshes and compute their geometry in parallel
+    processors = decomposedMesh('path/to/case')
+    C = processors.centers()        # in global cell order
+    T = processors.readField('T',time=0.1)
+
+The processor meshes are read by a pool of worker processes. They are
+merged with the pointProcAddressing, faceProcAddressing and
+cellProcAddressing files written by decomposePar. faceProcAddressing
+stores the one based global face index, negative if the processor face is
+flipped, i.e., the processor cell is the neighbour of the global face.
+"""
+
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from ofReader.ofFileReader import readOpenFOAMFile, processorDirectories
+from ofReader.polyBoundaryMesh import readPolyBoundaryMesh, polyPatch, polyBoundaryMesh
+from ofReader.fvMesh import fvMesh
+
+
+def _compactFaces(faces):
+    """Return the faces as compact list of offsets and point labels"""
+    nPoints = np.fromiter((len(face) for face in faces),dtype=np.int64,count=len(faces))
+    offsets = np.zeros(len(faces)+1,dtype=np.int64)
+    np.cumsum(nPoints,out=offsets[1:])
+    return offsets, np.concatenate(faces).astype(np.int64)
+
+
+def _readProcessorMesh(processorPath):
+    """Worker function to read the mesh and addressing of one processor"""
+    meshPath = os.path.join(processorPath,'constant','polyMesh')
+    offsets, labels = _compactFaces(readOpenFOAMFile(os.path.join(meshPath,'faces')))
+    return {
+        'points'    : readOpenFOAMFile(os.path.join(meshPath,'points')),
+        'offsets'   : offsets,
+        'labels'    : labels,
+        'owner'     : np.asarray(readOpenFOAMFile(os.path.join(meshPath,'owner')),dtype=np.int64),
+        'neighbour' : np.asarray(readOpenFOAMFile(os.path.join(meshPath,'neighbour')),dtype=np.int64),
+        'pointProcAddressing'   : np.asarray(readOpenFOAMFile(os.path.join(meshPath,'pointProcAddressing')),dtype=np.int64),
+        'faceProcAddressing'    : np.asarray(readOpenFOAMFile(os.path.join(meshPath,'faceProcAddressing')),dtype=np.int64),
+        'cellProcAddressing'    : np.asarray(readOpenFOAMFile(os.path.join(meshPath,'cellProcAddressing')),dtype=np.int64),
+        'boundaryProcAddressing': np.asarray(readOpenFOAMFile(os.path.join(meshPath,'boundaryProcAddressing')),dtype=np.int64),
+        'boundary'  : readPolyBoundaryMesh(os.path.join(meshPath,'boundary'))}
+
+
+def _processorGeometry(processorPath):
+    """Worker function to compute the cell geometry of one processor"""
+    mesh = fvMesh(processorPath)
+    return {
+        'centers' : mesh.centers(),
+        'volumes' : mesh.volumes(),
+        'cellProcAddressing': np.asarray(readOpenFOAMFile(
+            os.path.join(processorPath,'constant','polyMesh','cellProcAddressing')),dtype=np.int64)}
+
+
+def _readProcessors(casePath,worker,nWorkers):
+    processorPaths = processorDirectories(casePath)
+    if not processorPaths:
+        raise FileNotFoundError(f"No processor directories found in {casePath}")
+    with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+        return list(executor.map(worker,processorPaths))
+
+
+def readDecomposedMesh(casePath,nWorkers=None):
+    """Read the processor meshes of a decomposed case and merge them to
+    the global mesh
+
+    Input:
+    ------
+        casePath : string
+            Path to the case with the processor directories
+        nWorkers : int
+            Number of worker processes, by default the number of CPUs
+
+    Returns:
+    --------
+        fvMesh of the global mesh with its boundary patches
+    """
+    processors = _readProcessors(casePath,_readProcessorMesh,nWorkers)
+
+    nPoints = max(int(p['pointProcAddressing'].max(initial=-1)) for p in processors) + 1
+    nCells = max(int(p['cellProcAddressing'].max(initial=-1)) for p in processors) + 1
+    nFaces = max(int(np.abs(p['faceProcAddressing']).max(initial=0)) for p in processors)
+
+    points = np.zeros((nPoints,3))
+    owner = np.full(nFaces,-1,dtype=np.int64)
+    neighbour = np.full(nFaces,-1,dtype=np.int64)
+    faceSizes = np.zeros(nFaces,dtype=np.int64)
+    faceLabels = []
+    faceOrder = []
+
+    for p in processors:
+        points[p['pointProcAddressing']] = p['points']
+        cells = p['cellProcAddressing']
+        faceAddressing = p['faceProcAddressing']
+        globalFaces = np.abs(faceAddressing)-1
+        flipped = faceAddressing < 0
+        nLocalFaces = len(faceAddressing)
+        localInternal = np.arange(nLocalFaces) < len(p['neighbour'])
+        localNeighbour = np.full(nLocalFaces,-1,dtype=np.int64)
+        localNeighbour[:len(p['neighbour'])] = p['neighbour']
+
+        # Flipped processor patch faces only provide the neighbour cell,
+        # all other faces define the global face
+        nbrSide = flipped & ~localInternal
+        neighbour[globalFaces[nbrSide]] = cells[p['owner'][nbrSide]]
+
+        defining = ~nbrSide
+        own = np.where(flipped,localNeighbour,p['owner'])[defining]
+        nbr = np.where(flipped,p['owner'],localNeighbour)[defining]
+        faces = globalFaces[defining]
+        owner[faces] = cells[own]
+        hasNeighbour = nbr >= 0
+        neighbour[faces[hasNeighbour]] = cells[nbr[hasNeighbour]]
+
+        # Point labels of the defining faces, flipped faces keep their first
+        # point and reverse the order of the others
+        offsets = p['offsets']
+        localFaces = np.nonzero(defining)[0]
+        n = np.diff(offsets)[localFaces]
+        entryOffsets = np.zeros(len(localFaces)+1,dtype=np.int64)
+        np.cumsum(n,out=entryOffsets[1:])
+        entryFace = np.repeat(np.arange(len(localFaces)),n)
+        local = np.arange(entryOffsets[-1]) - entryOffsets[entryFace]
+        nEntry = n[entryFace]
+        local = np.where(flipped[localFaces][entryFace],(nEntry-local) % nEntry,local)
+        faceLabels.append(p['pointProcAddressing'][p['labels'][offsets[localFaces][entryFace]+local]])
+        faceSizes[faces] = n
+        faceOrder.append(faces)
+
+    # Sort the face labels of all processors by the global face index
+    faceOrder = np.concatenate(faceOrder)
+    faceLabels = np.concatenate(faceLabels)
+    sizes = faceSizes[faceOrder]
+    sourceOffsets = np.zeros(len(faceOrder)+1,dtype=np.int64)
+    np.cumsum(sizes,out=sourceOffsets[1:])
+    order = np.argsort(faceOrder,kind='stable')
+    globalOffsets = np.zeros(nFaces+1,dtype=np.int64)
+    np.cumsum(faceSizes,out=globalOffsets[1:])
+    entryFace = np.repeat(order,sizes[order])
+    local = np.arange(globalOffsets[-1]) - np.repeat(globalOffsets[:-1],faceSizes)
+    labels = faceLabels[sourceOffsets[entryFace]+local]
+
+    if np.any(owner < 0):
+        raise ValueError(f"Incomplete faceProcAddressing in {casePath}")
+    nInternalFaces = int(np.count_nonzero(neighbour >= 0))
+    if np.any(neighbour[:nInternalFaces] < 0):
+        raise ValueError(f"Internal faces are not ordered before the boundary faces in {casePath}")
+
+    mesh = fvMesh.fromArrays(points,(globalOffsets,labels),owner,neighbour[:nInternalFaces])
+    mesh._casePath = casePath
+    mesh._boundary = _globalBoundary(processors,nInternalFaces,mesh)
+    return mesh
+
+
+def _globalBoundary(processors,nInternalFaces,mesh):
+    """Global patches from the processor patches. The faces of a global
+    patch are on the processor patches mapped to it by the
+    boundaryProcAddressing and on the processorCyclic patches referring
+    to it."""
+    boundary = processors[0]['boundary']
+    addressing = processors[0]['boundaryProcAddressing']
+    globalPatches = sorted((index,patch) for patch, index in zip(boundary,addressing) if index >= 0)
+    names = [patch.name for _, patch in globalPatches]
+
+    nPatchFaces = dict.fromkeys(names,0)
+    for p in processors:
+        for patch, index in zip(p['boundary'],p['boundaryProcAddressing']):
+            if index >= 0:
+                nPatchFaces[patch.name] += patch.nFaces
+            elif patch.type == 'processorCyclic' and patch.entries.get('referPatch') in nPatchFaces:
+                nPatchFaces[patch.entries['referPatch']] += patch.nFaces
+
+    patches = []
+    startFace = nInternalFaces
+    for _, patch in globalPatches:
+        entries = dict(patch.entries)
+        entries['nFaces'] = str(nPatchFaces[patch.name])
+        entries['startFace'] = str(startFace)
+        patches.append(polyPatch(patch.name,entries,len(patches),mesh))
+        startFace += nPatchFaces[patch.name]
+    return polyBoundaryMesh(patches)
+
+
+class decomposedMesh:
+    """Collection of the processor meshes of a decomposed case
+
+    The geometry of each processor mesh is computed by a pool of worker
+    processes without merging the meshes. Cell data of all processors are
+    returned in the global cell order given by the cellProcAddressing.
+
+    Usage:
+    ------
+        processors = decomposedMesh('path/to/case',nWorkers=8)
+        C = processors.centers()
+        V = processors.volumes()
+        T = processors.readField('T',time=0.1)
+        # Merge the processor meshes if the global mesh is required
+        mesh = processors.mesh()
+    """
+
+    def __init__(self,casePath,nWorkers=None):
+        self._casePath = casePath
+        self._nWorkers = nWorkers
+        self._processorPaths = processorDirectories(casePath)
+        self._geometry = None
+
+    def _calcGeometry(self):
+        if self._geometry is None:
+            self._geometry = _readProcessors(self._casePath,_processorGeometry,self._nWorkers)
+        return self._geometry
+
+    def _globalCellValues(self,key):
+        geometry = self._calcGeometry()
+        nCells = max(int(g['cellProcAddressing'].max(initial=-1)) for g in geometry) + 1
+        values = np.zeros((nCells,)+geometry[0][key].shape[1:])
+        for g in geometry:
+            values[g['cellProcAddressing']] = g[key]
+        return values
+
+    def centers(self):
+        """Cell centers of all processors in global cell order"""
+        return self._globalCellValues('centers')
+
+    def volumes(self):
+        """Cell volumes of all processors in global cell order"""
+        return self._globalCellValues('volumes')
+
+    def readField(self,fileName,time):
+        """Read the internal field of all processors in global cell order"""
+        return readOpenFOAMFile(self._casePath,fileName=fileName,time=time,
+                                decomposed=True,nWorkers=self._nWorkers)
+
+    def mesh(self):
+        """Merge the processor meshes to the global fvMesh"""
+        return readDecomposedMesh(self._casePath,self._nWorkers)
+
+    @property
+    def nProcs(self):
+        return len(self._processorPaths)
+
+    @property
+    def processorPaths(self):
+        return self._processorPaths
+
+    @property
+    def processorGeometry(self):
+        """List with the cell centers, volumes and cellProcAddressing of
+        each processor"""
+        return self._calcGeometry()
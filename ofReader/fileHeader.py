@@ -46,6 +46,9 @@ class FileHeader:
                     elif subStr[1] == "volScalarField":
                         self.type = "scalar"
                         self._fieldType = "volField"
+                    elif subStr[1] == "surfaceScalarField":
+                        self.type = "scalar"
+                        self._fieldType = "surfaceField"
                     elif subStr[1] == "vectorField":
                         self.type = "vectorField"
                     elif subStr[1] == "volVectorField":
@@ -0,0 +1,205 @@
+import numpy as np
+import pyvista as pv
+from vtkmodules.vtkIOXML import vtkXMLUnstructuredGridWriter, vtkXMLPolyDataWriter
+from ofReader.volPointInterpolation import volPointInterpolation
+
+
+class foamToVTK:
+    """Convert an fvMesh and its fields to VTK, similar to OpenFOAM's
+    foamToVTK utility, e.g., to visualize the fields in ParaView.
+
+    The internal mesh is converted to a pyvista.UnstructuredGrid of
+    polyhedral cells and the patches to pyvista.PolyData. The cells are
+    built once from the compact face list, further fields or time steps
+    only replace the data arrays of the grid.
+
+    Usage:
+    ------
+        mesh = fvMesh('path/to/case')
+        converter = foamToVTK(mesh)
+        for time in ['0.1','0.2']:
+            T = readOpenFOAMFile('path/to/case/'+time+'/T')
+            U = readOpenFOAMFile('path/to/case/'+time+'/U')
+            converter.write('case_'+time+'.vtu',{'T':T,'U':U})
+            converter.writePatch('wall','wall_'+time+'.vtp',{'T':T})
+
+        # Or work with the pyvista objects directly
+        grid = converter.internalMesh({'T':T})
+        grid.plot(scalars='T')
+    """
+
+    def __init__(self,mesh,**kwargs):
+        """Build the polyhedral cells of the mesh
+
+        Input:
+        ------
+            mesh : fvMesh
+
+        Optional Parameters:
+        --------------------
+            pointData : bool
+                Add the fields interpolated to the points with
+                volPointInterpolation, by default False
+        """
+        self._mesh = mesh
+        self._pointData = kwargs.get('pointData',False)
+        self._pointInterpolation = None
+        self._grid = pv.UnstructuredGrid(
+            self._polyhedronCells(),
+            np.full(mesh.nCells,pv.CellType.POLYHEDRON,dtype=np.uint8),
+            np.asarray(mesh.points,dtype=float))
+        self._patches = {}
+
+    def _polyhedronCells(self):
+        """Cell connectivity in the VTK polyhedron format
+
+        Each cell is stored as
+            [n, nFaces, nPoints0, p0, p1, ..., nPoints1, p0, p1, ...]
+        with n the number of the following entries. The faces of a cell
+        have to point outwards, thus the faces of the neighbour cells are
+        reversed.
+        """
+        mesh = self._mesh
+        nCells = mesh.nCells
+        offsets, labels = mesh.compactFaces()
+        nFacePoints = np.diff(offsets)
+
+        # Faces of each cell, negative data for faces of the neighbour cell
+        cellFaces = mesh.faceToCellMatrix()
+        faces = cellFaces.indices
+        flip = cellFaces.data < 0
+        nCellFaces = np.diff(cellFaces.indptr)
+
+        # Position of each cell and each of its faces in the stream
+        entryLength = 1 + nFacePoints[faces]
+        cellLength = 2 + np.add.reduceat(entryLength,cellFaces.indptr[:-1])
+        cellStart = np.zeros(nCells+1,dtype=np.int64)
+        np.cumsum(cellLength,out=cellStart[1:])
+        entryOffsets = np.zeros(len(faces)+1,dtype=np.int64)
+        np.cumsum(entryLength,out=entryOffsets[1:])
+        entryCell = np.repeat(np.arange(nCells),nCellFaces)
+        entryStart = cellStart[entryCell] + 2 + entryOffsets[:-1] \
+            - entryOffsets[cellFaces.indptr[:-1]][entryCell]
+
+        stream = np.empty(cellStart[-1],dtype=np.int64)
+        stream[cellStart[:-1]] = cellLength-1
+        stream[cellStart[:-1]+1] = nCellFaces
+        stream[entryStart] = nFacePoints[faces]
+
+        # Point labels of the faces, reversed faces keep their first point
+        n = nFacePoints[faces]
+        pointOffsets = np.zeros(len(faces)+1,dtype=np.int64)
+        np.cumsum(n,out=pointOffsets[1:])
+        pointEntry = np.repeat(np.arange(len(faces)),n)
+        local = np.arange(pointOffsets[-1]) - pointOffsets[pointEntry]
+        nEntry = n[pointEntry]
+        faceLocal = np.where(flip[pointEntry],(nEntry-local) % nEntry,local)
+        stream[entryStart[pointEntry]+1+local] = labels[offsets[faces][pointEntry]+faceLocal]
+        return stream
+
+    def _patchPolyData(self,name):
+        """PolyData of the patch faces with the used points only, cached"""
+        if name not in self._patches:
+            patch = self._mesh.boundary[name]
+            offsets, labels = self._mesh.compactFaces()
+            start, stop = patch.startFace, patch.startFace+patch.nFaces
+            patchLabels = labels[offsets[start]:offsets[stop]]
+            nFacePoints = np.diff(offsets[start:stop+1])
+            usedPoints, patchLabels = np.unique(patchLabels,return_inverse=True)
+
+            # Faces in the VTK format [nPoints0, p0, p1, ..., nPoints1, ...]
+            faceStart = np.arange(patch.nFaces) + offsets[start:stop] - offsets[start]
+            isLabel = np.ones(len(patchLabels)+patch.nFaces,dtype=bool)
+            isLabel[faceStart] = False
+            stream = np.empty(len(isLabel),dtype=np.int64)
+            stream[faceStart] = nFacePoints
+            stream[isLabel] = patchLabels
+            self._patches[name] = pv.PolyData(
+                np.asarray(self._mesh.points[usedPoints],dtype=float),faces=stream)
+        return self._patches[name]
+
+    def internalMesh(self,fields=None):
+        """Return the internal mesh with the cell values of the fields
+
+        Input:
+        ------
+            fields : dict
+                Dictionary with the field name as key and the ofVolField or
+                numpy array of the cell values as value
+
+        Returns:
+        --------
+            pyvista.UnstructuredGrid sharing the cells and points with all
+            other grids returned by this object
+        """
+        grid = self._grid.copy(deep=False)
+        for name, field in (fields or {}).items():
+            grid.cell_data[name] = np.ascontiguousarray(self._mesh.cellValues(field))
+            if self._pointData:
+                if self._pointInterpolation is None:
+                    self._pointInterpolation = volPointInterpolation(self._mesh)
+                grid.point_data[name] = self._pointInterpolation.interpolate(field)
+        return grid
+
+    def patch(self,name,fields=None):
+        """Return a patch with the face values of the fields
+
+        Input:
+        ------
+            name : string
+                Name of the patch
+            fields : dict
+                Dictionary with the field name as key and the ofVolField or
+                numpy array of the cell values as value
+
+        Returns:
+        --------
+            pyvista.PolyData of the patch faces
+        """
+        polyData = self._patchPolyData(name).copy(deep=False)
+        patch = self._mesh.boundary[name]
+        faces = slice(patch.startFace-self._mesh.nInternalFaces,
+                      patch.startFace-self._mesh.nInternalFaces+patch.nFaces)
+        for fieldName, field in (fields or {}).items():
+            polyData.cell_data[fieldName] = np.ascontiguousarray(
+                self._mesh.boundaryFaceValues(field)[faces])
+        return polyData
+
+    def write(self,fileName,fields=None,dataMode='appended'):
+        """Write the internal mesh with the fields to a .vtu file
+
+        Input:
+        ------
+            fileName : string
+            fields : dict
+                Fields to write, see internalMesh()
+            dataMode : string
+                'appended' (default) for raw binary data appended to the
+                XML file, 'binary' for base64 encoded inline data or 'ascii'
+        """
+        _writeXML(vtkXMLUnstructuredGridWriter(),self.internalMesh(fields),fileName,dataMode)
+
+    def writePatch(self,name,fileName,fields=None,dataMode='appended'):
+        """Write a patch with the fields to a .vtp file, see write()"""
+        _writeXML(vtkXMLPolyDataWriter(),self.patch(name,fields),fileName,dataMode)
+
+    @property
+    def grid(self):
+        """Internal mesh without data"""
+        return self._grid
+
+
+def _writeXML(writer,dataSet,fileName,dataMode):
+    writer.SetFileName(str(fileName))
+    writer.SetInputData(dataSet)
+    if dataMode == 'appended':
+        writer.SetDataModeToAppended()
+        writer.EncodeAppendedDataOff()
+    elif dataMode == 'binary':
+        writer.SetDataModeToBinary()
+    elif dataMode == 'ascii':
+        writer.SetDataModeToAscii()
+    else:
+        raise ValueError(f"Unknown data mode {dataMode}, use appended, binary or ascii")
+    if writer.Write() != 1:
+        raise IOError(f"Could not write {fileName}")
@@ -1,37 +1,84 @@
 from tqdm import tqdm
 import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.spatial import cKDTree
 from .ofFileReader import readOpenFOAMFile
+from .polyBoundaryMesh import readPolyBoundaryMesh, polyBoundaryMesh
+
 
 
 class fvMesh:
     def __init__(self,casePath):
         """
-        Read in the mesh in the OpenFOAM format and generate the cells
+        Read in the mesh in the OpenFOAM format
         """
-        self._points = readOpenFOAMFile(casePath + '/constant/polyMesh/points')
-        self._faces  = readOpenFOAMFile(casePath + '/constant/polyMesh/faces')
-        self._owner  = readOpenFOAMFile(casePath + '/constant/polyMesh/owner')
-        self._neighbor = readOpenFOAMFile(casePath + '/constant/polyMesh/neighbour')
-        
+        self._casePath = casePath
+        self._setMesh(readOpenFOAMFile(casePath + '/constant/polyMesh/points'),
+                      readOpenFOAMFile(casePath + '/constant/polyMesh/faces'),
+                      readOpenFOAMFile(casePath + '/constant/polyMesh/owner'),
+                      readOpenFOAMFile(casePath + '/constant/polyMesh/neighbour'))
+
+    @classmethod
+    def fromArrays(cls,points,faces,owner,neighbour,boundary=None):
+        """Create a mesh from the point, face, owner and neighbour arrays
+        instead of reading it from a case, e.g., for a subset of a mesh
+
+        Input:
+        ------
+            points : array of dimension [nPoints,3]
+            faces : list of the point labels of each face or the compact
+                    face list as tuple (offsets,labels)
+            owner : owner cell of each face
+            neighbour : neighbour cell of each internal face
+            boundary : polyBoundaryMesh of the patches, optional. Without
+                       patches all boundary faces are zero gradient.
+        """
+        mesh = cls.__new__(cls)
+        mesh._casePath = None
+        mesh._setMesh(points,faces,owner,neighbour)
+        mesh._boundary = boundary if boundary is not None else polyBoundaryMesh([])
+        return mesh
+
+    def _setMesh(self,points,faces,owner,neighbour):
+        faceOffsets, faceLabels = None, None
+        if isinstance(faces,tuple):
+            faceOffsets, faceLabels = faces
+            faces = None
+        self._points = points
+        self._faces  = faces
+        self._owner  = owner
+        self._neighbor = neighbour
+
         self._nCells = 0
+        self._nFaces = len(self._owner)
+        self._nInternalFaces = len(self._neighbor)
 
         self._centers = []
         self._volumes = []
 
+        # Compact face list and face geometry, built on first use
+        self._faceOffsets = faceOffsets
+        self._faceLabels = faceLabels
+        self._faceCenters = None
+        self._faceAreas = None
+        self._weights = None
+        self._boundary = None
+        self._pointCells = None
+        self._cellTree = None
+        self._cells = None
+
+        # Sparse operators, built on first use
+        self._cellCellAdjacency = None
+        self._faceToCellMatrix = None
+        self._cellToFaceMatrix = None
+
         # Get the number of cells
-        nCells = 0
-        for cellIndex in self._owner:
-            if cellIndex > nCells:
-                nCells = cellIndex
-        for cellIndex in self._neighbor:
-            if cellIndex > nCells:
-                nCells = cellIndex
         # As it is zero based add one more entry
-        nCells = nCells +1
-        self._nCells = nCells
+        self._nCells = int(max(np.max(self._owner),np.max(self._neighbor,initial=0))) + 1
 
+    def _createCells(self):
         print("Create cells in mesh...")
-        self._cells = np.empty(nCells,dtype=fvmCell)
+        self._cells = np.empty(self._nCells,dtype=fvmCell)
         for i in range(len(self._cells)):
             self._cells[i] = fvmCell()
 
@@ -43,28 +90,451 @@ class fvMesh:
         for i in tqdm(range(len(self._neighbor))):
             self._cells[self._neighbor[i]].addFaceIndex(i)
     
+    def compactFaces(self):
+        """Return the faces as compact list of offsets and point labels
+
+        The points of face i are labels[offsets[i]:offsets[i+1]]
+        """
+        if self._faceOffsets is None:
+            nPoints = np.fromiter((len(face) for face in self._faces),dtype=np.int64,count=len(self._faces))
+            self._faceOffsets = np.zeros(len(self._faces)+1,dtype=np.int64)
+            np.cumsum(nPoints,out=self._faceOffsets[1:])
+            self._faceLabels = np.concatenate(self._faces).astype(np.int64)
+        return self._faceOffsets, self._faceLabels
+
+    def _calcFaceCentersAndAreas(self):
+        """Calculate face centers and area vectors as in OpenFOAM's
+        primitiveMesh. Each face is split into triangles with the average
+        of its points and the centers are the area weighted triangle centers.
+        """
+        offsets, labels = self.compactFaces()
+        nPoints = np.diff(offsets)
+        faceIndex = np.repeat(np.arange(self._nFaces),nPoints)
+
+        p = self._points[labels]
+        # Index of the next point of the face for each point
+        nextIndex = np.arange(1,len(labels)+1)
+        nextIndex[offsets[1:]-1] = offsets[:-1]
+        pNext = p[nextIndex]
+
+        # Estimated face center as average of the points
+        fCentre = np.zeros((self._nFaces,3))
+        for i in range(3):
+            fCentre[:,i] = np.bincount(faceIndex,p[:,i],minlength=self._nFaces)/nPoints
+
+        c = p + pNext + fCentre[faceIndex]
+        n = np.cross(pNext-p,fCentre[faceIndex]-p)
+        a = np.linalg.norm(n,axis=1)
+
+        sumA = np.bincount(faceIndex,a,minlength=self._nFaces)
+        self._faceAreas = np.zeros((self._nFaces,3))
+        self._faceCenters = np.zeros((self._nFaces,3))
+        for i in range(3):
+            self._faceAreas[:,i] = 0.5*np.bincount(faceIndex,n[:,i],minlength=self._nFaces)
+            self._faceCenters[:,i] = np.bincount(faceIndex,a*c[:,i],minlength=self._nFaces)
+
+        # Degenerate faces keep the estimated face center
+        valid = sumA > 1E-300
+        self._faceCenters[valid] /= 3.0*sumA[valid,None]
+        self._faceCenters[~valid] = fCentre[~valid]
+
+    def faceCenters(self):
+        """Face centers of dimension [nFaces,3]"""
+        if self._faceCenters is None:
+            self._calcFaceCentersAndAreas()
+        return self._faceCenters
+
+    def faceAreas(self):
+        """Face area vectors Sf of dimension [nFaces,3] pointing out of the 
+        owner cell"""
+        if self._faceAreas is None:
+            self._calcFaceCentersAndAreas()
+        return self._faceAreas
+
+    def _calcCellCentersAndVolumes(self):
+        """Calculate cell centers and volumes as in OpenFOAM's primitiveMesh
+        by decomposing each cell into pyramids of its faces and an estimated
+        cell center.
+        """
+        Cf = self.faceCenters()
+        Sf = self.faceAreas()
+        own = self._owner
+        nei = self._neighbor
+
+        # Estimated cell center as average of the face centers
+        nCellFaces = np.bincount(own,minlength=self._nCells) \
+                   + np.bincount(nei,minlength=self._nCells)
+        cEst = np.zeros((self._nCells,3))
+        for i in range(3):
+            cEst[:,i] = (np.bincount(own,Cf[:,i],minlength=self._nCells)
+                       + np.bincount(nei,Cf[:nei.size,i],minlength=self._nCells))/nCellFaces
+
+        # Three times the pyramid volumes and pyramid centers
+        pyr3VolOwn = np.einsum('ij,ij->i',Sf,Cf-cEst[own])
+        pyr3VolNei = np.einsum('ij,ij->i',Sf[:nei.size],cEst[nei]-Cf[:nei.size])
+        pcOwn = 0.75*Cf + 0.25*cEst[own]
+        pcNei = 0.75*Cf[:nei.size] + 0.25*cEst[nei]
+
+        volumes = np.bincount(own,pyr3VolOwn,minlength=self._nCells) \
+                + np.bincount(nei,pyr3VolNei,minlength=self._nCells)
+        centers = np.zeros((self._nCells,3))
+        for i in range(3):
+            centers[:,i] = np.bincount(own,pyr3VolOwn*pcOwn[:,i],minlength=self._nCells) \
+                         + np.bincount(nei,pyr3VolNei*pcNei[:,i],minlength=self._nCells)
+
+        valid = np.abs(volumes) > 1E-300
+        centers[valid] /= volumes[valid,None]
+        centers[~valid] = cEst[~valid]
+
+        self._centers = centers
+        self._volumes = volumes/3.0
+
     def centers(self):
+        """Cell centers of dimension [nCells,3]"""
         if len(self._centers) == 0:
-            # Calculate the centers
-            self._centers = np.zeros((len(self._cells),3))
-            for i in range(len(self._cells)):
-                self._centers[i] = self._cells[i].midPoint(self._points,self._faces)
+            self._calcCellCentersAndVolumes()
         return self._centers
     
     def volumes(self):
+        """Cell volumes of dimension [nCells]"""
         if len(self._volumes) == 0:
-            # Calculate the centers
-            self._volumes = np.zeros(len(self._cells))
-            for i in range(len(self._cells)):
-                self._volumes[i] = self._cells[i].volume(self._points,self._faces)
+            self._calcCellCentersAndVolumes()
         return self._volumes
-    
+
+    def weights(self):
+        """Linear interpolation weights of the owner cell for each face
+
+        For internal faces the weight is the normal distance of the 
+        neighbour cell center to the face divided by the sum of the owner 
+        and neighbour distances. Boundary faces have a weight of one.
+        """
+        if self._weights is None:
+            Cf = self.faceCenters()[:self._nInternalFaces]
+            Sf = self.faceAreas()[:self._nInternalFaces]
+            C = self.centers()
+            dOwn = np.abs(np.einsum('ij,ij->i',Sf,Cf-C[self._owner[:self._nInternalFaces]]))
+            dNei = np.abs(np.einsum('ij,ij->i',Sf,C[self._neighbor]-Cf))
+            self._weights = np.ones(self._nFaces)
+            self._weights[:self._nInternalFaces] = dNei/(dOwn+dNei)
+        return self._weights
+
+    def cellValues(self,field):
+        """Return the cell values of a field as array of dimension [nCells]
+        or [nCells,3]. A uniform internal field is expanded to all cells.
+        """
+        internal = np.asarray(getattr(field,'internal_data',field),dtype=float)
+        if internal.ndim == 0 or internal.shape[0] != self._nCells:
+            # Uniform internal field
+            value = internal if internal.ndim == 0 else internal[0]
+            internal = np.broadcast_to(value,(self._nCells,)+value.shape)
+        return internal
+
+    def boundaryFaceValues(self,field):
+        """Return the values of all boundary faces for a field
+
+        The patch values are taken from the boundary data of the field if 
+        the patch has a value entry. Cyclic patches use the linear
+        interpolate between the owner cell and the coupled cell. All other
+        patches use the value of the owner cell (zero gradient).
+
+        Input:
+        ------
+            field : ofVolField or numpy array
+                Field of the cell values. If only an array is given all 
+                non-coupled patches are zero gradient.
+        
+        Returns:
+        --------
+            Array of dimension [nFaces-nInternalFaces] or 
+            [nFaces-nInternalFaces,3] for vector fields
+        """
+        internal = self.cellValues(field)
+        boundary = getattr(field,'boundary',None)
+
+        start = self._nInternalFaces
+        values = np.array(internal[self._owner[start:]])
+
+        for patch in self.boundary:
+            if patch.nFaces == 0:
+                continue
+            faces = slice(patch.startFace-start,patch.startFace-start+patch.nFaces)
+            if boundary is not None and patch.name in boundary.patches \
+                and boundary.patches[patch.name].hasValue:
+                values[faces] = boundary.patches[patch.name].data
+            elif patch.type == 'cyclic' and patch.neighbourPatch in self.boundary:
+                nbrPatch = self.boundary[patch.neighbourPatch]
+                ownFaces = np.arange(patch.startFace,patch.startFace+patch.nFaces)
+                nbrFaces = np.arange(nbrPatch.startFace,nbrPatch.startFace+nbrPatch.nFaces)
+                w = self._cyclicWeights(ownFaces,nbrFaces)
+                if internal.ndim > 1:
+                    w = w[:,None]
+                values[faces] = w*internal[self._owner[ownFaces]] \
+                              + (1.0-w)*internal[self._owner[nbrFaces]]
+        return values
+
+    def _cyclicWeights(self,ownFaces,nbrFaces):
+        """Linear interpolation weights of coupled cyclic faces"""
+        C = self.centers()
+        Cf = self.faceCenters()
+        Sf = self.faceAreas()
+        dOwn = np.abs(np.einsum('ij,ij->i',Sf[ownFaces],Cf[ownFaces]-C[self._owner[ownFaces]]))
+        dNei = np.abs(np.einsum('ij,ij->i',Sf[nbrFaces],Cf[nbrFaces]-C[self._owner[nbrFaces]]))
+        return dNei/(dOwn+dNei)
+
+    def pointCells(self):
+        """Sparse point-cell connectivity matrix of dimension [nPoints,nCells]
+
+        Entry (i,j) is one if the point i is a vertex of cell j. The cells
+        of point i are pointCells().indices[indptr[i]:indptr[i+1]].
+        """
+        if self._pointCells is None:
+            offsets, labels = self.compactFaces()
+            faceIndex = np.repeat(np.arange(self._nFaces),np.diff(offsets))
+            internal = faceIndex < self._nInternalFaces
+            points = np.concatenate((labels,labels[internal]))
+            cells = np.concatenate((self._owner[faceIndex],self._neighbor[faceIndex[internal]]))
+            pointCells = csr_matrix(
+                (np.ones(len(points)),(points,cells)),
+                shape=(len(self._points),self._nCells))
+            # Remove the duplicated entries of points shared by several faces
+            pointCells.data[:] = 1.0
+            self._pointCells = pointCells
+        return self._pointCells
+
+    def findCells(self,points,chunkSize=100000):
+        """Find the cells containing the given points
+
+        The nearest cell centers are searched with a KD-tree and each of
+        these candidate cells is checked if the point lies inside of all 
+        its faces. Points not found in the nearest cells, e.g., on strongly
+        stretched or graded meshes, walk from the nearest cell across the
+        face they lie furthest outside of until the containing cell is
+        reached. Points leaving the mesh through a boundary face, e.g., in
+        a hole of a non-convex domain, are outside.
+
+        Input:
+        ------
+            points : numpy array
+                Points of dimension [n,3]
+            chunkSize : int
+                Number of points processed at once to limit the memory
+
+        Returns:
+        --------
+            Array of the cell index of each point, -1 for points outside
+            of the mesh
+        """
+        points = np.atleast_2d(np.asarray(points,dtype=float))
+        if self._cellTree is None:
+            self._cellTree = cKDTree(self.centers())
+        k = min(8,self._nCells)
+
+        cells = np.full(len(points),-1,dtype=np.int64)
+        nearest = np.zeros(len(points),dtype=np.int64)
+        for start in range(0,len(points),chunkSize):
+            p = points[start:start+chunkSize]
+            _, candidates = self._cellTree.query(p,k=k)
+            candidates = candidates.reshape(len(p),k)
+            nearest[start:start+len(p)] = candidates[:,0]
+            pointIndex = np.repeat(np.arange(len(p)),k)
+            cells[start:start+len(p)] = self._firstContainingCell(p,pointIndex,candidates.ravel())
+
+        lower, upper = self._points.min(axis=0), self._points.max(axis=0)
+        missing = np.nonzero((cells < 0) & np.all((points >= lower) & (points <= upper),axis=1))[0]
+        for start in range(0,len(missing),chunkSize):
+            chunk = missing[start:start+chunkSize]
+            cells[chunk] = self._walkToCells(points[chunk],nearest[chunk])
+        return cells
+
+    def _walkToCells(self,p,startCells,maxSteps=1000):
+        """Walk each point p from its start cell to the neighbour across the
+        face with the largest distance of the point outside of the face
+        plane, until the point lies inside of all faces. Returns the cell
+        of each point or -1 if it leaves the mesh through a boundary face
+        or is not found within maxSteps."""
+        tolerance = 1E-10*np.ptp(self._points,axis=0).max()
+        cells = np.full(len(p),-1,dtype=np.int64)
+        active = np.arange(len(p))
+        current = np.asarray(startCells,dtype=np.int64)
+        for _ in range(maxSteps):
+            if len(active) == 0:
+                break
+            distance, faces, pairOffsets = self._faceDistances(p[active],np.arange(len(active)),current)
+            maxDistance = np.maximum.reduceat(distance,pairOffsets[:-1])
+            pair = np.repeat(np.arange(len(active)),np.diff(pairOffsets))
+            isMax = np.nonzero(distance == maxDistance[pair])[0]
+            _, first = np.unique(pair[isMax],return_index=True)
+            exitFaces = faces[isMax[first]]
+
+            inside = maxDistance <= tolerance
+            cells[active[inside]] = current[inside]
+            # Points crossing a boundary face are outside of the mesh
+            crossing = ~inside & (exitFaces < self._nInternalFaces)
+            exitFaces = exitFaces[crossing]
+            active = active[crossing]
+            current = np.where(self._owner[exitFaces] == current[crossing],
+                               self._neighbor[exitFaces],self._owner[exitFaces])
+        return cells
+
+    def _faceDistances(self,p,pointIndex,candidateCells):
+        """Distances of the points p[pointIndex] to the face planes of the
+        candidate cells, positive outside of the cell. Returns the
+        distances and faces of all pairs of point and candidate cell
+        and the offsets of the faces of each pair."""
+        cellFaces = self.faceToCellMatrix()
+        Cf = self.faceCenters()
+        Sf = self.faceAreas()
+
+        # Expand each candidate pair of point and cell to the cell faces
+        nCandidateFaces = np.diff(cellFaces.indptr)[candidateCells]
+        pairOffsets = np.zeros(len(candidateCells)+1,dtype=np.int64)
+        np.cumsum(nCandidateFaces,out=pairOffsets[1:])
+        pair = np.repeat(np.arange(len(candidateCells)),nCandidateFaces)
+        entry = cellFaces.indptr[candidateCells][pair] + np.arange(pairOffsets[-1]) - pairOffsets[pair]
+        faces = cellFaces.indices[entry]
+
+        distance = cellFaces.data[entry]*np.einsum(
+            'ij,ij->i',p[pointIndex[pair]]-Cf[faces],Sf[faces])/np.linalg.norm(Sf[faces],axis=1)
+        return distance, faces, pairOffsets
+
+    def _firstContainingCell(self,p,pointIndex,candidateCells):
+        """Check the pairs of point p[pointIndex] and candidate cell if the
+        point lies inside of all cell faces. Returns the first containing
+        candidate of each point or -1."""
+        tolerance = 1E-10*np.ptp(self._points,axis=0).max()
+        distance, _, pairOffsets = self._faceDistances(p,pointIndex,candidateCells)
+        nCandidateFaces = np.diff(pairOffsets)
+        inside = np.zeros(len(candidateCells),dtype=bool)
+        hasFaces = nCandidateFaces > 0
+        if np.any(hasFaces):
+            inside[hasFaces] = np.maximum.reduceat(distance,pairOffsets[:-1][hasFaces]) <= tolerance
+
+        cells = np.full(len(p),-1,dtype=np.int64)
+        found = np.nonzero(inside)[0]
+        foundPoints, first = np.unique(pointIndex[found],return_index=True)
+        cells[foundPoints] = candidateCells[found[first]]
+        return cells
+
+    def cellCellAdjacency(self):
+        """Sparse cell-cell adjacency matrix of dimension [nCells,nCells]
+
+        Entry (i,j) is one if the cells i and j share an internal face. The
+        matrix is symmetric, e.g., the sum over the direct neighbours of each
+        cell is mesh.cellCellAdjacency() @ field.
+        """
+        if self._cellCellAdjacency is None:
+            owner = self._owner[:self._nInternalFaces]
+            neighbor = self._neighbor
+            self._cellCellAdjacency = csr_matrix(
+                (np.ones(2*self._nInternalFaces),
+                 (np.concatenate((owner,neighbor)),
+                  np.concatenate((neighbor,owner)))),
+                shape=(self._nCells,self._nCells))
+        return self._cellCellAdjacency
+
+    def faceToCellMatrix(self):
+        """Sparse face to cell sum operator of dimension [nCells,nFaces]
+
+        Each face contributes with +1 to its owner and with -1 to its 
+        neighbour cell. Multiplied with a face flux field, e.g., phi, it 
+        returns the net outflow of each cell, which is the divergence 
+        multiplied with the cell volume.
+        """
+        if self._faceToCellMatrix is None:
+            faceIndex = np.arange(self._nFaces)
+            self._faceToCellMatrix = csr_matrix(
+                (np.concatenate((np.ones(self._nFaces),
+                                 -np.ones(self._nInternalFaces))),
+                 (np.concatenate((self._owner,self._neighbor)),
+                  np.concatenate((faceIndex,faceIndex[:self._nInternalFaces])))),
+                shape=(self._nCells,self._nFaces))
+        return self._faceToCellMatrix
+
+    def cellToFaceMatrix(self,weights=None):
+        """Sparse cell to face interpolation operator of dimension [nFaces,nCells]
+
+        The face value of an internal face is 
+            w*owner + (1-w)*neighbour
+        and boundary faces take the value of their owner cell.
+
+        Input:
+        ------
+            weights : numpy array
+                Optional owner weights of the internal faces. By default
+                the arithmetic mean with w=0.5 is used. Only the operator 
+                with the default weights is cached.
+        """
+        if weights is None and self._cellToFaceMatrix is not None:
+            return self._cellToFaceMatrix
+
+        w = np.full(self._nInternalFaces,0.5)
+        if weights is not None:
+            w = np.asarray(weights,dtype=float)[:self._nInternalFaces]
+
+        faceIndex = np.arange(self._nFaces)
+        matrix = csr_matrix(
+            (np.concatenate((w,np.ones(self._nFaces-self._nInternalFaces),1.0-w)),
+             (np.concatenate((faceIndex,faceIndex[:self._nInternalFaces])),
+              np.concatenate((self._owner,self._neighbor)))),
+            shape=(self._nFaces,self._nCells))
+
+        if weights is None:
+            self._cellToFaceMatrix = matrix
+        return matrix
+
+    @property
+    def boundary(self):
+        """Boundary patches read from constant/polyMesh/boundary"""
+        if self._boundary is None and self._casePath is None:
+            # Mesh created from arrays without patches
+            self._boundary = polyBoundaryMesh([])
+        if self._boundary is None:
+            self._boundary = readPolyBoundaryMesh(
+                self._casePath + '/constant/polyMesh/boundary',self)
+        return self._boundary
+
     @property
     def nCells(self):
         return self._nCells
+
+    @property
+    def nPoints(self):
+        return len(self._points)
+
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def faces(self):
+        """Point labels of each face"""
+        if self._faces is None:
+            self._faces = np.empty(self._nFaces,dtype=object)
+            self._faces[:] = np.split(self._faceLabels,self._faceOffsets[1:-1])
+        return self._faces
+
+    @property
+    def nFaces(self):
+        return self._nFaces
+
+    @property
+    def nInternalFaces(self):
+        return self._nInternalFaces
+
+    @property
+    def owner(self):
+        return self._owner
+
+    @property
+    def neighbour(self):
+        return self._neighbor
     
     @property
     def cells(self):
+        """Cell objects with the face list of each cell, created on first
+        access"""
+        if self._cells is None:
+            self._createCells()
         return self._cells
 
 
@@ -91,7 +561,6 @@ class fvmCell:
         if not self._midPointSet:
             nPoints = 0
             for faceIndex in self._faceList:
-                print(faces)
                 for pointIndex in faces[faceIndex]:
                     self._midPoint = self._midPoint + points[pointIndex]
                     nPoints = nPoints + 1
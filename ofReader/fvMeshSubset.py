@@ -0,0 +1,306 @@
+"""
+Create a subset of a mesh, e.g., to analyze only a sub-region of a large
+case. The cells of the subset are selected by a cellZone, a cellSet or by
+their cell centers in a box or sphere:
+
+    from ofReader import fvMesh, readOpenFOAMFile
+    from ofReader.fvMeshSubset import fvMeshSubset, readCellZones, cellsInBox
+
+    mesh = fvMesh('path/to/case')
+    zones = readCellZones('path/to/case/constant/polyMesh/cellZones')
+    subset = fvMeshSubset(mesh,zones['combustor'])
+    # or
+    subset = fvMeshSubset(mesh,cellsInBox(mesh,(0,0,0),(0.1,0.1,0.2)))
+
+    # The subset mesh is a fvMesh with renumbered points and faces
+    subset.mesh.volumes()
+    # Only the values of the subset cells are read from the field file
+    T = subset.readField('path/to/case/0.1/T')
+
+Faces between the subset and the removed cells are collected in the patch
+oldInternalFaces. They are oriented to point out of the subset.
+"""
+
+import numpy as np
+import re
+import copy
+from ofReader.fileHeader import FileHeader
+from ofReader.ofBoundaryData import ofBoundaryData
+from ofReader.ofvolField import ofVolField
+from ofReader.ofFileReader import readOpenFOAMFile
+from ofReader.polyBoundaryMesh import polyPatch, polyBoundaryMesh
+
+# Patch types that require the faces of the coupled patch
+_coupledPatchTypes = ["cyclic", "cyclicAMI", "cyclicSlip", "processor", "processorCyclic"]
+
+
+def _readFileBody(filePath):
+    """Return the file header and the raw file content after the FoamFile
+    dictionary"""
+    file_header = FileHeader()
+    file_header.readFile(filePath)
+    with open(filePath, mode='rb') as fp:
+        data = fp.read()
+    header = re.search(rb"FoamFile\s*\{",data)
+    pos = data.index(b'}',header.end())+1 if header else 0
+    return file_header, data, pos
+
+
+def _readLabelList(data,pos,file_header : FileHeader):
+    """Read the label list N(...) of an ASCII or binary file starting at
+    data[pos]. Returns the labels and the position behind the list."""
+    match = re.compile(rb"(\d+)\s*\(").search(data,pos)
+    if not match:
+        raise ValueError("No label list found")
+    nValues = int(match.group(1))
+    start = match.end()
+    if file_header.format == "binary":
+        labels = np.frombuffer(data,dtype=file_header.labelDataType,count=nValues,offset=start)
+        end = start + nValues*file_header.labelByteSize
+    else:
+        end = data.index(b')',start)
+        labels = np.array(data[start:end].split(),dtype=np.int64)
+    return labels.astype(np.int64), end+1
+
+
+def readCellZones(filePath):
+    """Read the cell labels of all zones of a constant/polyMesh/cellZones
+    file in ASCII or binary format
+
+    Returns:
+    --------
+        Dictionary with the zone name as key and the cell labels as value
+    """
+    file_header, data, pos = _readFileBody(filePath)
+    file_header.type = "label"
+
+    match = re.compile(rb"(\d+)\s*\(").search(data,pos)
+    if not match:
+        raise ValueError(f"No zone list found in {filePath}")
+    nZones = int(match.group(1))
+    pos = match.end()
+
+    zones = {}
+    for _ in range(nZones):
+        name = re.compile(rb"\s*([^\s{}();]+)\s*\{").match(data,pos)
+        if not name:
+            raise ValueError(f"Invalid zone entry in {filePath}")
+        labelsEntry = re.compile(rb"cellLabels\s+(?:List<label>)?").search(data,name.end())
+        labels, pos = _readLabelList(data,labelsEntry.end(),file_header)
+        # Move behind the closing bracket of the zone dictionary
+        pos = data.index(b'}',pos)+1
+        zones[name.group(1).decode()] = labels
+    return zones
+
+
+def readCellSet(filePath):
+    """Read the cell labels of a cellSet, e.g., written by topoSet to
+    constant/polyMesh/sets/<name>, in ASCII or binary format"""
+    file_header, data, pos = _readFileBody(filePath)
+    file_header.type = "label"
+    labels, _ = _readLabelList(data,pos,file_header)
+    return np.sort(labels)
+
+
+def cellsInBox(mesh,boxMin,boxMax):
+    """Return the cells with their center inside the axis aligned box"""
+    C = mesh.centers()
+    inside = np.all((C >= np.asarray(boxMin)) & (C <= np.asarray(boxMax)),axis=1)
+    return np.nonzero(inside)[0]
+
+
+def cellsInSphere(mesh,centre,radius):
+    """Return the cells with their center inside the sphere"""
+    distance = np.linalg.norm(mesh.centers()-np.asarray(centre,dtype=float),axis=1)
+    return np.nonzero(distance <= radius)[0]
+
+
+class fvMeshSubset:
+    """Subset of a mesh given by a list of cells, similar to OpenFOAM's
+    fvMeshSubset
+
+    The subset mesh is created with renumbered cells, faces and points.
+    The maps cellMap, faceMap and pointMap store for each cell, face and
+    point of the subset the index in the original mesh.
+
+    Usage:
+    ------
+        subset = fvMeshSubset(mesh,cellsInSphere(mesh,(0,0,0.1),0.05))
+        for time in ['0.1','0.2']:
+            T = subset.readField('path/to/case/'+time+'/T')
+            subset.mesh.cellValues(T)
+    """
+
+    exposedPatchName = "oldInternalFaces"
+
+    def __init__(self,mesh,cells):
+        """Create the subset mesh
+
+        Input:
+        ------
+            mesh : fvMesh
+            cells : cell labels or boolean mask of the cells in the subset
+        """
+        cells = np.asarray(cells)
+        if cells.dtype == bool:
+            cells = np.nonzero(cells)[0]
+        self._baseMesh = mesh
+        self._cellMap = np.unique(cells.astype(np.int64))
+        self._subsetMesh()
+
+    def _subsetMesh(self):
+        mesh = self._baseMesh
+        nInternalFaces = mesh.nInternalFaces
+        owner = np.asarray(mesh.owner,dtype=np.int64)
+        neighbour = np.asarray(mesh.neighbour,dtype=np.int64)
+
+        inSubset = np.zeros(mesh.nCells,dtype=bool)
+        inSubset[self._cellMap] = True
+        newCell = np.full(mesh.nCells,-1,dtype=np.int64)
+        newCell[self._cellMap] = np.arange(len(self._cellMap))
+
+        ownerIn = inSubset[owner]
+        neighbourIn = inSubset[neighbour]
+        internal = np.nonzero(ownerIn[:nInternalFaces] & neighbourIn)[0]
+        # Faces with only one cell in the subset become boundary faces
+        exposed = np.nonzero(ownerIn[:nInternalFaces] != neighbourIn)[0]
+        exposedFlip = neighbourIn[exposed]
+
+        # Keep the faces of each patch adjacent to the subset
+        patchFaces = []
+        for patch in mesh.boundary:
+            faces = np.arange(patch.startFace,patch.startFace+patch.nFaces)
+            patchFaces.append(faces[ownerIn[faces]])
+
+        self._faceMap = np.concatenate([internal]+patchFaces+[exposed])
+        nFaces = len(self._faceMap)
+        self._flipMap = np.zeros(nFaces,dtype=bool)
+        self._flipMap[nFaces-len(exposed):] = exposedFlip
+
+        newOwner = newCell[owner[self._faceMap]]
+        newOwner[self._flipMap] = newCell[neighbour[self._faceMap[self._flipMap]]]
+        newNeighbour = newCell[neighbour[internal]]
+
+        # Gather the face points, flipped faces keep their first point and
+        # reverse the order of the others
+        offsets, labels = mesh.compactFaces()
+        nFacePoints = np.diff(offsets)[self._faceMap]
+        faceOffsets = np.zeros(nFaces+1,dtype=np.int64)
+        np.cumsum(nFacePoints,out=faceOffsets[1:])
+        faceIndex = np.repeat(np.arange(nFaces),nFacePoints)
+        local = np.arange(faceOffsets[-1]) - faceOffsets[faceIndex]
+        n = nFacePoints[faceIndex]
+        local = np.where(self._flipMap[faceIndex],(n-local) % n,local)
+        pointLabels = labels[offsets[self._faceMap][faceIndex]+local]
+        self._pointMap, faceLabels = np.unique(pointLabels,return_inverse=True)
+        faceLabels = faceLabels.astype(np.int64)
+
+        self._mesh = type(mesh).fromArrays(
+            mesh.points[self._pointMap],(faceOffsets,faceLabels),newOwner,newNeighbour)
+        self._mesh._boundary = self._subsetBoundary(len(internal),patchFaces,len(exposed))
+
+    def _subsetBoundary(self,nInternalFaces,patchFaces,nExposedFaces):
+        """Patches of the subset mesh with the remaining faces of the
+        original patches and the exposed faces"""
+        boundary = self._baseMesh.boundary
+        complete = {patch.name: len(faces) == patch.nFaces
+                    for patch, faces in zip(boundary,patchFaces)}
+
+        patches = []
+        startFace = nInternalFaces
+        for patch, faces in zip(boundary,patchFaces):
+            entries = dict(patch.entries)
+            entries['nFaces'] = str(len(faces))
+            entries['startFace'] = str(startFace)
+            # Coupled patches are only kept if both sides are complete
+            if patch.type in _coupledPatchTypes and not (
+                    complete[patch.name] and complete.get(patch.neighbourPatch,True)):
+                entries['type'] = 'patch'
+                entries.pop('neighbourPatch',None)
+            patches.append(polyPatch(patch.name,entries,len(patches),self._mesh))
+            startFace += len(faces)
+
+        entries = {'type': 'patch', 'nFaces': str(nExposedFaces), 'startFace': str(startFace)}
+        patches.append(polyPatch(self.exposedPatchName,entries,len(patches),self._mesh))
+        return polyBoundaryMesh(patches)
+
+    def _subsetBoundaryData(self,boundaryData):
+        """Select the patch values of the faces kept in the subset"""
+        result = ofBoundaryData()
+        boundary = self._baseMesh.boundary
+        for name, patch in boundaryData.patches.items():
+            subsetPatch = copy.copy(patch)
+            if patch.hasValue and name in boundary and name in self._mesh.boundary:
+                original = boundary[name]
+                data = np.asarray(patch.data)
+                # Uniform values are stored as a single entry
+                if len(data) == original.nFaces and original.nFaces != 1:
+                    faces = self._faceMap[self._mesh.boundary[name].faceSlice]
+                    subsetPatch.data = data[faces-original.startFace]
+            result.patches[name] = subsetPatch
+        return result
+
+    def readField(self,filePath):
+        """Read a volume field for the subset mesh
+
+        Only the internal field values of the subset cells are decoded from
+        the file.
+
+        Returns:
+        --------
+            ofVolField of the subset mesh
+        """
+        field = readOpenFOAMFile(filePath,cells=self._cellMap)
+        field.boundary = self._subsetBoundaryData(field.boundary)
+        return field
+
+    def subsetField(self,field):
+        """Select the values of the subset from an already read field
+
+        Input:
+        ------
+            field : ofVolField or numpy array of the cell values
+
+        Returns:
+        --------
+            ofVolField or numpy array of the subset mesh
+        """
+        internal = np.asarray(getattr(field,'internal_data',field))
+        if internal.ndim > 0 and internal.shape[0] == self._baseMesh.nCells:
+            internal = internal[self._cellMap]
+        if not hasattr(field,'boundary'):
+            return internal
+        result = ofVolField()
+        result.internal_data = internal
+        result.boundary = self._subsetBoundaryData(field.boundary)
+        return result
+
+    @property
+    def mesh(self):
+        """fvMesh of the subset"""
+        return self._mesh
+
+    @property
+    def baseMesh(self):
+        return self._baseMesh
+
+    @property
+    def cellMap(self):
+        """Original cell of each subset cell"""
+        return self._cellMap
+
+    @property
+    def faceMap(self):
+        """Original face of each subset face"""
+        return self._faceMap
+
+    @property
+    def flipMap(self):
+        """True for the exposed faces that are flipped compared to the
+        original face"""
+        return self._flipMap
+
+    @property
+    def pointMap(self):
+        """Original point of each subset point"""
+        return self._pointMap
@@ -0,0 +1,155 @@
+"""
+Finite volume calculus on an fvMesh, similar to OpenFOAM's fvc namespace.
+All operators are evaluated with the Gauss theorem and linear interpolation
+to the faces:
+
+    from ofReader import fvMesh, fvc, readOpenFOAMFile
+    mesh = fvMesh('path/to/case')
+    U = readOpenFOAMFile('path/to/case/0.1/U')
+
+    gradU = fvc.grad(mesh,U)    # [nCells,3,3] with gradU[:,i,j] = dU_j/dx_i
+    divU  = fvc.div(mesh,U)     # [nCells]
+    curlU = fvc.curl(mesh,U)    # [nCells,3]
+
+The fields can be given as ofVolField, in which case the patch values are
+taken from the boundary data, or as numpy arrays of the cell values.
+
+For very large meshes the faces can be processed in chunks of chunkSize
+faces, which limits the memory of the temporary face fields.
+"""
+
+import numpy as np
+
+
+def _faceValues(mesh,cellValues,boundaryValues,start,stop):
+    """Linear interpolate of the cell values to the faces start to stop"""
+    nInternalFaces = mesh.nInternalFaces
+    values = np.empty((stop-start,)+cellValues.shape[1:])
+
+    internalStop = min(stop,nInternalFaces)
+    if start < internalStop:
+        w = mesh.weights()[start:internalStop]
+        if cellValues.ndim > 1:
+            w = w[:,None]
+        values[:internalStop-start] = w*cellValues[mesh.owner[start:internalStop]] \
+            + (1.0-w)*cellValues[mesh.neighbour[start:internalStop]]
+
+    boundaryStart = max(start,nInternalFaces)
+    if boundaryStart < stop:
+        values[boundaryStart-start:] = \
+            boundaryValues[boundaryStart-nInternalFaces:stop-nInternalFaces]
+    return values
+
+
+def _surfaceIntegrate(mesh,faceContribution,nComponents,chunkSize):
+    """Sum the face contributions of each cell and divide by the cell volume
+
+    The function faceContribution(start,stop) returns the contribution of
+    the faces start to stop with the dimension [stop-start,nComponents].
+    It is added to the owner and subtracted from the neighbour cell.
+    """
+    nCells = mesh.nCells
+    nFaces = mesh.nFaces
+    nInternalFaces = mesh.nInternalFaces
+    if chunkSize is None:
+        chunkSize = nFaces
+
+    result = np.zeros((nCells,nComponents))
+    for start in range(0,nFaces,chunkSize):
+        stop = min(start+chunkSize,nFaces)
+        contribution = faceContribution(start,stop).reshape(stop-start,nComponents)
+        # Scatter only the faces of the chunk, the cost does not depend on
+        # the number of cells
+        nei = mesh.neighbour[start:max(start,min(stop,nInternalFaces))]
+        np.add.at(result,mesh.owner[start:stop],contribution)
+        np.subtract.at(result,nei,contribution[:len(nei)])
+
+    return result/mesh.volumes()[:,None]
+
+
+def interpolate(mesh,field,chunkSize=None):
+    """Linear interpolation of a volume field to the faces
+
+    Returns:
+    --------
+        Array of dimension [nFaces] or [nFaces,3]
+    """
+    cellValues = mesh.cellValues(field)
+    boundaryValues = mesh.boundaryFaceValues(field)
+    if chunkSize is None:
+        chunkSize = mesh.nFaces
+
+    values = np.empty((mesh.nFaces,)+cellValues.shape[1:])
+    for start in range(0,mesh.nFaces,chunkSize):
+        stop = min(start+chunkSize,mesh.nFaces)
+        values[start:stop] = _faceValues(mesh,cellValues,boundaryValues,start,stop)
+    return values
+
+
+def grad(mesh,field,chunkSize=None):
+    """Gauss gradient of a scalar or vector field
+
+    Returns:
+    --------
+        Array of dimension [nCells,3] for scalar fields or [nCells,3,3] for
+        vector fields with grad[:,i,j] = d field_j / d x_i
+    """
+    cellValues = mesh.cellValues(field)
+    boundaryValues = mesh.boundaryFaceValues(field)
+    Sf = mesh.faceAreas()
+
+    if cellValues.ndim == 1:
+        def contribution(start,stop):
+            return Sf[start:stop]*_faceValues(mesh,cellValues,boundaryValues,start,stop)[:,None]
+        return _surfaceIntegrate(mesh,contribution,3,chunkSize)
+
+    def contribution(start,stop):
+        phi = _faceValues(mesh,cellValues,boundaryValues,start,stop)
+        return Sf[start:stop,:,None]*phi[:,None,:]
+    return _surfaceIntegrate(mesh,contribution,9,chunkSize).reshape(mesh.nCells,3,3)
+
+
+def div(mesh,field,chunkSize=None):
+    """Gauss divergence of a face flux or a vector field
+
+    Input:
+    ------
+        field : numpy array or ofVolField
+            Either a face flux field of dimension [nFaces], e.g., phi, or a
+            volume vector field whose face flux is built with Sf & U_f
+
+    Returns:
+    --------
+        Array of dimension [nCells]
+    """
+    if getattr(field,'internal_data',None) is None and np.ndim(field) == 1:
+        phi = np.asarray(field,dtype=float)
+        if len(phi) != mesh.nFaces:
+            raise ValueError(f"Face flux must have nFaces={mesh.nFaces} entries, got {len(phi)}")
+        def contribution(start,stop):
+            return phi[start:stop]
+        return _surfaceIntegrate(mesh,contribution,1,chunkSize)[:,0]
+
+    cellValues = mesh.cellValues(field)
+    boundaryValues = mesh.boundaryFaceValues(field)
+    Sf = mesh.faceAreas()
+    def contribution(start,stop):
+        Uf = _faceValues(mesh,cellValues,boundaryValues,start,stop)
+        return np.einsum('ij,ij->i',Sf[start:stop],Uf)
+    return _surfaceIntegrate(mesh,contribution,1,chunkSize)[:,0]
+
+
+def curl(mesh,field,chunkSize=None):
+    """Gauss curl of a vector field, e.g., the vorticity of U
+
+    Returns:
+    --------
+        Array of dimension [nCells,3]
+    """
+    cellValues = mesh.cellValues(field)
+    boundaryValues = mesh.boundaryFaceValues(field)
+    Sf = mesh.faceAreas()
+    def contribution(start,stop):
+        Uf = _faceValues(mesh,cellValues,boundaryValues,start,stop)
+        return np.cross(Sf[start:stop],Uf)
+    return _surfaceIntegrate(mesh,contribution,3,chunkSize)
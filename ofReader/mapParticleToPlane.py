@@ -13,19 +13,32 @@ class MapParticleToPlane:
     def _triangulate(self,axMinMax,radMinMax,nX,nY):
         xAxis = np.linspace(axMinMax[0],axMinMax[1],nX+1)
         yAxis = np.linspace(radMinMax[0],radMinMax[1],nY+1)
-        if not self._tri:
-            # First create a continuous list of points the triangles can refer to
-            self._triPoints = np.zeros(((nX+1)*(nY+1),2))
-            for i in range(nX+1):
-                for j in range(nY+1):
-                    self._triPoints[i*(nY+1)+j,0] = xAxis[i]
-                    self._triPoints[i*(nY+1)+j,1] = yAxis[j]
-
-            for i in range(nX):
-                for j in range(nY):
-                    self._tri.append((i*(nY+1)+j,(i+1)*(nY+1)+j,(i+1)*(nY+1)+(j+1)))
-                    self._tri.append((i*(nY+1)+j,i*(nY+1)+(j+1),(i+1)*(nY+1)+(j+1)))
-                    
+        # The lattice is rebuilt for every new plane, a previous plane may
+        # have other bounds or number of bins
+        # First create a continuous list of points the triangles can refer to
+        self._triPoints = np.column_stack((np.repeat(xAxis,nY+1),np.tile(yAxis,nX+1)))
+
+        # Two triangles per cell (i,j) of the lattice
+        i, j = np.meshgrid(np.arange(nX),np.arange(nY),indexing='ij')
+        p0 = (i*(nY+1)+j).ravel()
+        tri = np.empty((2*nX*nY,3),dtype=np.int32)
+        tri[0::2] = np.column_stack((p0,p0+nY+1,p0+nY+2))
+        tri[1::2] = np.column_stack((p0,p0+1,p0+nY+2))
+        self._tri = tri
+
+    def _latticeTriangles(self,x,y):
+        """Triangle of each point of the regular lattice, or -1 if the
+        point is outside of the plane. The lattice cell (i,j) is split into
+        the triangles 2*(i*nY+j) below and 2*(i*nY+j)+1 above its diagonal."""
+        xMin, xMax, yMin, yMax, nX, nY = self._lattice
+        u = (x-xMin)/(xMax-xMin)*nX
+        v = (y-yMin)/(yMax-yMin)*nY
+        inside = (u >= 0) & (u <= nX) & (v >= 0) & (v <= nY)
+        # Points on the upper bounds belong to the last cell
+        i = np.clip(np.floor(u),0,nX-1).astype(np.int64)
+        j = np.clip(np.floor(v),0,nY-1).astype(np.int64)
+        above = (v-j) > (u-i)
+        return np.where(inside,2*(i*nY+j)+above,-1)
 
     def _magnitude(self,vector):
         return math.sqrt(sum(pow(element, 2) for element in vector))
@@ -42,6 +55,9 @@ class MapParticleToPlane:
         # Create the triangulation
         self._triangulate((xMin,xMax),(yMin,yMax),nX,nY)
 
+        # The bins of the regular lattice are found arithmetically in map
+        self._lattice = (xMin,xMax,yMin,yMax,nX,nY)
+
         # # Create an interpolator for the plotOverLine function
         # points = []
         # values = []
@@ -57,14 +73,16 @@ class MapParticleToPlane:
     def _createPlaneFromSamplePlane(self,filePath):
         reader = samplePlaneReader()
         reader.readFromFile(filePath)
-        self._tri = reader._tri
-        self._triPoints = reader._triPoints
+        self._tri = reader.triangles
+        self._triPoints = reader.points
+        self._lattice = None
 
     def __init__(self):
         """Initialize a empty mapping object"""
-        self._tri = []
+        self._tri = np.zeros((0,3),dtype=np.int32)
         self._triValues = []
         self._triPoints = []
+        self._lattice = None
 
     def createPlane(self,**kwargs):
         """Generate a 2D plane for mapping the particle data
@@ -149,21 +167,22 @@ class MapParticleToPlane:
                 xBounds = (np.min(pos[:,self._coords[0]]),
                            np.max(pos[:,self._coords[0]]))
 
-            if 'yBounds' in kwargs:
-                yBounds = kwargs['yBounds']
-            else:
-                if self._cylinderDomain:
-                    cylinderCoords = [0,1,2]
+            if self._cylinderDomain:
+                cylinderCoords = [0,1,2]
 
-                    # Remove the x coordinate
-                    cylinderCoords.remove(self._coords[0])
+                # Remove the x coordinate
+                cylinderCoords.remove(self._coords[0])
 
-                    # Determine the other two directions
-                    radInd0 = cylinderCoords[0]
-                    radInd1 = cylinderCoords[1]
+                # Determine the other two directions
+                radInd0 = cylinderCoords[0]
+                radInd1 = cylinderCoords[1]
 
-                    self._cylinderCoords = [self._coords[0],radInd0,radInd1]
+                self._cylinderCoords = [self._coords[0],radInd0,radInd1]
 
+            if 'yBounds' in kwargs:
+                yBounds = kwargs['yBounds']
+            else:
+                if self._cylinderDomain:
                     yBounds = (np.min(np.sqrt(pos[:,radInd0]**2+pos[:,radInd1]**2)),
                                np.max(np.sqrt(pos[:,radInd0]**2+pos[:,radInd1]**2)))
                 else:
@@ -201,20 +220,12 @@ class MapParticleToPlane:
             plane.writeVTKFile('/home/Docs/myFile.vtu')
         """
         
-        # Get all triangles
-        triList = self._tri
+        # Create cells from the triangles for the vtk file, each cell is
+        # given by the number of points followed by the point labels
         triPoints = self._triPoints
         cell_points = np.hstack([triPoints, np.zeros((triPoints.shape[0], 1))])
-
-        # Create cells from the triangles for the vtk file
-        cells = []
-        cell_type = []
-        for tri in triList:
-            cells.append(len(tri))
-            # Cell type is triangle
-            cell_type.append(5)
-            for i in range(len(tri)):
-                cells.append(tri[i])
+        cells = np.column_stack((np.full(len(self._tri),3),self._tri)).ravel()
+        cell_type = np.full(len(self._tri),pv.CellType.TRIANGLE,dtype=np.uint8)
 
         mesh = pv.UnstructuredGrid(cells,cell_type,cell_points)
         mesh.cell_data["values"] = self._triValues
@@ -263,24 +274,25 @@ class MapParticleToPlane:
         if len(pos) != len(val):
             raise ValueError("Position and value array do not match in size")
 
-        counts = np.zeros(len(self._tri))
-        self._triValues = np.zeros(len(self._tri))
-        for p,v in zip(pos,val):
-            point2D = []
-            # Convert the point to the 2D axis system
-            if self._cylinderDomain:
-                point2D = [
-                    p[self._cylinderCoords[0]],
-                    self._magnitude([p[self._cylinderCoords[1]],p[self._cylinderCoords[2]]])]
-            else:
-                point2D = [p[self._coords[0]],p[self._coords[1]]]
-            
-            triIndex = self._triFinder(*point2D)
-            # If -1 the point was not found
-            if (triIndex == -1):
-                continue
-            self._triValues[triIndex] += v
-            counts[triIndex] +=1
+        # Convert the points to the 2D axis system
+        pos = np.asarray(pos)
+        if self._cylinderDomain:
+            x = pos[:,self._cylinderCoords[0]]
+            y = np.hypot(pos[:,self._cylinderCoords[1]],pos[:,self._cylinderCoords[2]])
+        else:
+            x = pos[:,self._coords[0]]
+            y = pos[:,self._coords[1]]
+
+        if self._lattice is not None:
+            triIndex = self._latticeTriangles(x,y)
+        else:
+            triIndex = self._triFinder(x,y)
+
+        # Points outside of the plane have the index -1
+        found = triIndex >= 0
+        counts = np.bincount(triIndex[found],minlength=len(self._tri)).astype(float)
+        self._triValues = np.bincount(triIndex[found],weights=np.asarray(val,dtype=float)[found],
+                                      minlength=len(self._tri))
         
         if normalize:
             self._triValues /=counts
@@ -0,0 +1,256 @@
+"""
+Mesh quality metrics similar to OpenFOAM's checkMesh, evaluated for all
+faces and cells at once from the face and cell geometry of the fvMesh:
+
+    from ofReader import fvMesh
+    from ofReader import meshQuality
+
+    mesh = fvMesh('path/to/case')
+    quality = meshQuality.cellQuality(mesh)
+    quality['nonOrthogonality']     # [nCells] maximum face angle in degrees
+    summary = meshQuality.checkMesh(mesh,bins=20)
+    summary['skewness']['max'], summary['skewness']['nFailed']
+
+The definitions follow OpenFOAM's primitiveMeshTools:
+    nonOrthogonality : angle in degrees between the face area vector and
+                       the vector connecting the owner and neighbour cell
+                       centers. Boundary faces are zero.
+    skewness         : distance of the face center to the intersection of
+                       the face with the cell center connection, normalized
+                       by the face size in this direction. For boundary
+                       faces the connection is the face normal through the
+                       owner cell center.
+    aspectRatio      : maximum of the ratio of the largest to the smallest
+                       projected cell area and of the sum of the projected
+                       areas to the surface of a cube of the same volume.
+                       Empty and wedge directions are excluded, 2D cells
+                       only use the projected area ratio.
+    pyramid volumes  : volume of the pyramids from the face to the owner
+                       and neighbour cell center, positive for a valid cell
+
+For very large meshes the faces can be processed in chunks of chunkSize
+faces, which limits the memory of the temporary face point arrays.
+"""
+
+import numpy as np
+
+# Thresholds of checkMesh, cells above the limit are counted as failed
+_maxNonOrthogonality = 70.0
+_maxSkewness = 4.0
+_maxAspectRatio = 1000.0
+_minPyramidVolume = 0.0
+
+_small = 1E-300
+
+
+def _cellCenterConnection(mesh,start,stop):
+    """Vector from the owner cell center to the neighbour cell center of
+    the faces start to stop. Boundary faces use the normal distance of the
+    owner cell center to the face."""
+    C = mesh.centers()
+    Cf = mesh.faceCenters()[start:stop]
+    Sf = mesh.faceAreas()[start:stop]
+    own = mesh.owner[start:stop]
+    d = Cf - C[own]
+
+    nInternal = max(0,min(stop,mesh.nInternalFaces)-start)
+    d[:nInternal] = C[mesh.neighbour[start:start+nInternal]] - C[own[:nInternal]]
+    normal = Sf[nInternal:]/(np.linalg.norm(Sf[nInternal:],axis=1)[:,None]+_small)
+    d[nInternal:] = normal*np.einsum('ij,ij->i',normal,d[nInternal:])[:,None]
+    return d
+
+
+def _faceQuality(mesh,chunkSize,nonOrthogonality=True,skewness=True):
+    """Non-orthogonality and skewness of the faces, processed in chunks and
+    sharing the cell center connection vectors"""
+    C = mesh.centers()
+    Cf = mesh.faceCenters()
+    Sf = mesh.faceAreas()
+    offsets, labels = mesh.compactFaces()
+    points = mesh.points
+    nFaces = mesh.nFaces
+    nInternalFaces = mesh.nInternalFaces
+    if chunkSize is None:
+        chunkSize = max(1,nFaces)
+
+    angle = np.zeros(nFaces) if nonOrthogonality else None
+    skew = np.zeros(nFaces) if skewness else None
+    for start in range(0,nFaces,chunkSize):
+        stop = min(start+chunkSize,nFaces)
+        d = _cellCenterConnection(mesh,start,stop)
+        S = Sf[start:stop]
+
+        if nonOrthogonality:
+            nInternal = max(0,min(stop,nInternalFaces)-start)
+            cosAngle = np.einsum('ij,ij->i',d[:nInternal],S[:nInternal]) \
+                /(np.linalg.norm(d[:nInternal],axis=1)*np.linalg.norm(S[:nInternal],axis=1)+_small)
+            angle[start:start+nInternal] = np.degrees(np.arccos(np.clip(cosAngle,-1.0,1.0)))
+
+        if skewness:
+            # Skewness vector from the intersection point to the face center
+            Cpf = Cf[start:stop] - C[mesh.owner[start:stop]]
+            sv = Cpf - (np.einsum('ij,ij->i',S,Cpf)/(np.einsum('ij,ij->i',S,d)+_small))[:,None]*d
+            magSv = np.linalg.norm(sv,axis=1)
+            svHat = sv/(magSv[:,None]+_small)
+
+            # Approximate distance from the face center to the face edge in
+            # the direction of the skewness vector
+            faceOffsets = offsets[start:stop+1]
+            nFacePoints = np.diff(faceOffsets)
+            facePoints = labels[faceOffsets[0]:faceOffsets[-1]]
+            distance = np.abs(
+                np.einsum('ij,ij->i',np.repeat(svHat,nFacePoints,axis=0),points[facePoints])
+                - np.repeat(np.einsum('ij,ij->i',svHat,Cf[start:stop]),nFacePoints))
+            fd = np.maximum(np.maximum.reduceat(distance,faceOffsets[:-1]-faceOffsets[0]),
+                            0.2*np.linalg.norm(d,axis=1)+_small)
+            skew[start:stop] = magSv/fd
+    return angle, skew
+
+
+def faceNonOrthogonality(mesh,chunkSize=None):
+    """Non-orthogonality angle of each face in degrees [nFaces]"""
+    return _faceQuality(mesh,chunkSize,skewness=False)[0]
+
+
+def faceSkewness(mesh,chunkSize=None):
+    """Skewness of each face [nFaces]"""
+    return _faceQuality(mesh,chunkSize,nonOrthogonality=False)[1]
+
+
+def facePyramidVolumes(mesh):
+    """Volumes of the pyramids of each face with the owner and the
+    neighbour cell center as apex. Both are positive for valid cells.
+
+    Returns:
+    --------
+        Tuple of the owner pyramid volumes [nFaces] and the neighbour
+        pyramid volumes [nInternalFaces]
+    """
+    C = mesh.centers()
+    Cf = mesh.faceCenters()
+    Sf = mesh.faceAreas()
+    nInternalFaces = mesh.nInternalFaces
+    ownerVolumes = np.einsum('ij,ij->i',Sf,Cf-C[mesh.owner])/3.0
+    neighbourVolumes = np.einsum('ij,ij->i',Sf[:nInternalFaces],
+                                 C[mesh.neighbour]-Cf[:nInternalFaces])/3.0
+    return ownerVolumes, neighbourVolumes
+
+
+def _geometricDirections(mesh):
+    """Directions of the geometry as OpenFOAM's polyMesh::geometricD,
+    directions normal to empty patches, e.g., of one cell thick 2D meshes,
+    and the normal directions of wedge patches are not solved
+
+    Returns:
+    --------
+        Boolean array [3], True for the solved directions
+    """
+    emptyDir = np.zeros(3)
+    wedgeDir = np.zeros(3)
+    nEmpty = 0
+    nWedge = 0
+    for patch in mesh.boundary:
+        if patch.type == 'empty':
+            nEmpty += 1
+            emptyDir += np.abs(patch.faceAreas()).sum(axis=0)
+        elif patch.type == 'wedge' and patch.nFaces > 0:
+            nWedge += 1
+            normal = patch.faceAreas().sum(axis=0)
+            wedgeDir += np.abs(normal)/(np.linalg.norm(normal)+_small)
+
+    directions = np.ones(3,dtype=bool)
+    if nEmpty and np.linalg.norm(emptyDir) > 0:
+        directions = emptyDir/np.linalg.norm(emptyDir) <= 1e-6
+    if nWedge and np.linalg.norm(wedgeDir) > 0:
+        directions &= wedgeDir/np.linalg.norm(wedgeDir) <= 1e-6
+    return directions
+
+
+def cellAspectRatio(mesh):
+    """Aspect ratio of each cell [nCells] as in OpenFOAM's checkMesh"""
+    cellFaces = abs(mesh.faceToCellMatrix())
+    # Sum of the projected face areas in each direction
+    sumMagClosed = cellFaces @ np.abs(mesh.faceAreas())
+
+    # Only the geometric directions, e.g., not the empty direction of 2D
+    # meshes
+    directions = _geometricDirections(mesh)
+    aspectRatio = sumMagClosed[:,directions].max(axis=1)/(sumMagClosed[:,directions].min(axis=1)+_small)
+    if np.all(directions):
+        volume = np.maximum(mesh.volumes(),_small)
+        aspectRatio = np.maximum(aspectRatio,sumMagClosed.sum(axis=1)/6.0/volume**(2.0/3.0))
+    return aspectRatio
+
+
+def _cellReduce(mesh,faceValues,reduction,neighbourValues=None):
+    """Reduce the values of the faces of each cell with the maximum or
+    minimum ufunc. Optionally the neighbour cells use different values."""
+    cellFaces = mesh.faceToCellMatrix()
+    values = faceValues[cellFaces.indices]
+    if neighbourValues is not None:
+        isNeighbour = cellFaces.data < 0
+        values[isNeighbour] = neighbourValues[cellFaces.indices[isNeighbour]]
+    return reduction.reduceat(values,cellFaces.indptr[:-1])
+
+
+def cellQuality(mesh,chunkSize=None):
+    """Quality metrics of all cells
+
+    Input:
+    ------
+        mesh : fvMesh
+        chunkSize : int
+            Number of faces processed at once to limit the memory
+
+    Returns:
+    --------
+        Dictionary with arrays of dimension [nCells] for the keys
+        nonOrthogonality : maximum non-orthogonality of the cell faces
+        skewness         : maximum skewness of the cell faces
+        aspectRatio      : aspect ratio of the cell
+        minPyramidVolume : minimum face pyramid volume of the cell
+    """
+    nonOrthogonality, skewness = _faceQuality(mesh,chunkSize)
+    ownerVolumes, neighbourVolumes = facePyramidVolumes(mesh)
+    return {
+        'nonOrthogonality': _cellReduce(mesh,nonOrthogonality,np.maximum),
+        'skewness'        : _cellReduce(mesh,skewness,np.maximum),
+        'aspectRatio'     : cellAspectRatio(mesh),
+        'minPyramidVolume': _cellReduce(mesh,ownerVolumes,np.minimum,neighbourVolumes)}
+
+
+def checkMesh(mesh,bins=10,chunkSize=None):
+    """Summary of the cell quality metrics with histograms
+
+    Input:
+    ------
+        mesh : fvMesh
+        bins : int or sequence
+            Bins of the histograms as for numpy.histogram
+        chunkSize : int
+            Number of faces processed at once to limit the memory
+
+    Returns:
+    --------
+        Dictionary with an entry for each metric of cellQuality containing
+        a dictionary with min, max, mean, the number of cells exceeding the
+        checkMesh threshold nFailed and the histogram counts and edges
+    """
+    quality = cellQuality(mesh,chunkSize)
+    thresholds = {
+        'nonOrthogonality': lambda v: v > _maxNonOrthogonality,
+        'skewness'        : lambda v: v > _maxSkewness,
+        'aspectRatio'     : lambda v: v > _maxAspectRatio,
+        'minPyramidVolume': lambda v: v <= _minPyramidVolume}
+
+    summary = {}
+    for name, values in quality.items():
+        counts, edges = np.histogram(values,bins=bins)
+        summary[name] = {
+            'min'     : values.min(),
+            'max'     : values.max(),
+            'mean'    : values.mean(),
+            'nFailed' : int(np.count_nonzero(thresholds[name](values))),
+            'counts'  : counts,
+            'edges'   : edges}
+    return summary
@@ -3,6 +3,7 @@ from ofReader.fileHeader import FileHeader
 from ofReader.ofReadSupportFunctions import *
 import os.path as path
 from io import StringIO
+from ofReader.ofStream import ofStream
 
 
 class ofBoundaryData:
@@ -34,7 +35,6 @@ class ofBoundaryData:
         patch itself.
         """
 
-        patch_data = np.zeros(1)
         patch_name = "default"
         patch_type = "empty"
 
@@ -68,8 +68,10 @@ class ofBoundaryData:
                 patch_type = parts[1].rstrip(";")
                 break
 
-        # Read the patch value
-        uniform_value = True
+        # Read the remaining entries of the patch up to its closing bracket
+        patch = Patch(patch_name)
+        patch.type = patch_type
+        depth = 0
         while (True):
             line,eof = self._read_ascii_line(fp)
             if eof:
@@ -77,29 +79,36 @@ class ofBoundaryData:
 
             stripped = line.strip()
 
-            if stripped == "}":
-                p = Patch(patch_name)
-                p.type = patch_type
-                return False,p
-
-            if stripped.startswith("value"):
-                if "nonuniform" in stripped:
-                    uniform_value = False
-                break
-        
-        if not uniform_value:
-            if self._file_header.format == "binary":
-                patch_data = readBinaryDataBlock(fp,self._file_header)
-            else:
-                patch_data = readASCIIDataBlock(fp,self._file_header)
+            if stripped.startswith("{"):
+                depth += 1
+            elif stripped.startswith("}"):
+                if depth == 0:
+                    return True,patch
+                depth -= 1
+            elif depth == 0 and stripped.startswith("value"):
+                patch.data = self._readPatchValue(fp,stripped)
+                patch.hasValue = True
+
+
+    def _readPatchValue(self,fp,line):
+        """Read the value entry of a patch starting in the given line"""
+        parts = line.split()
+        if parts[1] == "uniform":
+            token_text = ' '.join(parts[2:]).rstrip(';').strip().lstrip('(').rstrip(')')
+            tokens = token_text.split()
+            if len(tokens) == 1:
+                return np.array([self._file_header.scalarDataType(tokens[0])])
+            return np.array([tokens],dtype=self._file_header.scalarDataType)
+
+        # Empty lists are written in a single line, e.g., List<scalar> 0()
+        if line.rstrip(';').endswith("0()"):
+            if self._file_header.type == "vectorField":
+                return np.zeros((0,3),dtype=self._file_header.scalarDataType)
+            return np.zeros(0,dtype=self._file_header.scalarDataType)
 
-
-        # Create the Patch
-        patch = Patch(patch_name)
-        patch.type = patch_type
-        patch.data = patch_data
-
-        return True,patch
+        if self._file_header.format == "binary":
+            return readBinaryDataBlock(fp,self._file_header)
+        return readASCIIDataBlock(fp,self._file_header)
 
 
     def __init__(self):
@@ -145,12 +154,15 @@ class ofBoundaryData:
 
     
     def write(self,fp):
-        fp.write("boundaryField\n")
-        fp.write("{\n")
+        """Write the boundaryField dictionary to a text file, or to an
+        ofStream to write nonuniform patch values in binary format"""
+        stream = fp if isinstance(fp,ofStream) else ofStream(fp)
+        stream.write("boundaryField\n")
+        stream.write("{\n")
         for patch in self._patches.values():
-            patch.write(fp)
-        fp.write("}\n")
-        fp.write("\n")
+            patch.write(stream)
+        stream.write("}\n")
+        stream.write("\n")
 
 
 
@@ -163,13 +175,18 @@ class Patch:
         self.name = name
         self.type = "empty"
         self.data = np.zeros(1)
+        # True if the patch has a value entry stored in data
+        self.hasValue = False
 
     def write(self,buffer : StringIO):
-        buffer.write(f"\t{self.name}\n")
-        buffer.write("\t{\n")
-        buffer.write(f"\t\ttype\t{self.type};\n")
-        self._writePatchProperties(buffer)
-        buffer.write("\t}\n")
+        stream = buffer if isinstance(buffer,ofStream) else ofStream(buffer)
+        stream.write(f"\t{self.name}\n")
+        stream.write("\t{\n")
+        stream.write(f"\t\ttype\t{self.type};\n")
+        self._writePatchProperties(stream)
+        if self.hasValue:
+            stream.writeEntry("value",self.data,indent="\t\t")
+        stream.write("\t}\n")
     
     def _writePatchProperties(self,buffer : StringIO):
         buffer.write("")
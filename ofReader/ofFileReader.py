@@ -14,9 +14,11 @@ from tqdm import tqdm
 import sys
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from ofReader.fileHeader import FileHeader
 from ofReader.ofBoundaryData import ofBoundaryData
 from ofReader.ofvolField import ofVolField
+from ofReader.polyBoundaryMesh import readPolyBoundaryMesh
 from ofReader.ofReadSupportFunctions import *
 
 # ==============================================================================
@@ -34,19 +36,24 @@ def readOpenFOAMFile(filePath,**kwargs):
 
         To read the file in decomposed format pass the option decomposed
         U = readOpenFOAMFile('/path/to/case/', fileName='U', time=0, decomposed=True)
-        
-         
+        The processor files are read in parallel by nWorkers processes and
+        the internal field is returned in the global cell order, for
+        surface fields, e.g., phi, in the global internal face order.
+
+        To read only the internal field values of some cells, e.g., of a
+        mesh subset, pass their indices with the option cells
+        U = readOpenFOAMFile('0/U', cells=subset.cellMap)
     """
     decomposed = False
     collated   = False
     time       = 0
     fileName   = ''
     casePath   = filePath
+    cells      = kwargs.get('cells',None)
 
     boundary_data = ofBoundaryData()
 
-    if 'decomposed' in kwargs:
-            decomposed = bool(kwargs['decomposed'])
+    if kwargs.get('decomposed',False):
             if 'time' not in kwargs:
                 raise ValueError('If decomposed is selected a time directory has to be specified.')
             if 'fileName' not in kwargs:
@@ -65,27 +72,29 @@ def readOpenFOAMFile(filePath,**kwargs):
 
         if file_header.format == "binary":
             with open(filePath, mode='rb') as binaryFp:
-                if file_header.fieldType == "volField":
-                    data = readBinaryInternalField(binaryFp,file_header)
+                if file_header.fieldType in ("volField","surfaceField"):
+                    data = readBinaryInternalField(binaryFp,file_header,cells)
                     boundary_data.read(binaryFp,file_header)
                     field = ofVolField()
                     field.internal_data = data
                     field.boundary = boundary_data
+                    field.fieldType = file_header.fieldType
                     return field
                 else:
-                    data = readBinaryDataBlock(binaryFp,file_header)
+                    data = readBinaryDataBlock(binaryFp,file_header,cells)
                     return data
         elif file_header.format == "ASCII":
             with open(filePath, encoding='utf-8', errors='ignore') as asciiFp:
-                if file_header.fieldType == "volField":
-                    data = readASCIIInternalField(asciiFp,file_header)
+                if file_header.fieldType in ("volField","surfaceField"):
+                    data = readASCIIInternalField(asciiFp,file_header,cells)
                     boundary_data.read(asciiFp,file_header)
                     field = ofVolField()
                     field.internal_data = data
                     field.boundary = boundary_data
+                    field.fieldType = file_header.fieldType
                     return field
                 else:
-                    data = readASCIIDataBlock(asciiFp,file_header)
+                    data = readASCIIDataBlock(asciiFp,file_header,cells)
                     return data
         else:
             print("File format is undefined")
@@ -98,46 +107,155 @@ def readOpenFOAMFile(filePath,**kwargs):
         if collated:
             raise NotImplementedError("This feature is not yet implemented.")
         else:
-            # Get the number of processors:
-            nProcs = 0
-            for name in os.listdir(casePath):
-                full_path = os.path.join(casePath, name)
-                if os.path.isdir(full_path) and name.startswith("processor"):
-                    nProcs += 1
-
-            # Read the first processor file
-            data = np.zeros(1)
-            filePath = f'{casePath}/processor0/{time:g}/{fileName}'
-
-            file_header = offile_header()
-            file_header.readFile(filePath)
-
-            if file_header.format == "ASCII":
-                data = readASCIIDataBlock(filePath,file_header)
-            elif file_header.format == "binary":
-                data = readBinaryDataBlock(filePath,file_header)
-            else:
-                print("File format is undefined")
-                sys.exit("Error reading: "+filePath)
+            return _readDecomposedFile(casePath,fileName,time,kwargs.get('nWorkers',None))
 
-            # Read all files:
-            for n in range(1,nProcs):
-                filePath = f'{casePath}/processor{n:g}/{time:g}/{fileName}'
 
-                file_header = offile_header()
-                file_header.readFile(filePath)
+def processorDirectories(casePath):
+    """Return the paths of the processor directories of a decomposed case
+    sorted by the processor number"""
+    processors = []
+    for name in os.listdir(casePath):
+        match = re.fullmatch(r"processor(\d+)",name)
+        if match and os.path.isdir(os.path.join(casePath,name)):
+            processors.append((int(match.group(1)),os.path.join(casePath,name)))
+    return [path for _, path in sorted(processors)]
 
-                if file_header.format == "ASCII":
-                    data1 = readASCIIDataBlock(filePath,file_header)
-                elif file_header.format == "binary":
-                    data1 = readBinaryDataBlock(filePath,file_header)
-                else:
-                    print("File format is undefined")
-                    sys.exit("Error reading: "+filePath)
 
-                data = np.concatenate((data,data1))
-            
-            return data
+def _readDecomposedFile(casePath,fileName,time,nWorkers=None):
+    """Read a file of all processor directories with a pool of worker
+    processes and combine them
+
+    The internal fields of volume fields are placed at their global cell
+    index given by the cellProcAddressing of each processor, the internal
+    fields of surface fields at their global face index given by the
+    faceProcAddressing. All other data, e.g., Lagrangian fields, are
+    concatenated in processor order.
+    """
+    processorPaths = processorDirectories(casePath)
+    if not processorPaths:
+        raise FileNotFoundError(f"No processor directories found in {casePath}")
+    timeName = time if isinstance(time,str) else f'{time:g}'
+    filePaths = [os.path.join(path,timeName,fileName) for path in processorPaths]
+
+    with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+        results = list(executor.map(readOpenFOAMFile,filePaths))
+
+    if not isinstance(results[0],ofVolField):
+        return np.concatenate(results)
+
+    if results[0].fieldType == "surfaceField":
+        return _combineSurfaceFields(processorPaths,filePaths,results)
+
+    addressingPaths = [os.path.join(path,'constant','polyMesh','cellProcAddressing')
+                       for path in processorPaths]
+    if not all(os.path.isfile(path) for path in addressingPaths):
+        return np.concatenate([np.atleast_1d(field.internal_data) for field in results])
+
+    addressing = [readOpenFOAMFile(path) for path in addressingPaths]
+    nCells = max(int(cells.max(initial=-1)) for cells in addressing) + 1
+    data = None
+    for cells, field, filePath in zip(addressing,results,filePaths):
+        internal = _expandUniform(field.internal_data,len(cells),filePath)
+        if data is None:
+            data = np.zeros((nCells,)+internal.shape[1:],dtype=internal.dtype)
+        data[cells] = internal
+    return data
+
+
+def _expandUniform(values,n,filePath):
+    """Return the n values of a field, a uniform value is repeated n times"""
+    values = np.asarray(values)
+    if values.ndim == 0 or (len(values) == 1 and n != 1):
+        value = values if values.ndim == 0 else values[0]
+        return np.broadcast_to(value,(n,)+value.shape)
+    if len(values) != n:
+        raise ValueError(f"Expected {n} values in {filePath}, read {len(values)}")
+    return values
+
+
+def _combineSurfaceFields(processorPaths,filePaths,fields):
+    """Place the internal face values of the surface fields of all
+    processors at their global face index
+
+    A global internal face is either an internal face of one processor or
+    a face of a processor patch on two processors. faceProcAddressing is
+    negative for faces that are flipped on the processor, their values
+    change the sign as fluxes do.
+    """
+    faces, values = [], []
+    for processorPath, filePath, field in zip(processorPaths,filePaths,fields):
+        meshPath = os.path.join(processorPath,'constant','polyMesh')
+        addressingPath = os.path.join(meshPath,'faceProcAddressing')
+        if not os.path.isfile(addressingPath):
+            raise FileNotFoundError(f"Reading the decomposed surface field {filePath} requires {addressingPath}")
+        addressing = np.asarray(readOpenFOAMFile(addressingPath),dtype=np.int64)
+        boundary = readPolyBoundaryMesh(os.path.join(meshPath,'boundary'))
+        nInternalFaces = next(iter(boundary)).startFace if len(boundary) else len(addressing)
+
+        processorFaces = [addressing[:nInternalFaces]]
+        processorValues = [_expandUniform(field.internal_data,nInternalFaces,filePath)]
+        for patch in boundary:
+            if patch.type != "processor" or patch.nFaces == 0:
+                continue
+            patchData = field.boundary.patches.get(patch.name)
+            if patchData is None or not patchData.hasValue:
+                raise ValueError(f"No value for the processor patch {patch.name} in {filePath}")
+            processorFaces.append(addressing[patch.faceSlice])
+            processorValues.append(_expandUniform(patchData.data,patch.nFaces,filePath))
+
+        processorFaces = np.concatenate(processorFaces)
+        processorValues = np.concatenate(processorValues)
+        sign = np.sign(processorFaces)
+        faces.append(np.abs(processorFaces)-1)
+        values.append(processorValues*(sign if processorValues.ndim == 1 else sign[:,None]))
+
+    faces = np.concatenate(faces)
+    values = np.concatenate(values)
+    data = np.zeros((int(faces.max(initial=-1))+1,)+values.shape[1:],dtype=values.dtype)
+    data[faces] = values
+    return data
+
+
+def readParticlePositions(filePath):
+    """Read the positions and the cell labels of a Lagrangian positions file
+    in the format (x y z) celli
+
+    Usage:
+    ------
+        positions, cells = readParticlePositions('0.005/lagrangian/cloud/positions')
+
+    Returns:
+    --------
+        Tuple of the positions [nParticles,3] and the cell label of each
+        particle [nParticles]
+    """
+    file_header = FileHeader()
+    file_header.readFile(filePath)
+    if file_header.type != "particlePosition":
+        raise ValueError(f"{filePath} is not a particle positions file")
+
+    if file_header.format == "binary":
+        with open(filePath, mode='rb') as binaryFp:
+            while True:
+                line = binaryFp.readline()
+                if not line:
+                    raise EOFError(f"No particle list found in {filePath}")
+                if line.strip().isdigit():
+                    nValues = int(line)
+                    break
+            # Discard the opening bracket of the particle list
+            binaryFp.read(1)
+            return readParticlePositionAndCell(binaryFp,file_header,nValues)
+    else:
+        with open(filePath, encoding='utf-8', errors='ignore') as asciiFp:
+            while True:
+                line = asciiFp.readline()
+                if not line:
+                    raise EOFError(f"No particle list found in {filePath}")
+                if line.strip().isdigit():
+                    nValues = int(line)
+                    break
+            return readParticlePositionAndCellASCII(asciiFp,file_header,nValues)
 
 
 def readOpenFOAMDictionary(filename,**kwargs):
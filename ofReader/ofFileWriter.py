@@ -1,15 +1,22 @@
 import numpy as np
 from ofReader.ofFileReader import FileHeader
 from ofReader.ofBoundaryData import ofBoundaryData
+import os
 import os.path as path
-from io import StringIO
+import io
+import gzip
+from concurrent.futures import ProcessPoolExecutor
+from ofReader.ofStream import ofStream, primitiveType
 
-def writeOpenFOAMFile(file_path,file_header : FileHeader, data, boundary : ofBoundaryData, dimensions):
+# Size of the write buffer of the field files in bytes
+_bufferSize = 1 << 22
+
+def writeOpenFOAMFile(file_path,file_header : FileHeader, data, boundary : ofBoundaryData, dimensions, **kwargs):
     """Write an OpenFOAM field file including internal and boundary field data.
 
     Parameters
     ----------
-    file_path : str
+    file_path : str or path-like
         Absolute or relative path to the OpenFOAM field file 
         (e.g., '/path/to/case/0/U').
 
@@ -19,7 +26,7 @@ def writeOpenFOAMFile(file_path,file_header : FileHeader, data, boundary : ofBou
         - Scalar precision / size
         - Header configuration
 
-    data : numpy.ndarray
+    data : numpy.ndarray or ofVolField
         Internal field values. Shape depends on field type:
         - (nCells,) for scalar fields
         - (nCells, 3) for vector fields
@@ -34,6 +41,19 @@ def writeOpenFOAMFile(file_path,file_header : FileHeader, data, boundary : ofBou
         in the format:
             [mass, length, time, temperature, quantity, current, luminousIntensity]
 
+    precision : int, optional
+        Number of significant digits of the scalars in ASCII format,
+        by default 6 as OpenFOAM's writePrecision.
+
+    compression : int or bool, optional
+        gzip compression level from 1 to 9, True for level 6. The file is
+        written as file_path.gz, which OpenFOAM reads like the plain file.
+        By default the file is not compressed.
+
+    Returns
+    -------
+    Path of the written file
+
     Notes
     -----
     The function writes a complete OpenFOAM field file including:
@@ -42,6 +62,11 @@ def writeOpenFOAMFile(file_path,file_header : FileHeader, data, boundary : ofBou
     - Internal field definition
     - Boundary field definitions
 
+    In binary format the internal field and the nonuniform patch values
+    are written as single blocks of little endian values with the label and
+    scalar size of the file header (32 or 64 bit). A single value is written
+    as uniform entry.
+
     Example
     -------
     >>> writeOpenFOAMFile(
@@ -52,68 +77,152 @@ def writeOpenFOAMFile(file_path,file_header : FileHeader, data, boundary : ofBou
     ...     dimensions
     ... )
     """
-    
-
-    # Currently only binary is supported.
-    file_header.format = "ascii"
-
-    # Name of the file is the last part of the file name
-    name = path.basename(file_path)
-    _writeOpenFOAMHeader(file_path,file_header, name)
-    _writeDimensions(file_path,dimensions)
-    _writeASCIIDataBlock(file_path,file_header, data)
-    _writeASCIIBoundaryData(file_path,boundary)
-    
-    
-
-
-def _writeOpenFOAMHeader(filePath,fileFormat : FileHeader,name):
-    f = open(filePath, "w")
-    f.write("/*--------------------------------*- C++ -*----------------------------------*\\\n")
-    f.write("| =========                 |                                                 |\n")
-    f.write("| \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |\n")
-    f.write("|  \\    /   O peration     | Version:  2312                                  |\n")
-    f.write("|   \\  /    A nd           | Website:  www.openfoam.com                      |\n")
-    f.write("|    \\/     M anipulation  |                                                 |\n")
-    f.write("\*---------------------------------------------------------------------------*/\n")
-    f.write("FoamFile\n")
-    f.write("{\n")
-    f.write("    version     2.0;\n")
-    f.write(f"    format      {fileFormat.format.lower()};\n")
-    f.write(f"    arch        \"LSB;label={fileFormat.labelSize:d};scalar={fileFormat.scalarSize:d}\";\n")
-    f.write(f"    class       {fileFormat.type};\n")
-    f.write("    location    \"0.00000000e+00\";\n")
-    f.write(f"    object      {name};\n")
-    f.write("}\n")
-    f.write("// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n")
-    f.write("\n")
-    f.close()
-
-def _writeDimensions(filePath,dimensions):
-    f = open(filePath, "a")
-    f.write("dimensions\t[")
-    for e in dimensions:
-        f.write(f"{e:d} ")
-    f.write("];\n\n")
-
-def _writeASCIIDataBlock(filePath,fileFormat : FileHeader,data):
-    f = open(filePath, "a")
-    if fileFormat.type == "vectorField" or fileFormat.type == "volVectorField":
-        f.write("internalField   nonuniform List<vector>\n")
-        f.write(f"{len(data):d}\n")
-        f.write("(\n")
-        for i in range(len(data)):
-            f.write(f"({data[i][0]:g} {data[i][1]:g} {data[i][2]:g})\n")
-        f.write(");\n")
-    if fileFormat.type == "scalarField" or fileFormat.type == "volScalarField":
-        f.write("internalField   nonuniform List<scalar>\n")
-        f.write(f"{len(data):d}\n")
-        f.write("(\n")
-        for i in range(len(data)):
-            f.write(f"{data[i]:g}\n")
-        f.write(");\n")
-
-def _writeASCIIBoundaryData(file_path,boundary : ofBoundaryData):
-    with open(file_path,  "a", encoding='utf-8', errors='ignore') as asciiFp:
-        boundary.write(asciiFp)
-    
+    file_path = os.fspath(file_path)
+    level = compressionLevel(kwargs.get('compression',None))
+    if level and not file_path.endswith('.gz'):
+        file_path = file_path + '.gz'
+    # Name of the file is the last part of the file name and the location
+    # the name of the time directory
+    name = path.basename(file_path[:-3] if file_path.endswith('.gz') else file_path)
+    location = path.basename(path.dirname(path.abspath(file_path)))
+    with openOutputFile(file_path,level) as fp:
+        writeOpenFOAMField(fp,file_header,name,data,boundary,dimensions,
+                           location=location,precision=kwargs.get('precision',6))
+    return file_path
+
+
+def writeOpenFOAMFiles(files,nWorkers=None,**kwargs):
+    """Write several field files with a pool of worker processes, e.g., to
+    compress many fields on all cores
+
+    Input:
+    ------
+        files : list of tuples
+            Arguments (file_path, file_header, data, boundary, dimensions)
+            of writeOpenFOAMFile for each file
+        nWorkers : int
+            Number of worker processes, by default the number of CPUs
+
+    Optional Parameters:
+    --------------------
+        precision, compression as for writeOpenFOAMFile
+
+    Returns:
+    --------
+        List of the written files
+    """
+    with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+        futures = [executor.submit(writeOpenFOAMFile,*args,**kwargs) for args in files]
+        return [future.result() for future in futures]
+
+
+def compressionLevel(compression):
+    """gzip level of the compression option, True for level 6, zero for no
+    compression"""
+    if compression is True:
+        return 6
+    level = int(compression or 0)
+    if not 0 <= level <= 9:
+        raise ValueError(f"Invalid compression level {compression}, use 1 to 9")
+    return level
+
+
+def openOutputFile(file_path,compression=None):
+    """Open an output file in binary mode for writing in one pass through a
+    large buffer
+
+    Input:
+    ------
+        file_path : str or path-like, used as given without adding .gz
+        compression : int or bool
+            gzip compression level, see compressionLevel
+
+    Returns:
+    --------
+        File object, compressed with gzip if the level is larger than zero
+    """
+    level = compressionLevel(compression)
+    if level:
+        return io.BufferedWriter(gzip.GzipFile(file_path,"wb",compresslevel=level),_bufferSize)
+    return open(file_path,"wb",buffering=_bufferSize)
+
+
+def writeOpenFOAMField(fp,file_header : FileHeader,name,data,boundary,dimensions,**kwargs):
+    """Write a field with its FoamFile header to a file object, e.g., an
+    open file or a buffer for the blocks of a collated file
+
+    Input:
+    ------
+        fp : file object opened in binary mode
+        file_header : FileHeader with the format and the data type
+        name : object name of the field
+        data, boundary, dimensions : as for writeOpenFOAMFile
+
+    Optional Parameters:
+    --------------------
+        location : string
+            Location entry of the header, by default "0"
+        precision : int
+            Significant digits in ASCII format, by default 6
+        header : bool
+            Write the FoamFile header, by default True
+    """
+    data = getattr(data,'internal_data',data)
+    stream = ofStream(fp,file_header,kwargs.get('precision',6))
+    if kwargs.get('header',True):
+        writeFoamFileHeader(stream,file_header,name,fieldClassName(file_header,data),kwargs.get('location',"0"))
+    _writeDimensions(stream,dimensions)
+    stream.writeEntry("internalField",data)
+    stream.write("\n")
+    boundary.write(stream)
+
+
+def fieldClassName(file_header : FileHeader,data):
+    """Class of the field in the file header, e.g., volScalarField"""
+    fieldType = primitiveType(file_header,data)
+    headerType = file_header.type
+    if file_header.fieldType == "surfaceField" or headerType.startswith("surface"):
+        return "surface" + fieldType[0].upper() + fieldType[1:] + "Field"
+    return "vol" + fieldType[0].upper() + fieldType[1:] + "Field"
+
+
+def writeFoamFileHeader(stream,fileFormat : FileHeader,name,className,location="0",extraEntries=None):
+    """Write the banner and the FoamFile dictionary
+
+    Input:
+    ------
+        stream : ofStream or file object opened in binary mode
+        fileFormat : FileHeader with the format, label and scalar size
+        name : object name
+        className : class entry, e.g., volScalarField
+        location : location entry, e.g., the time directory
+        extraEntries : dict of further entries, e.g., data.format
+    """
+    if not isinstance(stream,ofStream):
+        stream = ofStream(stream,fileFormat)
+    if fileFormat.labelSize not in (32,64) or fileFormat.scalarSize not in (32,64):
+        raise ValueError(f"Unsupported label size {fileFormat.labelSize} or scalar size {fileFormat.scalarSize}")
+    fileFormatName = "binary" if stream.binary else "ascii"
+    stream.write("/*--------------------------------*- C++ -*----------------------------------*\\\n")
+    stream.write("| =========                 |                                                 |\n")
+    stream.write("| \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |\n")
+    stream.write("|  \\    /   O peration     | Version:  2312                                  |\n")
+    stream.write("|   \\  /    A nd           | Website:  www.openfoam.com                      |\n")
+    stream.write("|    \\/     M anipulation  |                                                 |\n")
+    stream.write("\\*---------------------------------------------------------------------------*/\n")
+    stream.write("FoamFile\n")
+    stream.write("{\n")
+    stream.write("    version     2.0;\n")
+    stream.write(f"    format      {fileFormatName};\n")
+    stream.write(f"    arch        \"LSB;label={fileFormat.labelSize:d};scalar={fileFormat.scalarSize:d}\";\n")
+    stream.write(f"    class       {className};\n")
+    stream.write(f"    location    \"{location}\";\n")
+    stream.write(f"    object      {name};\n")
+    for key, value in (extraEntries or {}).items():
+        stream.write(f"    {key:<12}{value};\n")
+    stream.write("}\n")
+    stream.write("// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n")
+    stream.write("\n")
+
+def _writeDimensions(stream : ofStream,dimensions):
+    stream.write("dimensions\t[" + " ".join(f"{e:d}" for e in dimensions) + "];\n\n")
@@ -43,39 +43,33 @@ def readFaceCompactList(binaryFp, file_header : FileHeader, binaryDataPos,nValue
     # Read closing bracket
     binaryFp.read(1)
 
-    ascii_reader = io.TextIOWrapper(binaryFp, encoding='utf-8', errors='ignore')
-
+    # Skip to the size of the face label block. Read the lines directly from
+    # the binary file object, a TextIOWrapper would read ahead and move the
+    # file position past the start of the label block.
     while True:
-        line = ascii_reader.readline()
+        line = binaryFp.readline()
         if not line:
-            break
+            raise EOFError("Reached end of file before finding the face labels")
         # Remove white space
-        line = line.rstrip()
+        line = line.decode('utf-8', errors='ignore').strip()
 
         # Check for beginning of the face label block
         if (line.isnumeric()):
+            nLabels = int(line)
             break
 
-    ascii_reader.detach()
-
-    print("Allocate space for ",nValues," faces...")
-    faces = np.empty((nValues-1),dtype=object)
-    print("done")
-
+    # Discard the opening bracket of the label block
     binaryFp.read(1)
 
-    nFaces = nValues -1
-    facesToRead = min(nFaces,500)
-    readFaces = 0
-    for i in tqdm(range(int(math.ceil(nFaces/facesToRead)))):
-        facesToRead = min(facesToRead,nFaces-readFaces)
-        nLabels = int(startIndices[readFaces+facesToRead]-startIndices[readFaces])
-        buffer = np.frombuffer(binaryFp.read(nLabels*file_header.labelByteSize),dtype=file_header.labelDataType,count=nLabels)
-        for j in range(readFaces,readFaces+facesToRead):
-            startIndexOfBuffer = startIndices[j] - startIndices[readFaces]
-            stopIndexOfBuffer = startIndices[j+1] - startIndices[readFaces]
-            faces[j] = np.array(buffer[startIndexOfBuffer:stopIndexOfBuffer])
-        readFaces = readFaces+facesToRead
+    # All labels are stored contiguously, read them at once and split them
+    # at the start indices
+    labels = np.frombuffer(
+        binaryFp.read(nLabels*file_header.labelByteSize),
+        dtype=file_header.labelDataType,
+        count=nLabels)
+
+    faces = np.empty((nValues-1),dtype=object)
+    faces[:] = np.split(labels,startIndices[1:-1])
     return faces
 
 def readLabelField(binaryFp, file_header : FileHeader, nValues : int):
@@ -132,18 +126,25 @@ def readVectorField(binaryFp, file_header : FileHeader, nValues : int):
     return data
 
 def readParticlePosition(binaryFp, file_header : FileHeader, nValues : int):
-    # Set buffer length to read
-    data = np.zeros((nValues,3),dtype=file_header.scalarDataType)
-    for i in tqdm(range(nValues)):
-        # Read first two bytes as opening bracket and new line character and discard
-        binaryFp.read(2)
-        data[i] = np.frombuffer(binaryFp.read(3*file_header.scalarByteSize),dtype=file_header.scalarDataType,count=3)
-        
-        # read integer for orig particle ID
-        binaryFp.read(file_header.labelByteSize)
-        # Read closing bracket
-        binaryFp.read(1)
-    return data
+    return readParticlePositionAndCell(binaryFp,file_header,nValues)[0]
+
+def readParticlePositionAndCell(binaryFp, file_header : FileHeader, nValues : int):
+    """Read the positions and the cell labels of the particles
+
+    Each particle is stored as opening bracket and new line character, the
+    position, the cell label and the closing bracket. All particles are
+    read at once with a structured data type.
+    """
+    particleDataType = np.dtype([
+        ('opening', 'V2'),
+        ('position', file_header.scalarDataType, 3),
+        ('celli', file_header.labelDataType),
+        ('closing', 'V1')])
+    data = np.frombuffer(
+        binaryFp.read(nValues*particleDataType.itemsize),
+        dtype=particleDataType,
+        count=nValues)
+    return np.array(data['position']), data['celli'].astype(np.int64)
 
 
 def readLabelFieldASCII(asciiFp, file_header : FileHeader, nValues : int):
@@ -233,7 +234,11 @@ def readFaceList(asciiFp, file_header : FileHeader, nValues : int):
     return faces
 
 def readParticlePositionASCII(asciiFp, file_header : FileHeader, nValues : int):
-    data = np.zeros((nValues,3),dtype=file_header.scalarDataType)
+    return readParticlePositionAndCellASCII(asciiFp,file_header,nValues)[0]
+
+def readParticlePositionAndCellASCII(asciiFp, file_header : FileHeader, nValues : int):
+    """Read the positions and the cell labels of the particles stored as
+    (x y z) celli in each line"""
     # Find opening bracket
     while True:
         line = asciiFp.readline()
@@ -241,24 +246,84 @@ def readParticlePositionASCII(asciiFp, file_header : FileHeader, nValues : int):
         if not line or '(' in line:
             break
 
+    positions = np.zeros((nValues,3),dtype=file_header.scalarDataType)
+    cells = np.full(nValues,-1,dtype=np.int64)
     for i in range(nValues):
         line = asciiFp.readline()
-        line.rstrip()
         if not line:
             break
         # Break line in parts
-        subStr = line.split('(')
-        subStr = subStr[1].split(')')
-        subStr = subStr[0].split()
-        data[i][0] = file_header.scalarDataType(subStr[0])
-        data[i][1] = file_header.scalarDataType(subStr[1])
-        data[i][2] = file_header.scalarDataType(subStr[2])
+        subStr = line.split(')')
+        positions[i] = subStr[0].lstrip().lstrip('(').split()
+        cellLabel = subStr[1].split()
+        if cellLabel:
+            cells[i] = int(cellLabel[0])
+
+    return positions, cells
 
+
+
+def readBinaryFieldSubset(binaryFp, file_header : FileHeader, nValues : int, indices):
+    """Read only the values with the given indices of a binary label, scalar
+    or vector block
+
+    The block is read in pages and only pages containing requested values
+    are read and decoded. Afterwards the file pointer is placed behind the
+    block, so the boundary data can be read as usual.
+    """
+    indices = np.asarray(indices,dtype=np.int64)
+    if len(indices) > 0 and (indices.min() < 0 or indices.max() >= nValues):
+        raise IndexError(f"Indices out of range for a block of {nValues} values")
+    if file_header.type == "label":
+        dataType, byteSize, nComponents = file_header.labelDataType, file_header.labelByteSize, 1
+    else:
+        dataType, byteSize = file_header.scalarDataType, file_header.scalarByteSize
+        nComponents = 3 if file_header.type == "vectorField" else 1
+    valueSize = nComponents*byteSize
+
+    start = binaryFp.tell()
+    data = np.zeros((len(indices),nComponents),dtype=dataType)
+    pageSize = 65536
+    pages = indices // pageSize
+    for page in np.unique(pages):
+        first = int(page)*pageSize
+        count = min(pageSize,nValues-first)
+        binaryFp.seek(start + first*valueSize)
+        buffer = np.frombuffer(
+            binaryFp.read(count*valueSize),
+            dtype=dataType,
+            count=count*nComponents).reshape(count,nComponents)
+        inPage = pages == page
+        data[inPage] = buffer[indices[inPage]-first]
+    binaryFp.seek(start + nValues*valueSize)
+
+    if nComponents == 1:
+        return data[:,0]
     return data
 
+def readASCIIFieldSubset(asciiFp, file_header : FileHeader, nValues : int, indices):
+    """Read only the values with the given indices of an ASCII label, scalar
+    or vector block. All lines of the block are read but only the requested
+    ones are converted."""
+    indices = np.asarray(indices,dtype=np.int64)
+    # Find opening bracket
+    while True:
+        line = asciiFp.readline()
+        if not line or '(' in line:
+            break
+
+    lines = [asciiFp.readline() for _ in range(nValues)]
+    selected = [lines[i] for i in indices]
+    if file_header.type == "vectorField":
+        return np.array([line.strip().strip('()').split() for line in selected],
+                        dtype=file_header.scalarDataType).reshape(len(indices),3)
+    if file_header.type == "label":
+        return np.array(selected,dtype=file_header.labelDataType)
+    return np.array(selected,dtype=file_header.scalarDataType)
 
 
-def readBinaryDataBlock(binaryFp,file_header : FileHeader):
+
+def readBinaryDataBlock(binaryFp,file_header : FileHeader,cells=None):
     # Find how many values have to be read
     data = np.zeros(1)
     nValues = 0
@@ -288,11 +353,16 @@ def readBinaryDataBlock(binaryFp,file_header : FileHeader):
         # Check for beginning of block
         if (line.isnumeric()):
             nValues = int(line)
+            binaryDataPos = binaryFp.tell()
             break
 
 
     if file_header.type == "faceCompactList":
         return readFaceCompactList(binaryFp,file_header,binaryDataPos,nValues)
+    elif cells is not None and file_header.type in ("scalar","label","vectorField"):
+        # Discard the opening bracket of the data field
+        binaryFp.read(1)
+        return readBinaryFieldSubset(binaryFp,file_header,nValues,cells)
     else:
         # Read the next byte and express as char
         binaryFp.read(1)
@@ -319,7 +389,7 @@ def readBinaryDataBlock(binaryFp,file_header : FileHeader):
     return data
 
 
-def readASCIIDataBlock(asciiFp,file_header : FileHeader):
+def readASCIIDataBlock(asciiFp,file_header : FileHeader,cells=None):
     data = np.zeros(1)
 
     # Number of values to read
@@ -333,7 +403,9 @@ def readASCIIDataBlock(asciiFp,file_header : FileHeader):
             nValues = int(line)
             break
 
-    if file_header.type == "scalar":
+    if cells is not None and file_header.type in ("scalar","label","vectorField"):
+        data = readASCIIFieldSubset(asciiFp,file_header,nValues,cells)
+    elif file_header.type == "scalar":
         data = readScalarFieldASCII(asciiFp,file_header,nValues)
     elif file_header.type == "label":
         data = readLabelFieldASCII(asciiFp,file_header,nValues)
@@ -349,8 +421,9 @@ def readASCIIDataBlock(asciiFp,file_header : FileHeader):
     return data
 
 
-def readASCIIInternalField(asciiFp, file_format : FileHeader):
-    """Read the internal field of a volField"""
+def readASCIIInternalField(asciiFp, file_format : FileHeader, cells=None):
+    """Read the internal field of a volField, optionally only the values of
+    the given cells"""
     data = np.zeros(1)
     for line in asciiFp:
         line = line.rstrip()
@@ -372,11 +445,12 @@ def readASCIIInternalField(asciiFp, file_format : FileHeader):
                     data = file_format.scalarDataType(scalar)
                     break
             else:
-                data = readASCIIDataBlock(asciiFp,file_format)
+                data = readASCIIDataBlock(asciiFp,file_format,cells)
+                break
     return data
 
 
-def readBinaryInternalField(binaryFp, file_format : FileHeader):
+def readBinaryInternalField(binaryFp, file_format : FileHeader, cells=None):
     """
     Read the ASCII header up to the internalField line from the binary file object `binaryFp`.
     This function uses binaryFp.readline() to avoid TextIOWrapper read-ahead buffering.
@@ -386,6 +460,7 @@ def readBinaryInternalField(binaryFp, file_format : FileHeader):
     Arguments
     - binaryFp: a binary file-like object opened in 'rb' mode, seekable.
     - file_format: object with attributes `type` and `scalarDataType` (callable/type).
+    - cells: optional indices of the values to read, all values if None.
     """
 
     # Default return if we never find the field
@@ -454,7 +529,7 @@ def readBinaryInternalField(binaryFp, file_format : FileHeader):
 
         else:
             # Non-uniform — we stop here and let the binary reader handle the block
-            return readBinaryDataBlock(binaryFp, file_format)
+            return readBinaryDataBlock(binaryFp, file_format, cells)
 
     # If we reach here, internalField not found; raise or return default
     raise EOFError("Could not find 'internalField' in file")
@@ -0,0 +1,140 @@
+import numpy as np
+import io
+from ofReader.fileHeader import FileHeader
+
+# OpenFOAM primitive type of the data by the number of components
+_primitiveTypes = {1: "scalar", 3: "vector", 6: "symmTensor", 9: "tensor"}
+
+
+def primitiveType(file_header : FileHeader, data):
+    """Return the OpenFOAM primitive type name of the data, e.g., scalar or
+    vector. The type of the file header is used if it is defined, otherwise
+    it is derived from the number of components of the data."""
+    headerType = file_header.type.lower()
+    if "label" in headerType:
+        return "label"
+    if "vector" in headerType:
+        return "vector"
+    if "scalar" in headerType:
+        return "scalar"
+    data = np.asarray(data)
+    nComponents = 1 if data.ndim < 2 else data.shape[-1]
+    if nComponents not in _primitiveTypes:
+        raise ValueError(f"Cannot write data with {nComponents} components")
+    return _primitiveTypes[nComponents]
+
+
+class ofStream:
+    """Output stream of an OpenFOAM file in ASCII or binary format
+
+    Similar to OpenFOAM's OFstream, the dictionary entries are written as
+    text and the data of nonuniform lists in the format of the file header,
+    i.e., as ASCII values or as one block of binary values with the label
+    and scalar size of the header.
+
+    Usage:
+    ------
+        with open('0/U','wb') as fp:
+            os = ofStream(fp,header)
+            os.write("dimensions [0 1 -1 0 0 0 0];\\n")
+            os.writeEntry("internalField",U)
+    """
+
+    # Number of list entries formatted at once in ASCII format
+    chunkSize = 100000
+
+    def __init__(self,fp,file_header : FileHeader = None,precision=6):
+        """
+        Input:
+        ------
+            fp : file object opened in binary mode, or in text mode for
+                 ASCII output
+            file_header : FileHeader with the format, label and scalar size
+            precision : number of significant digits of ASCII scalars
+        """
+        self._fp = fp
+        self._precision = int(precision)
+        self._header = file_header if file_header is not None else FileHeader()
+        self._binary = self._header.format.lower() == "binary"
+        self._encode = not isinstance(fp,io.TextIOBase)
+        if self._binary and not self._encode:
+            raise ValueError("Binary output requires a file opened in binary mode")
+
+    def write(self,text : str):
+        self._fp.write(text.encode() if self._encode else text)
+
+    def writeBinary(self,values):
+        """Write the raw bytes of a contiguous array"""
+        self._fp.write(memoryview(np.ascontiguousarray(values)).cast('B'))
+
+    def _dataType(self,valueType):
+        """Little endian data type of the label or scalar values"""
+        if valueType == "label":
+            return np.dtype(self._header.labelDataType).newbyteorder('<')
+        return np.dtype(self._header.scalarDataType).newbyteorder('<')
+
+    def _valueFormat(self,valueType,nComponents):
+        """printf style format of a single value, e.g., (%.6g %.6g %.6g)"""
+        component = "%d" if valueType == "label" else f"%.{self._precision}g"
+        if nComponents == 1:
+            return component
+        return "(" + " ".join([component]*nComponents) + ")"
+
+    def _formatValue(self,value,valueType):
+        value = np.asarray(value).ravel()
+        return self._valueFormat(valueType,len(value)) % tuple(value.tolist())
+
+    def writeList(self,data,valueType):
+        """Write the size and the values of a list, e.g.,
+            3
+            (
+            1
+            2
+            3
+            )
+        In ASCII format the values are formatted in chunks of chunkSize
+        entries, in binary format all values are written at once between
+        the brackets."""
+        data = np.asarray(data)
+        if self._binary:
+            values = np.ascontiguousarray(data,dtype=self._dataType(valueType))
+            self.write(f"\n{len(data):d}\n(")
+            self.writeBinary(values)
+            self.write(")")
+        else:
+            # Format chunks of values with a single string operation
+            nComponents = 1 if data.ndim == 1 else data.shape[1]
+            lineFormat = self._valueFormat(valueType,nComponents) + "\n"
+            self.write(f"\n{len(data):d}\n(\n")
+            for start in range(0,len(data),self.chunkSize):
+                chunk = data[start:start+self.chunkSize]
+                self.write((lineFormat*len(chunk)) % tuple(chunk.ravel().tolist()))
+            self.write(")")
+
+    def writeEntry(self,keyword,data,indent=""):
+        """Write a field entry, e.g., internalField or value, as uniform
+        value if the data has a single value or as nonuniform list"""
+        data = np.asarray(data)
+        valueType = primitiveType(self._header,data)
+        isScalar = valueType in ("scalar","label")
+        if data.ndim == 0 or (data.ndim == 1 and not isScalar) or len(data) == 1:
+            self.write(f"{indent}{keyword:<16}uniform {self._formatValue(data,valueType)};\n")
+            return
+        if len(data) == 0:
+            self.write(f"{indent}{keyword:<16}nonuniform List<{valueType}> 0();\n")
+            return
+        self.write(f"{indent}{keyword:<16}nonuniform List<{valueType}> ")
+        self.writeList(data,valueType)
+        self.write("\n;\n")
+
+    @property
+    def binary(self):
+        return self._binary
+
+    @property
+    def precision(self):
+        return self._precision
+
+    @property
+    def fileHeader(self):
+        return self._header
@@ -3,11 +3,24 @@ from ofReader.ofBoundaryData import ofBoundaryData
 
 class ofVolField:
     """Volume field of vectors or scalars
+
+    Surface fields, e.g., phi, are read into the same class, their
+    fieldType is "surfaceField" and the internal data holds the values of
+    the internal faces.
     """
 
     def __init__(self):
         self._internal_data = np.zeros(1)
         self._boundary = ofBoundaryData()
+        self._fieldType = "volField"
+
+    @property
+    def fieldType(self):
+        return self._fieldType
+
+    @fieldType.setter
+    def fieldType(self,fieldType):
+        self._fieldType = fieldType
 
     @property
     def internal_data(self):
@@ -23,4 +36,4 @@ class ofVolField:
 
     @internal_data.setter
     def internal_data(self,data):
-        self._internal_data = data
\ No newline at end of file
+        self._internal_data = data
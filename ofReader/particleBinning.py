@@ -0,0 +1,158 @@
+import numpy as np
+from ofReader.ofvolField import ofVolField
+from ofReader.ofBoundaryData import ofBoundaryData, Patch
+
+# Patch types that are written with their type only, all other patches
+# are written as calculated with the value of the adjacent cell
+_constraintPatchTypes = [
+    "cyclic", "cyclicAMI", "cyclicSlip", "processor", "processorCyclic",
+    "empty", "wedge", "symmetry", "symmetryPlane"]
+
+
+def _volField(mesh,values):
+    """Create an ofVolField of the mesh from the cell values"""
+    boundary = ofBoundaryData()
+    for polyPatch in mesh.boundary:
+        patch = Patch(polyPatch.name)
+        if polyPatch.type in _constraintPatchTypes:
+            patch.type = polyPatch.type
+        else:
+            patch.type = "calculated"
+            patch.data = values[polyPatch.faceCells()]
+            patch.hasValue = True
+        boundary.patches[polyPatch.name] = patch
+
+    field = ofVolField()
+    field.internal_data = values
+    field.boundary = boundary
+    return field
+
+
+class particleBinning:
+    """Assign Lagrangian particles to the mesh cells and reduce particle
+    properties per cell, e.g., to compute the liquid volume fraction, the
+    number density or the Sauter mean diameter of a spray.
+
+    The cell of each particle is taken from the cell label stored in the
+    positions file. Particles without a valid label are located with the
+    cell locator of the mesh. Particles outside of the mesh are ignored.
+
+    All reductions are evaluated with numpy.bincount and return an
+    ofVolField of the mesh, which can be written with writeOpenFOAMFile.
+
+    Usage:
+    ------
+        mesh = fvMesh('path/to/case')
+        positions, cells = readParticlePositions('path/to/case/0.1/lagrangian/cloud/positions')
+        d = readOpenFOAMFile('path/to/case/0.1/lagrangian/cloud/d')
+        nParticle = readOpenFOAMFile('path/to/case/0.1/lagrangian/cloud/nParticle')
+
+        binning = particleBinning(mesh,positions,cells)
+        alpha = binning.volumeFraction(d,nParticle)
+        d32 = binning.sauterMeanDiameter(d,nParticle)
+        U = binning.mean(readOpenFOAMFile('path/to/case/0.1/lagrangian/cloud/U'))
+    """
+
+    def __init__(self,mesh,positions,cells=None,chunkSize=100000):
+        """Find the cell of each particle
+
+        Input:
+        ------
+            mesh : fvMesh
+            positions : particle positions of dimension [nParticles,3]
+            cells : cell label of each particle, e.g., from the positions
+                    file. Labels outside of the mesh are located again.
+            chunkSize : number of particles located at once
+        """
+        self._mesh = mesh
+        positions = np.asarray(positions,dtype=float).reshape(-1,3)
+        if cells is None:
+            cells = np.full(len(positions),-1,dtype=np.int64)
+        cells = np.array(cells,dtype=np.int64)
+
+        invalid = (cells < 0) | (cells >= mesh.nCells)
+        if np.any(invalid):
+            cells[invalid] = mesh.findCells(positions[invalid],chunkSize)
+        self._particleCells = cells
+        self._inside = cells >= 0
+
+    def _bincount(self,values):
+        """Sum the particle values of each cell for scalar and vector values"""
+        values = np.asarray(values,dtype=float)
+        if values.ndim == 0:
+            values = np.full(len(self._particleCells),float(values))
+        cells = self._particleCells[self._inside]
+        values = values[self._inside]
+        nCells = self._mesh.nCells
+        if values.ndim == 1:
+            return np.bincount(cells,values,minlength=nCells)
+        return np.column_stack([np.bincount(cells,values[:,i],minlength=nCells)
+                                for i in range(values.shape[1])])
+
+    def _parcelWeights(self,nParticles):
+        """Number of particles per parcel, one if not given"""
+        if nParticles is None:
+            return np.ones(len(self._particleCells))
+        return np.asarray(nParticles,dtype=float)
+
+    def _divide(self,numerator,denominator):
+        """Divide cell sums, cells without particles are zero"""
+        empty = denominator == 0
+        denominator = np.where(empty,1.0,denominator)
+        if numerator.ndim > 1:
+            return np.where(empty[:,None],0.0,numerator/denominator[:,None])
+        return np.where(empty,0.0,numerator/denominator)
+
+    def count(self):
+        """Number of parcels in each cell"""
+        return _volField(self._mesh,self._bincount(1.0))
+
+    def sum(self,values,weights=None):
+        """Sum of the (weighted) particle values in each cell"""
+        values = np.asarray(values,dtype=float)
+        if weights is not None:
+            weights = np.asarray(weights,dtype=float)
+            values = values*(weights if values.ndim == 1 else weights[:,None])
+        return _volField(self._mesh,self._bincount(values))
+
+    def mean(self,values,weights=None):
+        """Mean of the particle values in each cell, optionally weighted,
+        e.g., with the number of particles per parcel"""
+        values = np.asarray(values,dtype=float)
+        weights = self._parcelWeights(weights)
+        weighted = values*(weights if values.ndim == 1 else weights[:,None])
+        return _volField(self._mesh,self._divide(self._bincount(weighted),self._bincount(weights)))
+
+    def moment(self,diameters,order,nParticles=None):
+        """Sum of the diameters to the power of order per cell"""
+        weights = self._parcelWeights(nParticles)
+        return _volField(self._mesh,self._bincount(weights*np.asarray(diameters,dtype=float)**order))
+
+    def numberDensity(self,nParticles=None):
+        """Number of particles per cell volume"""
+        return _volField(self._mesh,self._bincount(self._parcelWeights(nParticles))/self._mesh.volumes())
+
+    def volumeFraction(self,diameters,nParticles=None):
+        """Volume of the spherical particles per cell volume"""
+        volume = np.pi/6.0*self.moment(diameters,3,nParticles).internal_data
+        return _volField(self._mesh,volume/self._mesh.volumes())
+
+    def sauterMeanDiameter(self,diameters,nParticles=None):
+        """Sauter mean diameter D32 of each cell"""
+        return _volField(self._mesh,self._divide(self.moment(diameters,3,nParticles).internal_data,
+                                                 self.moment(diameters,2,nParticles).internal_data))
+
+    def volumeWeightedMean(self,values,diameters,nParticles=None):
+        """Mean of the particle values weighted with the particle volume,
+        e.g., the mass averaged velocity of the liquid phase"""
+        weights = self._parcelWeights(nParticles)*np.asarray(diameters,dtype=float)**3
+        return self.mean(values,weights)
+
+    @property
+    def particleCells(self):
+        """Cell of each particle, -1 for particles outside of the mesh"""
+        return self._particleCells
+
+    @property
+    def nParticlesOutside(self):
+        return int(np.count_nonzero(~self._inside))
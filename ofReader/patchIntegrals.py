@@ -0,0 +1,266 @@
+"""
+Integrate fields over boundary patches, similar to OpenFOAM's
+surfaceFieldValue function object, e.g., area averaged wall temperatures,
+mass flow rates through outlets or pressure forces on walls.
+
+    from ofReader import fvMesh
+    from ofReader.patchIntegrals import patchIntegrals, patchIntegralTimeSeries
+
+    mesh = fvMesh('path/to/case')
+    T = readOpenFOAMFile('path/to/case/0.1/T')
+    result = patchIntegrals(mesh,{'T':T},patches=['wall'],operations=['areaAverage'])
+
+    # Evaluate all time steps of the case with a pool of worker processes
+    series = patchIntegralTimeSeries('path/to/case',['T','phi'],
+                                     patches=['inlet','outlet','wall'],
+                                     operations=['areaAverage','sum'])
+
+The results are returned as tidy table, a dictionary of equally long
+arrays with one row per patch, field, operation and vector component,
+which can be directly converted with pandas.DataFrame(result).
+
+Supported operations:
+    sum                 : sum of the face values, e.g., the flux of phi
+    areaIntegrate       : sum of the face values times the face area
+    areaAverage         : area weighted average of the face values
+    areaNormalIntegrate : sum of the face values dotted with the face area
+                          vectors, e.g., the volume flux U & Sf, or for
+                          scalars the vector sum p*Sf, e.g., pressure forces
+    min, max            : minimum and maximum of the face values
+"""
+
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+from ofReader.ofFileReader import readOpenFOAMFile
+from ofReader.fvMesh import fvMesh
+
+_operations = ["sum","areaIntegrate","areaAverage","areaNormalIntegrate","min","max"]
+_components = np.array(["x","y","z"])
+
+
+def _patchGeometry(mesh,patches=None):
+    """Collect the geometry of the selected patches in a picklable
+    dictionary that is shared with the worker processes
+
+    Patches can be selected by name, type or group. By default all patches
+    with faces are used.
+    """
+    if patches is None:
+        selected = [patch for patch in mesh.boundary if patch.nFaces > 0]
+    else:
+        selected = []
+        for name in patches:
+            if name in mesh.boundary:
+                selected.append(mesh.boundary[name])
+            else:
+                group = mesh.boundary.findPatches(name)
+                if not group:
+                    raise ValueError(f"No patch, patch type or group named {name}")
+                selected.extend(group)
+        selected = [patch for patch in selected if patch.nFaces > 0]
+    if not selected:
+        raise ValueError(f"The selected patches {patches} have no faces")
+
+    faces = np.concatenate([np.arange(patch.startFace,patch.startFace+patch.nFaces)
+                            for patch in selected])
+    Sf = mesh.faceAreas()[faces]
+    return {
+        'names'         : [patch.name for patch in selected],
+        'nFaces'        : np.array([patch.nFaces for patch in selected]),
+        'faceCells'     : mesh.owner[faces],
+        'Sf'            : Sf,
+        'magSf'         : np.linalg.norm(Sf,axis=1),
+        'nCells'        : mesh.nCells,
+        'nInternalFaces': mesh.nInternalFaces}
+
+
+def _patchFaceValues(geometry,field):
+    """Face values of all selected patches in one array. Patches without
+    value entry, e.g., zeroGradient, take the value of the adjacent cell"""
+    internal = np.asarray(getattr(field,'internal_data',field),dtype=float)
+    boundary = getattr(field,'boundary',None)
+    # Surface fields, e.g., phi, store values for the internal faces
+    isSurfaceField = getattr(field,'fieldType',None) == "surfaceField"
+
+    nFaces = len(geometry['faceCells'])
+    if isSurfaceField:
+        values = np.zeros((nFaces,)+internal.shape[1:])
+    elif internal.ndim > 0 and len(internal) == geometry['nCells']:
+        values = internal[geometry['faceCells']]
+    else:
+        # Uniform internal field
+        value = internal if internal.ndim == 0 else internal[0]
+        values = np.array(np.broadcast_to(value,(nFaces,)+value.shape))
+
+    offsets = np.concatenate(([0],np.cumsum(geometry['nFaces'])))
+    for i, name in enumerate(geometry['names']):
+        if boundary is not None and name in boundary.patches and boundary.patches[name].hasValue:
+            values[offsets[i]:offsets[i+1]] = boundary.patches[name].data
+        elif isSurfaceField:
+            raise ValueError(f"Surface field has no value for patch {name}")
+    return values
+
+
+def _integrate(geometry,fieldName,field,operations):
+    """Apply all operations to a field on all selected patches"""
+    values = _patchFaceValues(geometry,field)
+    starts = np.concatenate(([0],np.cumsum(geometry['nFaces'])[:-1]))
+    magSf = geometry['magSf']
+    sumMagSf = np.add.reduceat(magSf,starts)
+    weight = magSf if values.ndim == 1 else magSf[:,None]
+
+    results = []
+    for operation in operations:
+        if operation == "sum":
+            result = np.add.reduceat(values,starts)
+        elif operation == "areaIntegrate":
+            result = np.add.reduceat(values*weight,starts)
+        elif operation == "areaAverage":
+            result = np.add.reduceat(values*weight,starts)
+            result = result/(sumMagSf if result.ndim == 1 else sumMagSf[:,None])
+        elif operation == "areaNormalIntegrate":
+            if values.ndim == 1:
+                result = np.add.reduceat(values[:,None]*geometry['Sf'],starts)
+            else:
+                result = np.add.reduceat(np.einsum('ij,ij->i',values,geometry['Sf']),starts)
+        elif operation == "min":
+            result = np.minimum.reduceat(values,starts)
+        elif operation == "max":
+            result = np.maximum.reduceat(values,starts)
+        else:
+            raise ValueError(f"Unknown operation {operation}, valid operations are {_operations}")
+        results.append((operation,result))
+
+    # Convert to table rows
+    patch, fieldNames, operation, component, value = [], [], [], [], []
+    for name, result in results:
+        nPatches = len(geometry['names'])
+        nComponents = 1 if result.ndim == 1 else result.shape[1]
+        patch.append(np.repeat(geometry['names'],nComponents))
+        fieldNames.append(np.full(nPatches*nComponents,fieldName,dtype=object))
+        operation.append(np.full(nPatches*nComponents,name,dtype=object))
+        if nComponents == 1:
+            component.append(np.full(nPatches,"",dtype=object))
+        else:
+            component.append(np.tile(_components[:nComponents],nPatches).astype(object))
+        value.append(result.ravel())
+
+    return {'patch'    : np.concatenate(patch).astype(object),
+            'field'    : np.concatenate(fieldNames),
+            'operation': np.concatenate(operation),
+            'component': np.concatenate(component),
+            'value'    : np.concatenate(value)}
+
+
+def _concatenateTables(tables):
+    return {key: np.concatenate([table[key] for table in tables]) for key in tables[0]}
+
+
+def patchIntegrals(mesh,fields,patches=None,operations=("areaAverage",)):
+    """Integrate several fields over several patches
+
+    Input:
+    ------
+        mesh : fvMesh
+            Mesh of the fields
+        fields : dict
+            Dictionary with the field name as key and the ofVolField as
+            value. Surface fields such as phi are supported as well.
+        patches : list
+            Patch names, types or groups to evaluate, by default all patches
+        operations : list
+            Operations to apply, see the module documentation
+
+    Returns:
+    --------
+        Dictionary of arrays with the keys patch, field, operation,
+        component and value
+    """
+    geometry = _patchGeometry(mesh,patches)
+    return _concatenateTables(
+        [_integrate(geometry,name,field,operations) for name, field in fields.items()])
+
+
+def _timeDirectories(casePath):
+    """Return the names of all time directories of a case sorted by time"""
+    times = []
+    for name in os.listdir(casePath):
+        if not os.path.isdir(os.path.join(casePath,name)):
+            continue
+        try:
+            times.append((float(name),name))
+        except ValueError:
+            continue
+    return [name for _, name in sorted(times)]
+
+
+def _integrateTime(args):
+    """Worker function to read and integrate all fields of one time step"""
+    casePath, time, fieldNames, geometry, operations = args
+    tables = []
+    for fieldName in fieldNames:
+        filePath = os.path.join(casePath,time,fieldName)
+        if not os.path.isfile(filePath):
+            continue
+        table = _integrate(geometry,fieldName,readOpenFOAMFile(filePath),operations)
+        table['time'] = np.full(len(table['value']),float(time))
+        tables.append(table)
+    return tables
+
+
+def patchIntegralTimeSeries(casePath,fieldNames,patches=None,operations=("areaAverage",),**kwargs):
+    """Integrate fields over patches for all time steps of a case
+
+    The time steps are processed by a pool of worker processes, each of
+    them reading the fields of one time step. The patch geometry is
+    calculated only once.
+
+    Input:
+    ------
+        casePath : string
+            Path to the OpenFOAM case
+        fieldNames : list
+            Names of the fields, time steps without the field are skipped
+        patches : list
+            Patch names, types or groups to evaluate, by default all patches
+        operations : list
+            Operations to apply, see the module documentation
+
+    Optional Parameters:
+    --------------------
+        mesh : fvMesh
+            Already loaded mesh of the case
+        times : list
+            Names of the time directories, by default all time directories
+        nWorkers : int
+            Number of worker processes, by default the number of CPUs
+
+    Returns:
+    --------
+        Dictionary of arrays with the keys time, patch, field, operation,
+        component and value sorted by time
+    """
+    if 'mesh' in kwargs:
+        mesh = kwargs['mesh']
+    else:
+        mesh = fvMesh(casePath)
+
+    times = kwargs.get('times',_timeDirectories(casePath))
+    nWorkers = kwargs.get('nWorkers',None)
+
+    geometry = _patchGeometry(mesh,patches)
+    tasks = [(casePath,str(time),list(fieldNames),geometry,list(operations)) for time in times]
+
+    tables = []
+    with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+        for result in tqdm(executor.map(_integrateTime,tasks),total=len(tasks)):
+            tables.extend(result)
+
+    if not tables:
+        raise ValueError(f"None of the fields {fieldNames} found in {casePath}")
+
+    table = _concatenateTables(tables)
+    # Move the time to the first column
+    return {'time': table.pop('time'), **table}
@@ -0,0 +1,221 @@
+import numpy as np
+import re
+
+
+def _removeComments(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
+    return re.sub(r"//.*", "", text)
+
+
+def _findClosingBracket(text,pos,opening,closing):
+    """Return the position of the bracket closing the one at text[pos]"""
+    depth = 0
+    for match in re.finditer(re.escape(opening)+"|"+re.escape(closing),text[pos:]):
+        if match.group() == opening:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos + match.start()
+    raise ValueError(f"No closing {closing!r} found for {opening!r} at position {pos}")
+
+
+def _parseWordList(value):
+    """Parse a list of words such as 1(wall) or List<word> 2(wall walls)"""
+    start = value.find('(')
+    end = value.rfind(')')
+    if start == -1 or end == -1:
+        return value.split()
+    return value[start+1:end].split()
+
+
+def _parseEntries(text):
+    """Parse the key value entries of a dictionary body, sub dictionaries
+    are stored as nested python dictionaries"""
+    entries = {}
+    pos = 0
+    while pos < len(text):
+        match = re.compile(r"\s*([^\s{};]+)\s*").match(text,pos)
+        if not match:
+            break
+        key = match.group(1)
+        pos = match.end()
+        if pos < len(text) and text[pos] == '{':
+            end = _findClosingBracket(text,pos,'{','}')
+            entries[key] = _parseEntries(text[pos+1:end])
+            pos = end+1
+        else:
+            end = text.find(';',pos)
+            if end == -1:
+                end = len(text)
+            entries[key] = text[pos:end].strip()
+            pos = end+1
+    return entries
+
+
+def readPolyBoundaryMesh(filePath,mesh=None):
+    """Read the patches of a constant/polyMesh/boundary file
+
+    The file stores a list of patch dictionaries in the format
+        N
+        (
+            name
+            {
+                type        wall;
+                nFaces      100;
+                startFace   5000;
+            }
+            ...
+        )
+
+    Input:
+    ------
+        filePath : string
+            Path to the boundary file
+        mesh : fvMesh
+            Optional mesh the patches belong to, required for the patch
+            geometry, e.g., faceCenters()
+
+    Returns:
+    --------
+        polyBoundaryMesh with the patches in the order of the file
+    """
+    with open(filePath, encoding='utf-8', errors='ignore') as fp:
+        text = _removeComments(fp.read())
+
+    # Remove the FoamFile header
+    header = re.search(r"FoamFile\s*\{",text)
+    if header:
+        text = text[_findClosingBracket(text,header.end()-1,'{','}')+1:]
+
+    listMatch = re.search(r"(\d+)\s*\(",text)
+    if not listMatch:
+        raise ValueError(f"No patch list found in {filePath}")
+    nPatches = int(listMatch.group(1))
+    listStart = listMatch.end()-1
+    body = text[listStart+1:_findClosingBracket(text,listStart,'(',')')]
+
+    patches = []
+    for name, entries in _parseEntries(body).items():
+        patches.append(polyPatch(name,entries,len(patches),mesh))
+
+    if len(patches) != nPatches:
+        raise ValueError(f"Expected {nPatches} patches in {filePath}, read {len(patches)}")
+
+    return polyBoundaryMesh(patches)
+
+
+class polyPatch:
+    """Patch of the mesh boundary with its range of faces
+
+    The faces of the patch are the mesh faces startFace to
+    startFace+nFaces, thus all patch geometry are slices of the mesh
+    face geometry.
+    """
+
+    def __init__(self,name,entries,index=0,mesh=None):
+        self._name = name
+        self._index = index
+        self._mesh = mesh
+        self._entries = entries
+        self._type = entries.get('type','patch')
+        self._nFaces = int(entries.get('nFaces',0))
+        self._startFace = int(entries.get('startFace',0))
+        self._inGroups = _parseWordList(entries.get('inGroups',''))
+
+    def faceCenters(self):
+        """Face centers of the patch of dimension [nFaces,3]"""
+        return self._mesh.faceCenters()[self.faceSlice]
+
+    def faceAreas(self):
+        """Face area vectors of the patch of dimension [nFaces,3] pointing
+        out of the domain"""
+        return self._mesh.faceAreas()[self.faceSlice]
+
+    def magFaceAreas(self):
+        """Face areas of the patch of dimension [nFaces]"""
+        return np.linalg.norm(self.faceAreas(),axis=1)
+
+    def faceCells(self):
+        """Cells adjacent to the patch faces of dimension [nFaces]"""
+        return self._mesh.owner[self.faceSlice]
+
+    def __repr__(self):
+        return f"polyPatch({self._name}, type={self._type}, startFace={self._startFace}, nFaces={self._nFaces})"
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def type(self):
+        return self._type
+
+    @property
+    def nFaces(self):
+        return self._nFaces
+
+    @property
+    def startFace(self):
+        return self._startFace
+
+    @property
+    def faceSlice(self):
+        """Slice of the patch faces in the mesh face list"""
+        return slice(self._startFace,self._startFace+self._nFaces)
+
+    @property
+    def inGroups(self):
+        return self._inGroups
+
+    @property
+    def neighbourPatch(self):
+        return self._entries.get('neighbourPatch')
+
+    @property
+    def entries(self):
+        """All entries of the patch dictionary as strings"""
+        return self._entries
+
+
+class polyBoundaryMesh:
+    """Collection of the boundary patches of a mesh
+
+    Patches can be accessed by name, e.g., boundary['wall'], and iterating
+    over the object returns the patches in the order of the boundary file.
+    """
+
+    def __init__(self,patches):
+        self._patches = {patch.name : patch for patch in patches}
+        self._startFaces = np.array([patch.startFace for patch in patches],dtype=np.int64)
+
+    def __getitem__(self,name):
+        return self._patches[name]
+
+    def __contains__(self,name):
+        return name in self._patches
+
+    def __iter__(self):
+        return iter(self._patches.values())
+
+    def __len__(self):
+        return len(self._patches)
+
+    def names(self):
+        return list(self._patches.keys())
+
+    def whichPatch(self,faces):
+        """Return the patch index for each of the given boundary faces"""
+        return np.searchsorted(self._startFaces,faces,side='right')-1
+
+    def findPatches(self,group):
+        """Return all patches of the given type or in the given group"""
+        return [patch for patch in self if patch.type == group or group in patch.inGroups]
+
+    @property
+    def patches(self):
+        return self._patches
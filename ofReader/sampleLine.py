@@ -0,0 +1,154 @@
+import numpy as np
+
+
+class sampleLine:
+    """Sample cell values along a line through the mesh, similar to
+    OpenFOAM's sets function object, without writing sample files.
+
+    The sample points and their cells are found once when the object is
+    created. Sampling further fields or time steps is only an indexing of
+    the cell values.
+
+    Two types of sample points are supported:
+        uniform  : nPoints equally distributed points between start and end
+        midPoint : the mid points between all crossings of the line with
+                   the mesh faces, i.e., one point per traversed cell
+
+    Points outside of the mesh are removed.
+
+    Usage:
+    ------
+        mesh = fvMesh('path/to/case')
+        line = sampleLine(mesh,start=(0,0,0),end=(0,0,0.1),nPoints=200)
+        alpha = readOpenFOAMFile('path/to/case/0.1/alpha.liquid')
+        U = readOpenFOAMFile('path/to/case/0.1/U')
+        data = line.sample({'alpha.liquid':alpha,'U':U})
+        # data['x'] => position along the line
+        # data['alpha.liquid'] => sampled values
+    """
+
+    def __init__(self,mesh,start,end,nPoints=100,**kwargs):
+        """Find the sample points and their cells
+
+        Input:
+        ------
+            mesh : fvMesh
+            start : start point of the line
+            end : end point of the line
+            nPoints : number of sample points for the uniform type
+
+        Optional Parameters:
+        --------------------
+            type : string
+                Either 'uniform' (default) or 'midPoint'
+            axis : string
+                Coordinate stored in 'x' of the sampled data, either
+                'distance' (default) for the distance from the start point
+                or 'x', 'y', 'z' for a coordinate of the sample points
+        """
+        self._mesh = mesh
+        self._start = np.asarray(start,dtype=float)
+        self._end = np.asarray(end,dtype=float)
+        self._type = kwargs.get('type','uniform')
+        self._axis = kwargs.get('axis','distance')
+
+        if self._type == 'uniform':
+            t = np.linspace(0.0,1.0,nPoints)
+        elif self._type == 'midPoint':
+            t = self._faceCrossings()
+            t = 0.5*(t[1:]+t[:-1])
+        else:
+            raise ValueError(f"Unknown sample type {self._type}, use uniform or midPoint")
+
+        points = self._start + t[:,None]*(self._end-self._start)
+        cells = mesh.findCells(points)
+        inside = cells >= 0
+
+        self._points = points[inside]
+        self._cells = cells[inside]
+        self._distance = t[inside]*np.linalg.norm(self._end-self._start)
+
+    def _faceCrossings(self):
+        """Return the sorted line parameters t of the start and end point and
+        all crossings of the line with the mesh faces"""
+        mesh = self._mesh
+        Cf = mesh.faceCenters()
+        Sf = mesh.faceAreas()
+        direction = self._end-self._start
+
+        # Intersection with the face planes
+        denominator = Sf @ direction
+        parallel = np.abs(denominator) < 1E-300
+        t = np.einsum('ij,ij->i',Cf-self._start,Sf)/np.where(parallel,1.0,denominator)
+        candidates = np.nonzero(~parallel & (t >= 0.0) & (t <= 1.0))[0]
+        hit = self._start + t[candidates,None]*direction
+
+        # Remove faces further away than their largest point distance
+        offsets, labels = mesh.compactFaces()
+        nFacePoints = np.diff(offsets)
+        faceIndex = np.repeat(np.arange(mesh.nFaces),nFacePoints)
+        radius = np.maximum.reduceat(
+            np.linalg.norm(mesh.points[labels]-Cf[faceIndex],axis=1),offsets[:-1])
+        close = np.linalg.norm(hit-Cf[candidates],axis=1) <= radius[candidates]
+        candidates = candidates[close]
+        hit = hit[close]
+
+        # The hit point is inside of the face if it is on the inner side of
+        # all face edges
+        n = nFacePoints[candidates]
+        edgeOffsets = np.zeros(len(candidates)+1,dtype=np.int64)
+        np.cumsum(n,out=edgeOffsets[1:])
+        edgeFace = np.repeat(np.arange(len(candidates)),n)
+        local = np.arange(edgeOffsets[-1]) - edgeOffsets[edgeFace]
+        first = offsets[candidates][edgeFace]
+        p0 = mesh.points[labels[first+local]]
+        p1 = mesh.points[labels[first+(local+1) % n[edgeFace]]]
+        side = np.einsum('ij,ij->i',np.cross(p0-hit[edgeFace],p1-hit[edgeFace]),Sf[candidates][edgeFace])
+        tolerance = 1E-12*np.max(np.abs(side),initial=0.0)
+        inside = np.minimum.reduceat(side,edgeOffsets[:-1]) >= -tolerance
+
+        crossings = t[candidates[inside]]
+        # Crossings through an edge or point are found for several faces
+        crossings = np.unique(np.round(np.concatenate(([0.0,1.0],crossings)),12))
+        return crossings
+
+    def sample(self,fields):
+        """Sample the cell values of the fields
+
+        Input:
+        ------
+            fields : dict
+                Dictionary with the field name as key and the ofVolField or
+                numpy array of the cell values as value
+
+        Returns:
+        --------
+            Dictionary with the position along the line as 'x' and the
+            sampled values of each field, as returned by sampleLineReader
+        """
+        data = {}
+        if self._axis == 'distance':
+            data['x'] = self._distance
+        elif self._axis in ('x','y','z'):
+            data['x'] = self._points[:,'xyz'.index(self._axis)]
+        else:
+            raise ValueError(f"Unknown axis {self._axis}, use distance, x, y or z")
+
+        for name, field in fields.items():
+            data[name] = self._mesh.cellValues(field)[self._cells]
+        return data
+
+    @property
+    def points(self):
+        """Sample points of dimension [n,3]"""
+        return self._points
+
+    @property
+    def cells(self):
+        """Cell of each sample point"""
+        return self._cells
+
+    @property
+    def distance(self):
+        """Distance of each sample point from the start point"""
+        return self._distance
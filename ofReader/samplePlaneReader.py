@@ -1,10 +1,278 @@
 import numpy as np
 from scipy.interpolate import LinearNDInterpolator
-import math
-import copy
+from scipy.spatial import Delaunay
+import re
+import hashlib
+import weakref
+import glob
+from concurrent.futures import ProcessPoolExecutor
 from ofReader.triangleInterp import TriangleInterp
 
 
+# Translation table to remove the brackets of inline lists
+_removeBrackets = bytes.maketrans(b"()",b"  ")
+
+# Geometries of the planes in use, readers of planes with the same face
+# centers, faces and points share the geometry and its triangulations
+_geometryCache = weakref.WeakValueDictionary()
+
+
+def _findLists(data,nLists=None):
+    """Return the byte ranges of the bodies of the first nLists lists, or of
+    all lists, in the file. A list
+    starts with a line containing only the opening bracket and ends with a
+    line starting with the closing bracket. Entries are single values or
+    inline lists, e.g., (x y) or 4(0 1 2 3)."""
+    lists = []
+    # Searching for the line breaks first is much faster than matching each
+    # line start
+    opening = re.compile(rb"\n[ \t]*\([ \t]*\r?(?=\n)")
+    closing = re.compile(rb"\n[ \t]*\)")
+    data = b"\n" + data
+    pos = 0
+    while nLists is None or len(lists) < nLists:
+        start = opening.search(data,pos)
+        if not start:
+            return lists
+        end = closing.search(data,start.end())
+        if not end:
+            raise ValueError("List without closing bracket")
+        lists.append((start.end()-1,end.start()-1))
+        pos = end.end()
+    return lists
+
+
+def _parseValueList(block):
+    """Parse a list of scalars or inline vectors (x y z) at once
+
+    Returns:
+    --------
+        Array of dimension [n] for scalars or [n,nComponents]
+    """
+    firstLine = block.lstrip().split(b"\n",1)[0]
+    nComponents = len(firstLine.translate(_removeBrackets).split())
+    values = np.fromstring(block.translate(_removeBrackets).decode(),sep=" ")
+    if nComponents > 1 or firstLine.startswith(b"("):
+        return values.reshape(-1,nComponents)
+    return values
+
+
+def _parseFaceList(block):
+    """Parse a list of faces in the format n(p0 p1 ...) or (p0 p1 ...) at
+    once
+
+    Returns:
+    --------
+        Tuple of the offsets and the point labels of the faces, the points
+        of face i are labels[offsets[i]:offsets[i+1]]
+    """
+    # The closing brackets become the label -1 which marks the end of each
+    # face, labels are never negative
+    tokens = np.fromstring(block.replace(b")",b" -1 ").translate(_removeBrackets).decode(),sep=" ")
+    tokens = tokens.astype(np.int64)
+    ends = np.nonzero(tokens < 0)[0]
+    starts = np.zeros(len(ends),dtype=np.int64)
+    starts[1:] = ends[:-1]+1
+    keep = tokens >= 0
+    if not block.lstrip().startswith(b"("):
+        # Remove the size in front of each face
+        keep[starts] = False
+        starts += 1
+    offsets = np.zeros(len(ends)+1,dtype=np.int64)
+    np.cumsum(ends-starts,out=offsets[1:])
+    return offsets, tokens[keep]
+
+
+def _compactFaces(faces):
+    """Offsets and point labels of a list of faces or of the tuple
+    (offsets,labels)"""
+    if isinstance(faces,tuple):
+        offsets, labels = faces
+        return np.array(offsets,dtype=np.int64), np.array(labels,dtype=np.int64)
+    sizes = np.fromiter((len(face) for face in faces),dtype=np.int64,count=len(faces))
+    offsets = np.zeros(len(faces)+1,dtype=np.int64)
+    np.cumsum(sizes,out=offsets[1:])
+    labels = np.concatenate(faces).astype(np.int64) if len(faces) else np.zeros(0,dtype=np.int64)
+    return offsets, labels
+
+
+def _readPlaneFile(fname,nLists=4):
+    """Return the bodies of the first nLists lists of a plane file"""
+    with open(fname,'rb') as f:
+        data = f.read()
+    lists = _findLists(data,nLists)
+    if len(lists) < nLists:
+        raise ValueError(f"Expected {nLists} lists in {fname}, found {len(lists)}")
+    return [data[start:end] for start, end in lists]
+
+
+def _readPlaneValues(fname):
+    """Parse only the values, the first list, of a plane file"""
+    return _parseValueList(_readPlaneFile(fname,1)[0])
+
+
+def _triangulateFaces(faceOffsets,faceLabels,points):
+    """Triangulation of polygons given as compact face list, a face with n
+    points is split into n-2 triangles. Convex faces are fan-triangulated
+    into the triangles (p0,pj,pj+1), non-convex faces are split by ear
+    clipping. The triangles keep the orientation of their face.
+
+    Returns:
+    --------
+        Tuple of the point labels of the triangles [nTri,3] and the face of
+        each triangle [nTri]
+    """
+    nTri = np.maximum(np.diff(faceOffsets)-2,0)
+    triFaces = np.repeat(np.arange(len(nTri)),nTri)
+    triStart = np.zeros(len(nTri),dtype=np.int64)
+    np.cumsum(nTri[:-1],out=triStart[1:])
+    first = faceOffsets[:-1][triFaces]
+    j = np.arange(len(triFaces)) - triStart[triFaces] + 1
+    tri = np.column_stack((faceLabels[first],faceLabels[first+j],faceLabels[first+j+1]))
+    # Ear clipping of the non-convex faces gives the same number of
+    # triangles, they replace the fan of the face
+    for face in _nonConvexFaces(faceOffsets,faceLabels,points):
+        start = triStart[face]
+        tri[start:start+nTri[face]] = \
+            _earClipping(faceLabels[faceOffsets[face]:faceOffsets[face+1]],points)
+    return tri.astype(np.int32), triFaces
+
+
+def _cross(u,v):
+    """z component of the cross product of 2D vectors"""
+    return u[...,0]*v[...,1] - u[...,1]*v[...,0]
+
+
+def _nonConvexFaces(faceOffsets,faceLabels,points):
+    """Faces with a reflex point, i.e., a turn against the orientation of
+    the face"""
+    nPoints = np.diff(faceOffsets)
+    pointFaces = np.repeat(np.arange(len(nPoints)),nPoints)
+    k = np.arange(len(faceLabels))
+    start = faceOffsets[:-1][pointFaces]
+    nextK = start + (k-start+1) % nPoints[pointFaces]
+    prevK = start + (k-start-1) % nPoints[pointFaces]
+    p = points[faceLabels,:2]
+    pNext = points[faceLabels[nextK],:2]
+    pPrev = points[faceLabels[prevK],:2]
+    # Twice the signed area of each face
+    area = np.bincount(pointFaces,p[:,0]*pNext[:,1]-pNext[:,0]*p[:,1],minlength=len(nPoints))
+    turn = _cross(p-pPrev,pNext-p)
+    reflex = turn*np.sign(area)[pointFaces] < 0
+    return np.unique(pointFaces[reflex])
+
+
+def _earClipping(labels,points):
+    """Ear clipping of a single simple polygon, returns the point labels of
+    the n-2 triangles"""
+    labels = list(labels)
+    p = points[labels,:2]
+    orientation = np.sign(np.sum(p[:,0]*np.roll(p[:,1],-1)-np.roll(p[:,0],-1)*p[:,1]))
+    remaining = list(range(len(labels)))
+    triangles = []
+    while len(remaining) > 3:
+        n = len(remaining)
+        for i in range(n):
+            a, b, c = remaining[i-1], remaining[i], remaining[(i+1) % n]
+            if _cross(p[b]-p[a],p[c]-p[b])*orientation <= 0:
+                continue
+            # No other point of the polygon may lie in the ear
+            others = [k for k in remaining if k not in (a,b,c)]
+            d = p[others]
+            inside = (_cross(p[b]-p[a],d-p[a])*orientation >= 0) \
+                & (_cross(p[c]-p[b],d-p[b])*orientation >= 0) \
+                & (_cross(p[a]-p[c],d-p[c])*orientation >= 0)
+            if not inside.any():
+                break
+        else:
+            # Degenerate polygon without ear, clip at the first point
+            i = 0
+            a, b, c = remaining[-1], remaining[0], remaining[1]
+        triangles.append((labels[a],labels[b],labels[c]))
+        del remaining[i]
+    triangles.append(tuple(labels[k] for k in remaining))
+    return np.array(triangles)
+
+
+class _planeGeometry:
+    """Face centers, faces and points of a plane
+
+    The geometry is immutable and shared by all readers with the same face
+    centers, faces and points without copying it. The Delaunay
+    triangulation of the face centers for the linear
+    interpolation, the triangulation of the faces and the triangle finder
+    are built on first use and are shared by all readers of the geometry.
+    """
+
+    def __init__(self,pos,faceOffsets,faceLabels,points):
+        # The arrays are shared by the readers and must not be changed
+        self._pos = self._readOnly(pos)
+        self._faceOffsets = self._readOnly(faceOffsets)
+        self._faceLabels = self._readOnly(faceLabels)
+        self._points = self._readOnly(points)
+        self._delaunay = None
+        self._tri = None        # Point labels of the triangles [nTri,3]
+        self._triFaces = None   # Face of each triangle [nTri]
+        self._triInterp = None
+
+    @staticmethod
+    def _readOnly(array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def _triangulate(self):
+        self._tri, self._triFaces = _triangulateFaces(self._faceOffsets,self._faceLabels,self._points)
+        self._tri.flags.writeable = False
+        self._triFaces.flags.writeable = False
+
+    @property
+    def delaunay(self):
+        """Delaunay triangulation of the face centers"""
+        if self._delaunay is None:
+            self._delaunay = Delaunay(self._pos)
+        return self._delaunay
+
+    @property
+    def triangles(self):
+        if self._tri is None:
+            self._triangulate()
+        return self._tri
+
+    @property
+    def triFaces(self):
+        if self._triFaces is None:
+            self._triangulate()
+        return self._triFaces
+
+    @property
+    def triInterp(self):
+        if self._triInterp is None:
+            self._triInterp = TriangleInterp(self._points,self.triangles)
+        return self._triInterp
+
+
+def _geometryKey(arrays):
+    """Hash of the content of the arrays"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(memoryview(array).cast('B'))
+    return digest.hexdigest()
+
+
+def _sharedGeometry(pos,faceOffsets,faceLabels,points):
+    """Return the geometry of a reader with the same face centers, faces
+    and points if one is still in use, otherwise a new geometry"""
+    key = _geometryKey((pos,faceOffsets,faceLabels,points))
+    geometry = _geometryCache.get(key)
+    if geometry is None:
+        geometry = _planeGeometry(pos,faceOffsets,faceLabels,points)
+        _geometryCache[key] = geometry
+    return geometry
+
+
 class samplePlaneReader:
     """
     Load and processes files written by the circAverage tool:
@@ -17,132 +285,87 @@ class samplePlaneReader:
     To plot data along a line defined by two points 
     p1 = [ax,rad] and p2 = [ax2,rad2] with each an axial and radial
     component use the plotAlongLine(p1,p2) function
+
+    The interpolators are created on first use. Readers of planes with the
+    same geometry, e.g., the time steps of one plane, share them, so that
+    each further reader only stores its values.
     """
 
     # =======================================================================
     # Protected Functions
-    def _readInlineList(self,line,dtype=float):
-        # First split of the 
-        splitLine = line.split("(")
-        splitLine = splitLine[1].split(")")
-        splitLine = splitLine[0].split()
-        val = []
-        for e in splitLine:
-            val.append(dtype(e))
-        return val
-
-    def _readList(self,f,dtype=float):
-        val = []
-        while (True):
-            line = f.readline()            
-            line = line.strip()
-
-            # If it starts with a bracket it is a list
-            if line.startswith("(") and line.endswith(")"):
-                val.append(self._readInlineList(line))
-            elif len(line) > 2 and line[0].isdigit() and line[1] == "(":
-                val.append(self._readInlineList(line))
-            elif line.startswith("("):
-                continue
-            elif line.endswith(")"):
-                break
-            else:
-                val.append(dtype(line))
-        return val
-    
-    
-    # Calculate the magnitude of a vector
-    def _magnitude(self,vector):
-        return math.sqrt(sum(pow(element, 2) for element in vector))
-    
 
-    def _triangulate(self):
-        
-        if not self._tri:
-            # Loop over all faces
-            i=0
-            for face in self._faces:
-                if len(face) == 3:
-                    self._tri.append(np.array(face,dtype=np.int32))
-                    self._triValue.append(self._values[i])
-                if len(face) == 4:
-                    face1 = [face[0],face[1],face[2]]
-                    face2 = [face[2],face[3],face[0]]
-                    self._tri.append(np.array(face1,dtype=np.int32))
-                    self._triValue.append(self._values[i])
-                    self._tri.append(np.array(face2,dtype=np.int32))
-                    self._triValue.append(self._values[i])
-                i = i +1
-        
-        return self._tri, self._triValue
+    def _interpolator(self):
+        """Linear interpolator of the face center values"""
+        if self._interp is None:
+            self._interp = LinearNDInterpolator(self._geometry.delaunay,self._values)
+        return self._interp
+
+    def _operand(self,other):
+        """Values of the other operand of an elementwise operation"""
+        if isinstance(other,samplePlaneReader):
+            if other._geometry is not self._geometry:
+                raise ValueError("Operations require planes with the same geometry")
+            return other._values
+        return other
+
+    def _setValues(self,values):
+        """Set new values, the interpolator of the old values is removed"""
+        self._values = values
+        self._interp = None
+        return self
+
+    def _inplace(self,ufunc,other):
+        """Apply the ufunc in place, or store a new array if the result
+        type differs from the values, e.g., integer values divided"""
+        other = self._operand(other)
+        try:
+            return self._setValues(ufunc(self._values,other,out=self._values))
+        except TypeError:
+            # The result cannot be cast to the type of the values
+            return self._setValues(ufunc(self._values,other))
+
+    def _copyWithValues(self,values):
+        """New reader with the geometry of this reader and the given values"""
+        copyReader = samplePlaneReader()
+        copyReader._fname = self._fname
+        copyReader._geometry = self._geometry
+        copyReader._values = values
+        return copyReader
 
 
     # =======================================================================
 
     def __init__(self):
         self._fname = "None"
-        self._pos = np.zeros(1)
         self._values = np.zeros(1)
-        self._faces = []
-        self._triPoints = np.zeros(1)
-        
-        self._tri = []      # List of triangles, each tri is a list of indices in the X,Y array
-        self._triValue = [] # List to store the value in each tri
+        self._geometry = _planeGeometry(np.zeros(1),np.zeros(1,dtype=np.int64),
+                                        np.zeros(0,dtype=np.int64),np.zeros(1))
+        self._interp = None
     
     def readFromFile(self,fname):
+        """Read the plane from a file with the four lists of the values, the
+        face centers, the faces and the points. Each list is parsed at
+        once from the file content."""
         self._fname = fname
+        values, pos, faces, points = _readPlaneFile(fname)
+        self.setData(_parseValueList(values),_parseValueList(pos),
+                     _parseFaceList(faces),_parseValueList(points))
 
-        # readData contains list of values, cell coordinates, faces, and points
-        # readData[0] : values
-        # readData[1] : coordinates
-        # readData[2] : faces
-        # readData[3] : points
-        readData = []
-        with open(fname) as f:
-            while (True):
-                # store position of file ptr before readline
-                file_pos = f.tell()
-                line = f.readline()
-                
-                # Check for end of file
-                if not line:
-                    break
-                
-                line = line.strip()
-                # search for the first bracket
-                if line.startswith("("):
-                    f.seek(file_pos)
-                    val = self._readList(f)
-                    readData.append(val)
+    def setData(self,values,pos,faces,points):
+        """Set the plane data directly instead of reading it from a file
 
+        Input:
+        ------
+            values : array of the face values
+            pos : array of dimension [nFaces,2] with the face centers
+            faces : list of the point indices of each face or the compact
+                    face list as tuple (offsets,labels)
+            points : array of dimension [nPoints,2] with the points
+        """
         # Set the cell values  
-        self._values = np.array(readData[0])
-        
-        # readData[1] currently is a list of list and needs to be converted to an array
-        self._pos = np.empty((len(readData[1]),len(readData[1][0])))
-        
-        rowI = 0
-        for row in readData[1]:
-            colI = 0
-            for e in row:
-                self._pos[rowI,colI] = e
-                colI = colI + 1
-            rowI = rowI + 1
-        
-        # Generate the interpolator
-        self._interp = LinearNDInterpolator(self._pos,self._values)
-
-        # Load the points and faces
-        self._faces = readData[2]
-
-        # points
-        self._triPoints = np.array(readData[3])
-
-        self._tri, self._triValue = self._triangulate()
-
-        # Create the triangulation maplotlib object for finding the closest
-        # triangle
-        self._triInterp = TriangleInterp(self._triPoints,self._tri)
+        self._values = np.array(values)
+        self._geometry = _sharedGeometry(np.array(pos),*_compactFaces(faces),np.array(points))
+        self._interp = None
 
     def __str__(self):
         return f"Eulerian data from file: ", self._fname
@@ -150,26 +373,66 @@ class samplePlaneReader:
     
     # return an x, y data set to plot the data along a line
     # Line is defined with two points
-    def plotAlongLine(self,point1,point2,nPoints=100):
-        # Make point into a numpy array
-        point1 = np.array(point1)
-        point2 = np.array(point2)
-        
-        
-        # create points to interpolate to
+    def plotAlongLine(self,point1,point2,nPoints=100,**kwargs):
+        """Values along the line from point1 to point2, see sampleLines for
+        the optional parameters
+
+        Returns:
+        --------
+            Tuple of the distance to point1 and the values at nPoints points
+        """
+        x, v = self.sampleLines([point1],[point2],nPoints,**kwargs)
+        return x[0], v[0]
+
+    def sampleLines(self,starts,ends,nPoints=100,**kwargs):
+        """Sample the values along many lines at once, e.g., radial profiles
+        at all axial positions. The points of all lines are evaluated with
+        a single call of the interpolator.
+
+        Input:
+        ------
+            starts : array of dimension [nLines,2] with the start points
+            ends : array of dimension [nLines,2] with the end points
+            nPoints : number of equidistant points on each line
+
+        Optional Parameters:
+        --------------------
+            interpolation : string
+                'linear' interpolates the face center values linearly,
+                'face' returns the value of the face containing the point.
+                By default 'linear'.
+
+        Usage:
+        ------
+            axial = np.linspace(0,0.1,50)
+            starts = np.column_stack((axial,np.zeros(50)))
+            ends = np.column_stack((axial,np.full(50,0.02)))
+            r, U = reader.sampleLines(starts,ends,nPoints=200)
+
+        Returns:
+        --------
+            Tuple of the distance to the start point [nLines,nPoints] and
+            the values [nLines,nPoints] or [nLines,nPoints,nComponents].
+            Points outside of the plane get NaN.
+        """
+        starts = np.asarray(starts,dtype=float).reshape(-1,2)
+        ends = np.asarray(ends,dtype=float).reshape(-1,2)
         t = np.linspace(0.0,1.0,nPoints)
-        q = np.empty((len(t),2))
-        x = np.linspace(0.0,1.0,nPoints)
-        for i in range(len(t)):
-            q[i,:] = point1 + t[i]*(point2-point1)
-            x[i] = self._magnitude(t[i]*(point2-point1))
-        
-        # Find the closest point
-        v = np.zeros(nPoints)
-        for i in range(len(v)):
-            v[i] = self._interp(q[i])
+        delta = ends-starts
+        q = starts[:,None,:] + t[None,:,None]*delta[:,None,:]
+        x = t[None,:]*np.linalg.norm(delta,axis=1)[:,None]
 
-        return x,v
+        interpolation = kwargs.get('interpolation','linear')
+        q = q.reshape(-1,2)
+        if interpolation == 'linear':
+            v = self._interpolator()(q)
+        elif interpolation == 'face':
+            triangles = self.triFinder(q[:,0],q[:,1])
+            v = self.triValues[triangles].astype(float)
+            v[triangles < 0] = np.nan
+        else:
+            raise ValueError(f"Unknown interpolation {interpolation}, use 'linear' or 'face'")
+        return x, v.reshape(x.shape+self._values.shape[1:])
     
 
     def plot(self,ax,**kwargs):
@@ -193,57 +456,63 @@ class samplePlaneReader:
             kwargs.pop('scaleCoordinates')
         
         return ax.tripcolor(
-            self._triPoints[:,0]*scaleCoordinates,
-            self._triPoints[:,1]*scaleCoordinates,
-            self._triValue,
-            triangles=self._tri,
+            self.points[:,0]*scaleCoordinates,
+            self.points[:,1]*scaleCoordinates,
+            self.triValues,
+            triangles=self.triangles,
             **kwargs) 
 
 
-    def __mul__(self,other):
-        """Multiply with another circAverageReader of the same type or a 
-           scalar
-        """
-        # Create a copy of the current reader
-        copyReader = samplePlaneReader()
-        copyReader._faces = copy.deepcopy(self._faces)
-        copyReader._triPoints = copy.deepcopy(self._triPoints)
-        copyReader._pos = copy.deepcopy(self._pos)
+    # Elementwise operators with another plane of the same geometry, an
+    # array of the face values or a scalar. The results share the geometry.
+    def __add__(self,other):
+        return self._copyWithValues(self._values+self._operand(other))
 
-        if isinstance(other,(int,float)):
-            copyReader._values = other*self._values
-        else:
-            copyReader._values = self._values*other._values
-        
-        return copyReader
+    def __radd__(self,other):
+        return self._copyWithValues(self._operand(other)+self._values)
 
-    def __rmul__(self,other):
-        # Create a copy of the current reader
-        copyReader = samplePlaneReader()
-        copyReader._faces = copy.deepcopy(self._faces)
-        copyReader._triPoints = copy.deepcopy(self._triPoints)
-        copyReader._pos = copy.deepcopy(self._pos)
+    def __sub__(self,other):
+        return self._copyWithValues(self._values-self._operand(other))
 
-        if isinstance(other,(int,float)):
-            copyReader._values = other*self._values
-        else:
-            copyReader._values = self._values*other._values
-        
-        return copyReader
+    def __rsub__(self,other):
+        return self._copyWithValues(self._operand(other)-self._values)
+
+    def __mul__(self,other):
+        return self._copyWithValues(self._values*self._operand(other))
+
+    def __rmul__(self,other):
+        return self._copyWithValues(self._operand(other)*self._values)
 
     def __truediv__(self,other):
-        # Create a copy of the current reader
-        copyReader = samplePlaneReader()
-        copyReader._faces = copy.deepcopy(self._faces)
-        copyReader._triPoints = copy.deepcopy(self._triPoints)
-        copyReader._pos = copy.deepcopy(self._pos)
+        return self._copyWithValues(self._values/self._operand(other))
 
-        if isinstance(other,(int,float)):
-            copyReader._values = self._values/other
-        else:
-            copyReader._values = self._values/other._values
-        
-        return copyReader
+    def __rtruediv__(self,other):
+        return self._copyWithValues(self._operand(other)/self._values)
+
+    def __pow__(self,other):
+        return self._copyWithValues(self._values**self._operand(other))
+
+    def __neg__(self):
+        return self._copyWithValues(-self._values)
+
+    def __abs__(self):
+        return self._copyWithValues(np.abs(self._values))
+
+    # In-place operators only change the values of this reader
+    def __iadd__(self,other):
+        return self._inplace(np.add,other)
+
+    def __isub__(self,other):
+        return self._inplace(np.subtract,other)
+
+    def __imul__(self,other):
+        return self._inplace(np.multiply,other)
+
+    def __itruediv__(self,other):
+        return self._inplace(np.true_divide,other)
+
+    def __ipow__(self,other):
+        return self._inplace(np.power,other)
 
 
     @property
@@ -252,12 +521,139 @@ class samplePlaneReader:
     
     @property
     def pos(self):
-        return self._pos
+        return self._geometry._pos
     
     @property
     def points(self):
-        return self._triPoints
+        return self._geometry._points
     
     @property
     def faces(self):
-        return self._faces
+        """Point labels of each face"""
+        return np.split(self._geometry._faceLabels,self._geometry._faceOffsets[1:-1])
+
+    def compactFaces(self):
+        """Faces as offsets and point labels"""
+        return self._geometry._faceOffsets, self._geometry._faceLabels
+
+    @property
+    def triangles(self):
+        """Point labels of the triangles of the faces [nTri,3]"""
+        return self._geometry.triangles
+
+    @property
+    def triFaces(self):
+        """Face of each triangle [nTri]"""
+        return self._geometry.triFaces
+
+    @property
+    def triValues(self):
+        """Value of each triangle"""
+        return self._values[self._geometry.triFaces]
+
+    @property
+    def triFinder(self):
+        """matplotlib TriFinder of the triangles"""
+        return self._geometry.triInterp.get_trifinder()
+
+
+def planeMeanVariance(planes,ddof=0):
+    """Mean and variance of the values of planes with the same geometry
+
+    The planes are processed one after the other with Welford's algorithm,
+    so only the running mean and the sum of the squared deviations are
+    stored. File names are accepted as well, of which only the first file
+    is read completely and of all further files only the values.
+
+    Input:
+    ------
+        planes : iterable of samplePlaneReader objects or plane files
+        ddof : int
+            Delta degrees of freedom, the variance is divided by n-ddof,
+            which must be positive
+
+    Usage:
+    ------
+        mean, variance = planeMeanVariance(glob.glob('circAverage/*/T'))
+        mean.plot(ax)
+
+    Returns:
+    --------
+        Tuple of samplePlaneReader objects with the mean and the variance
+    """
+    reference = None
+    n = 0
+    for plane in planes:
+        if reference is None:
+            if isinstance(plane,samplePlaneReader):
+                reference = plane
+            else:
+                reference = samplePlaneReader()
+                reference.readFromFile(plane)
+            mean = np.array(reference.values,dtype=float)
+            M2 = np.zeros_like(mean)
+            n = 1
+            continue
+
+        if isinstance(plane,samplePlaneReader):
+            values = reference._operand(plane)
+        else:
+            values = _readPlaneValues(plane)
+        if np.shape(values) != mean.shape:
+            raise ValueError(f"Plane with {len(values)} values instead of {len(mean)}")
+        n += 1
+        delta = values-mean
+        mean += delta/n
+        M2 += delta*(values-mean)
+
+    if reference is None:
+        raise ValueError("No planes given")
+    if n <= ddof:
+        raise ValueError(f"The variance of {n} planes requires ddof < {n}, got ddof={ddof}")
+    return reference._copyWithValues(mean), reference._copyWithValues(M2/(n-ddof))
+
+
+def readPlaneSeries(files,**kwargs):
+    """Read the values of many plane files with the same geometry, e.g.,
+    the time steps of a circAverage plane
+
+    Only the first file is read completely. Of all further files only the
+    value list is parsed, by a pool of worker processes.
+
+    Input:
+    ------
+        files : glob pattern or list of plane files, a pattern is expanded
+                to the sorted list of matching files
+
+    Optional Parameters:
+    --------------------
+        nWorkers : int
+            Number of worker processes, by default the number of CPUs
+
+    Usage:
+    ------
+        plane, T = readPlaneSeries('postProcessing/circAverage/*/T')
+        TMean = T.mean(axis=0)
+        TRms = T.std(axis=0)
+
+    Returns:
+    --------
+        Tuple of the samplePlaneReader of the first file, which holds the
+        shared geometry, and the values of all files of dimension
+        [nFiles,nFaces] or [nFiles,nFaces,nComponents]
+    """
+    files = sorted(glob.glob(files)) if isinstance(files,str) else list(files)
+    if not files:
+        raise FileNotFoundError("No plane files given")
+
+    plane = samplePlaneReader()
+    plane.readFromFile(files[0])
+    values = np.empty((len(files),)+plane.values.shape)
+    values[0] = plane.values
+    if len(files) > 1:
+        with ProcessPoolExecutor(max_workers=kwargs.get('nWorkers',None)) as executor:
+            for i, fileValues in enumerate(executor.map(_readPlaneValues,files[1:]),start=1):
+                if fileValues.shape != plane.values.shape:
+                    raise ValueError(f"{files[i]} has {len(fileValues)} values instead of {len(plane.values)}")
+                values[i] = fileValues
+    return plane, values
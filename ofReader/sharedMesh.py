@@ -0,0 +1,210 @@
+"""
+Share the arrays of a mesh with worker processes without copying them,
+e.g., to evaluate many time steps in parallel:
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from ofReader import fvMesh, readOpenFOAMFile
+    from ofReader.sharedMesh import sharedMesh, attachSharedMesh
+
+    def meanTemperature(descriptor,time):
+        mesh = attachSharedMesh(descriptor)
+        T = readOpenFOAMFile('path/to/case/'+time+'/T')
+        return (mesh.cellValues(T)*mesh.volumes()).sum()/mesh.volumes().sum()
+
+    mesh = fvMesh('path/to/case')
+    with sharedMesh(mesh) as shared, ProcessPoolExecutor() as executor:
+        T = list(executor.map(partial(meanTemperature,shared.descriptor),times))
+
+The points, the compact face list, owner and neighbour and optionally the
+face and cell geometry are copied once into multiprocessing.shared_memory
+blocks. Only the small descriptor with the block names is pickled for each
+task. The workers create read-only numpy views of the blocks and keep them
+attached for all following tasks with the same descriptor.
+
+The blocks are owned by the sharedMesh object of the parent process and
+are released by close(), at the end of a with statement or, at the latest,
+when the object is garbage collected or the interpreter exits.
+"""
+
+import numpy as np
+import sys
+import uuid
+import weakref
+from multiprocessing import shared_memory, resource_tracker
+from ofReader.fvMesh import fvMesh
+from ofReader.polyBoundaryMesh import polyPatch, polyBoundaryMesh
+
+# Geometry of the mesh stored in the shared blocks and the cache of fvMesh
+# it is assigned to in the worker processes
+_geometryCaches = {
+    'faceCenters' : '_faceCenters',
+    'faceAreas'   : '_faceAreas',
+    'centers'     : '_centers',
+    'volumes'     : '_volumes',
+    'weights'     : '_weights'}
+
+# Meshes attached in this process with their shared memory blocks, the
+# blocks have to be kept open as long as the numpy views are used
+_attachedMeshes = {}
+
+
+def _releaseBlocks(blocks):
+    for block in blocks:
+        block.close()
+        if sys.version_info < (3,13):
+            # Attaching the block in a process sharing the resource tracker
+            # of this process removed the registration, which unlink expects
+            resource_tracker.register(block._name,'shared_memory')
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attachBlock(name):
+    """Attach to an existing block without tracking it in this process, the
+    resource tracker would otherwise unlink the block when the process
+    exits. The block is owned by the sharedMesh that created it."""
+    if sys.version_info >= (3,13):
+        return shared_memory.SharedMemory(name=name,track=False)
+    block = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(block._name,'shared_memory')
+    return block
+
+
+class sharedMesh:
+    """Publish the arrays of a fvMesh in shared memory blocks
+
+    Usage:
+    ------
+        shared = sharedMesh(mesh)
+        descriptor = shared.descriptor      # pass to the workers
+        # in a worker process
+        mesh = attachSharedMesh(descriptor)
+        ...
+        shared.close()
+    """
+
+    def __init__(self,mesh,geometry=True):
+        """Copy the mesh arrays into shared memory
+
+        Input:
+        ------
+            mesh : fvMesh
+            geometry : bool
+                Share the face centers and areas, cell centers and volumes
+                and the interpolation weights as well, so that the workers
+                do not compute them again. By default True.
+        """
+        offsets, labels = mesh.compactFaces()
+        arrays = {
+            'points'     : mesh.points,
+            'faceOffsets': offsets,
+            'faceLabels' : labels,
+            'owner'      : mesh.owner,
+            'neighbour'  : mesh.neighbour}
+        if geometry:
+            arrays.update({key: getattr(mesh,key)() for key in _geometryCaches})
+
+        self._blocks = []
+        self._finalizer = weakref.finalize(self,_releaseBlocks,self._blocks)
+        descriptors = {}
+        for key, values in arrays.items():
+            values = np.ascontiguousarray(values)
+            block = shared_memory.SharedMemory(create=True,size=max(values.nbytes,1))
+            self._blocks.append(block)
+            np.ndarray(values.shape,dtype=values.dtype,buffer=block.buf)[...] = values
+            descriptors[key] = (block.name,values.shape,values.dtype.str)
+
+        boundary = mesh._boundary
+        if boundary is None and mesh._casePath is not None:
+            boundary = mesh.boundary
+        self._descriptor = {
+            'id'       : uuid.uuid4().hex,
+            'arrays'   : descriptors,
+            'boundary' : [(patch.name,dict(patch.entries)) for patch in boundary or []],
+            'casePath' : mesh._casePath}
+
+    def close(self):
+        """Release the shared memory blocks. Meshes attached in other
+        processes remain valid until these processes detach or exit."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+
+    @property
+    def descriptor(self):
+        """Picklable description of the shared blocks for attachSharedMesh"""
+        return self._descriptor
+
+    @property
+    def nbytes(self):
+        """Size of all shared blocks in bytes"""
+        return sum(block.size for block in self._blocks)
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+
+def attachSharedMesh(descriptor):
+    """Create a fvMesh from the shared memory blocks of a sharedMesh
+
+    The arrays of the mesh are read-only views of the shared memory. The
+    mesh is cached, thus further calls with the same descriptor in this
+    process return the same object.
+
+    Input:
+    ------
+        descriptor : sharedMesh.descriptor
+
+    Returns:
+    --------
+        fvMesh
+    """
+    if descriptor['id'] in _attachedMeshes:
+        return _attachedMeshes[descriptor['id']][0]
+
+    blocks = []
+    arrays = {}
+    try:
+        for key, (name, shape, dtype) in descriptor['arrays'].items():
+            block = _attachBlock(name)
+            blocks.append(block)
+            arrays[key] = np.ndarray(shape,dtype=np.dtype(dtype),buffer=block.buf)
+            arrays[key].flags.writeable = False
+    except BaseException:
+        for block in blocks:
+            block.close()
+        raise
+
+    mesh = fvMesh.fromArrays(arrays['points'],(arrays['faceOffsets'],arrays['faceLabels']),
+                             arrays['owner'],arrays['neighbour'])
+    mesh._casePath = descriptor['casePath']
+    mesh._boundary = polyBoundaryMesh([polyPatch(name,entries,index,mesh)
+                                       for index, (name, entries) in enumerate(descriptor['boundary'])])
+    for key, cache in _geometryCaches.items():
+        if key in arrays:
+            setattr(mesh,cache,arrays[key])
+
+    _attachedMeshes[descriptor['id']] = (mesh,blocks)
+    return mesh
+
+
+def detachSharedMesh(descriptor):
+    """Remove the cached mesh of the descriptor in this process and close
+    its blocks. The mesh and its arrays must not be used afterwards."""
+    mesh, blocks = _attachedMeshes.pop(descriptor['id'],(None,[]))
+    del mesh
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Views of the block are still referenced, it is closed when the
+            # process exits
+            pass
@@ -0,0 +1,100 @@
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+
+# Patch types whose points are interpolated from the cells instead of the
+# patch face values, e.g., coupled patches that have cells on both sides
+_cellInterpolatedPatchTypes = [
+    "cyclic", "cyclicAMI", "cyclicSlip", "processor", "processorCyclic",
+    "empty", "wedge", "symmetry", "symmetryPlane"]
+
+
+class volPointInterpolation:
+    """Inverse distance interpolation of cell values to the mesh points,
+    similar to OpenFOAM's volPointInterpolation.
+
+    The weights are calculated once for the mesh and stored as sparse
+    matrix of dimension [nPoints,nCells+nBoundaryFaces]. Interpolating a
+    field is then a single sparse matrix-vector product, so create the
+    object once and reuse it for all fields and time steps.
+
+    Points of the internal mesh use the inverse distance weighted cell
+    values of all cells sharing the point. Points on a patch with boundary
+    values, e.g., a fixedValue wall, use the inverse distance weighted face
+    values of the patch faces sharing the point.
+
+    Usage:
+    ------
+        mesh = fvMesh('path/to/case')
+        interpolator = volPointInterpolation(mesh)
+        T = readOpenFOAMFile('path/to/case/0.1/T')
+        pointT = interpolator.interpolate(T)
+    """
+
+    def __init__(self,mesh):
+        self._mesh = mesh
+        self._weights = self._calcWeights()
+
+    def _calcWeights(self):
+        mesh = self._mesh
+        nCells = mesh.nCells
+        nInternalFaces = mesh.nInternalFaces
+        nBoundaryFaces = mesh.nFaces - nInternalFaces
+
+        # Boundary faces that provide the point values
+        patchFaces = np.zeros(nBoundaryFaces,dtype=bool)
+        for patch in mesh.boundary:
+            if patch.type not in _cellInterpolatedPatchTypes:
+                start = patch.startFace - nInternalFaces
+                patchFaces[start:start+patch.nFaces] = True
+
+        # Point to boundary face connectivity of these patches
+        offsets, labels = mesh.compactFaces()
+        faceIndex = np.repeat(np.arange(mesh.nFaces),np.diff(offsets))
+        onPatch = faceIndex >= nInternalFaces
+        onPatch[onPatch] = patchFaces[faceIndex[onPatch]-nInternalFaces]
+        patchPoints = labels[onPatch]
+        patchPointFaces = faceIndex[onPatch]
+
+        # Points not on any of these patches use the cell values
+        isPatchPoint = np.zeros(mesh.nPoints,dtype=bool)
+        isPatchPoint[patchPoints] = True
+        pointCells = mesh.pointCells().tocoo()
+        internal = ~isPatchPoint[pointCells.row]
+        cellPoints = pointCells.row[internal]
+        cells = pointCells.col[internal]
+
+        points = mesh.points
+        cellWeights = 1.0/np.linalg.norm(points[cellPoints]-mesh.centers()[cells],axis=1)
+        faceWeights = 1.0/np.linalg.norm(points[patchPoints]-mesh.faceCenters()[patchPointFaces],axis=1)
+
+        weights = csr_matrix(
+            (np.concatenate((cellWeights,faceWeights)),
+             (np.concatenate((cellPoints,patchPoints)),
+              np.concatenate((cells,nCells+patchPointFaces-nInternalFaces)))),
+            shape=(mesh.nPoints,nCells+nBoundaryFaces))
+
+        # Normalize the weights of each point
+        sumWeights = np.asarray(weights.sum(axis=1)).ravel()
+        sumWeights[sumWeights == 0] = 1.0
+        return diags(1.0/sumWeights) @ weights
+
+    def interpolate(self,field):
+        """Interpolate a scalar or vector field to the points
+
+        Input:
+        ------
+            field : ofVolField or numpy array
+                Field of the cell values. If an ofVolField is given, the
+                patch values are taken from its boundary data.
+
+        Returns:
+        --------
+            Array of dimension [nPoints] or [nPoints,3]
+        """
+        values = np.concatenate((self._mesh.cellValues(field),
+                                 self._mesh.boundaryFaceValues(field)))
+        return self._weights @ values
+
+    @property
+    def weights(self):
+        return self._weights
@@ -0,0 +1,64 @@
+from ofReader import fvMesh, readOpenFOAMFile, readParticlePositions, writeLagrangianCloud
+from ofReader.fileHeader import FileHeader
+import numpy as np
+import pytest
+
+
+def _cloud(mesh,nParticles=500):
+    rng = np.random.default_rng(0)
+    positions = rng.random((nParticles,3))*np.ptp(mesh.points,axis=0) + mesh.points.min(axis=0)
+    cells = mesh.findCells(positions)
+    inside = cells >= 0
+    fields = {'d': rng.random(nParticles)[inside],
+              'U': rng.random((nParticles,3))[inside],
+              'origId': np.arange(nParticles)[inside]}
+    return positions[inside], cells[inside], fields
+
+
+def _particleIndex(fields,origId):
+    return np.searchsorted(fields['origId'],origId)
+
+
+@pytest.mark.parametrize("fileFormat,scalarSize", [("ASCII",64),("binary",64),("binary",32)])
+def test_writeCloud(tmp_path,fileFormat,scalarSize):
+    mesh = fvMesh('tests/testCase')
+    positions, cells, fields = _cloud(mesh)
+    header = FileHeader()
+    header.format = fileFormat
+    header.scalarSize = scalarSize
+    files = writeLagrangianCloud(str(tmp_path),0.1,'cloud',positions,cells,fields,header,precision=12)
+    cloudPath = tmp_path / '0.1' / 'lagrangian' / 'cloud'
+    assert sorted(files) == sorted(str(cloudPath / name) for name in ['positions','d','U','origId'])
+
+    tolerance = 1E-6 if scalarSize == 32 else 1E-10
+    readPositions, readCells = readParticlePositions(str(cloudPath / 'positions'))
+    assert np.allclose(readPositions,positions,rtol=tolerance)
+    assert np.array_equal(readCells,cells)
+    assert np.allclose(readOpenFOAMFile(str(cloudPath / 'd')),fields['d'],rtol=tolerance)
+    assert np.allclose(readOpenFOAMFile(str(cloudPath / 'U')),fields['U'],rtol=tolerance)
+    assert np.array_equal(readOpenFOAMFile(str(cloudPath / 'origId')),fields['origId'])
+
+
+def test_writeDecomposedCloud(tmp_path):
+    mesh = fvMesh('tests/testCase')
+    positions, cells, fields = _cloud(mesh)
+    addressing = [readOpenFOAMFile(f'tests/testCase/processor{i}/constant/polyMesh/cellProcAddressing')
+                  for i in range(8)]
+    cellToProcessor = np.zeros(mesh.nCells,dtype=np.int64)
+    for proci, processorCells in enumerate(addressing):
+        cellToProcessor[processorCells] = proci
+
+    header = FileHeader()
+    header.format = "binary"
+    writeLagrangianCloud(str(tmp_path),0,'cloud',positions,cells,fields,header,
+                         cellToProcessor=cellToProcessor,nWorkers=2)
+
+    nParticles = 0
+    for proci, processorCells in enumerate(addressing):
+        cloudPath = tmp_path / f'processor{proci}' / '0' / 'lagrangian' / 'cloud'
+        readPositions, readCells = readParticlePositions(str(cloudPath / 'positions'))
+        origId = readOpenFOAMFile(str(cloudPath / 'origId'))
+        assert np.array_equal(processorCells[readCells],cells[_particleIndex(fields,origId)])
+        assert np.allclose(readPositions,positions[_particleIndex(fields,origId)])
+        nParticles += len(readCells)
+    assert nParticles == len(positions)
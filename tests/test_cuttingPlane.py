@@ -0,0 +1,31 @@
+from ofReader import fvMesh, cuttingPlane
+import numpy as np
+import math
+
+
+def _polygonArea(points,faces):
+    area = 0
+    for face in faces:
+        x = points[face,0]
+        y = points[face,1]
+        area += 0.5*np.sum(x*np.roll(y,-1)-np.roll(x,-1)*y)
+    return area
+
+
+def test_cuttingPlane():
+    mesh = fvMesh('tests/testCase')
+
+    # Plane through the mesh points
+    plane = cuttingPlane(mesh,(0,0,0.5),(0,0,1))
+    assert len(plane.cutCells) == 22*22
+    assert math.isclose(_polygonArea(plane.points,plane.faces),1.0)
+
+    # Oblique plane through the center of the unit cube is a hexagon
+    plane = cuttingPlane(mesh,(0.5,0.5,0.5),(1,1,1))
+    assert math.isclose(_polygonArea(plane.points,plane.faces),3*math.sqrt(3)/4)
+    assert np.allclose(plane.points3D.sum(axis=1),1.5)
+
+    # Sampled values are the cell values of the cut cells
+    reader = plane.sample(mesh.centers()[:,2])
+    assert np.allclose(reader.values,mesh.centers()[plane.cutCells,2])
+    assert reader.pos.shape == (len(plane.cutCells),2)
@@ -0,0 +1,110 @@
+from ofReader import fvMesh, readOpenFOAMFile, decomposedFieldWriter
+from ofReader.fileHeader import FileHeader
+from ofReader.particleBinning import _volField
+import numpy as np
+import shutil
+import gzip
+import os
+import re
+import pytest
+
+
+@pytest.fixture
+def casePath(tmp_path):
+    shutil.copytree('tests/testCase',tmp_path / 'case')
+    return str(tmp_path / 'case')
+
+
+@pytest.mark.parametrize("fileFormat", ["ASCII","binary"])
+def test_writeDecomposed(casePath,fileFormat):
+    mesh = fvMesh(casePath)
+    field = _volField(mesh,mesh.centers())
+    header = FileHeader()
+    header.format = fileFormat
+    header.type = "vectorField"
+
+    writer = decomposedFieldWriter(casePath,nWorkers=2)
+    files = writer.write(field,'Cw',time=1,file_header=header,dimensions=[0,1,0,0,0,0,0],precision=12)
+    assert len(files) == writer.nProcs == 8
+
+    C = readOpenFOAMFile(casePath,fileName='Cw',time=1,decomposed=True,nWorkers=2)
+    assert np.allclose(C,mesh.centers())
+
+    # Global patch values are the owner cell centers, processor patches the
+    # average of both cells
+    processor = readOpenFOAMFile(os.path.join(casePath,'processor0','1','Cw'))
+    meshPath = os.path.join(casePath,'processor0','constant','polyMesh')
+    cells = readOpenFOAMFile(os.path.join(meshPath,'cellProcAddressing'))
+    faces = np.abs(readOpenFOAMFile(os.path.join(meshPath,'faceProcAddressing')))-1
+    processorMesh = fvMesh(os.path.join(casePath,'processor0'))
+    C = mesh.centers()
+    for patch in processorMesh.boundary:
+        values = processor.boundary.patches[patch.name]
+        if patch.type == 'processor':
+            f = faces[patch.faceSlice]
+            assert np.allclose(values.data,0.5*(C[mesh.owner[f]]+C[mesh.neighbour[f]]))
+        elif values.hasValue and patch.nFaces > 1:
+            assert np.allclose(values.data,mesh.centers()[cells[patch.faceCells()]])
+
+
+def test_writeCollated(casePath):
+    mesh = fvMesh(casePath)
+    header = FileHeader()
+    header.format = "binary"
+    header.type = "scalar"
+    writer = decomposedFieldWriter(casePath,nWorkers=2)
+    filePath, = writer.write(_volField(mesh,mesh.volumes()),'V',time=0,file_header=header,
+                             dimensions=[0,3,0,0,0,0,0],collated=True)
+    assert filePath == os.path.join(casePath,'processors8','0','V')
+    with open(filePath,'rb') as fp:
+        content = fp.read()
+    assert b'class       decomposedBlockData;' in content
+    assert b'data.class  volScalarField;' in content
+
+    # Each block is the content of one processor file, only the first one
+    # with the FoamFile header of the field
+    processorFields = writer.decompose(_volField(mesh,mesh.volumes()))
+    pos = content.index(b'}')
+    blocks = []
+    for i in range(writer.nProcs):
+        match = re.compile(rb'// Processor(\d+)\n(\d+)\n\(').search(content,pos)
+        assert int(match.group(1)) == i
+        start = match.end()
+        blocks.append(content[start:start+int(match.group(2))])
+        pos = start+int(match.group(2))
+        assert content[pos:pos+1] == b')'
+    assert re.search(rb'// Processor',content[pos:]) is None
+
+    fieldHeader = blocks[0][:blocks[0].index(b'dimensions')]
+    assert b'class       volScalarField;' in fieldHeader
+    for i, (block, (data, boundary)) in enumerate(zip(blocks,processorFields)):
+        assert (i == 0) == block.startswith(b'/*')
+        blockPath = os.path.join(casePath,'processors8','0',f'block{i}')
+        with open(blockPath,'wb') as fp:
+            fp.write(block if i == 0 else fieldHeader+block)
+        field = readOpenFOAMFile(blockPath)
+        assert np.array_equal(field.internal_data,data)
+        for name, patch in boundary.patches.items():
+            assert field.boundary.patches[name].type == patch.type
+            if patch.type == 'processor':
+                assert np.array_equal(field.boundary.patches[name].data,patch.data)
+
+
+def test_writeCompressed(casePath):
+    mesh = fvMesh(casePath)
+    header = FileHeader()
+    header.type = "scalar"
+    writer = decomposedFieldWriter(casePath,nWorkers=2)
+    field = _volField(mesh,mesh.volumes())
+    files = writer.write(field,'V',time=0,file_header=header,dimensions=[0,3,0,0,0,0,0],compression=True)
+    assert all(f.endswith('.gz') for f in files)
+    with gzip.open(files[0]) as fp:
+        assert b'object      V;' in fp.read()
+
+    # Compressed collated files consist of one gzip member per processor
+    plain, = writer.write(field,'V',time=0,file_header=header,dimensions=[0,3,0,0,0,0,0],collated=True)
+    compressed, = writer.write(field,'V',time=0,file_header=header,dimensions=[0,3,0,0,0,0,0],
+                               collated=True,compression=1)
+    assert compressed == plain + '.gz'
+    with gzip.open(compressed) as fp, open(plain,'rb') as plainFp:
+        assert fp.read() == plainFp.read()
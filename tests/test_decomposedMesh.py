@@ -0,0 +1,28 @@
+from ofReader import fvMesh, readDecomposedMesh, decomposedMesh
+import numpy as np
+
+
+def test_readDecomposedMesh():
+    mesh = fvMesh('tests/testCase')
+    merged = readDecomposedMesh('tests/testCase',nWorkers=2)
+    assert merged.nCells == mesh.nCells
+    assert merged.nInternalFaces == mesh.nInternalFaces
+    # The processor points are written in ASCII with limited precision
+    assert np.allclose(merged.points,mesh.points,atol=1E-9)
+    assert np.array_equal(merged.owner,mesh.owner)
+    assert np.array_equal(merged.neighbour,mesh.neighbour)
+    assert np.array_equal(merged.compactFaces()[1],mesh.compactFaces()[1])
+    assert merged.boundary.names() == mesh.boundary.names()
+    for patch in mesh.boundary:
+        assert merged.boundary[patch.name].startFace == patch.startFace
+        assert merged.boundary[patch.name].nFaces == patch.nFaces
+
+
+def test_decomposedMesh():
+    mesh = fvMesh('tests/testCase')
+    processors = decomposedMesh('tests/testCase',nWorkers=2)
+    assert processors.nProcs == 8
+    assert np.allclose(processors.centers(),mesh.centers())
+    assert np.isclose(processors.volumes().sum(),1.0)
+    C = processors.readField('C',time=0)
+    assert np.allclose(C,mesh.centers(),atol=1E-6)
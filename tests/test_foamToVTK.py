@@ -0,0 +1,30 @@
+from ofReader import fvMesh, foamToVTK
+import numpy as np
+import pyvista as pv
+
+
+def test_foamToVTK(tmp_path):
+    mesh = fvMesh('tests/testCase')
+    converter = foamToVTK(mesh)
+    grid = converter.internalMesh({'V':mesh.volumes(),'C':mesh.centers()})
+    assert grid.n_cells == mesh.nCells
+    # The polyhedral cells are closed and have outward pointing faces
+    assert np.allclose(grid.compute_cell_sizes()['Volume'],mesh.volumes())
+    assert np.allclose(grid.cell_centers().points,mesh.centers())
+    assert grid.cell_data['C'].shape == (mesh.nCells,3)
+    # The cached grid is shared and does not store the data
+    assert np.shares_memory(grid.points,converter.grid.points)
+    assert len(converter.grid.cell_data) == 0
+
+    for dataMode in ['appended','binary','ascii']:
+        converter.write(tmp_path/f'mesh_{dataMode}.vtu',{'V':mesh.volumes()},dataMode=dataMode)
+        result = pv.read(tmp_path/f'mesh_{dataMode}.vtu')
+        assert np.allclose(result.cell_data['V'],mesh.volumes())
+        assert np.isclose(result.volume,1.0)
+
+    patch = mesh.boundary['cyclicLeft']
+    converter.writePatch('cyclicLeft',tmp_path/'left.vtp',{'V':mesh.volumes()})
+    result = pv.read(tmp_path/'left.vtp')
+    assert result.n_cells == patch.nFaces
+    assert np.isclose(result.area,1.0)
+    assert np.allclose(result.cell_data['V'],mesh.volumes()[patch.faceCells()])
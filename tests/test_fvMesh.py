@@ -21,3 +21,23 @@ ax = fig.add_subplot(projection='3d')
 ax.scatter(centers[:,0],centers[:,1],centers[:,2])
 plt.savefig('test.png',format='png')
 
+
+
+def test_fvMesh_sparseOperators():
+    A = mesh.cellCellAdjacency()
+    # Each internal face connects two cells in both directions
+    assert A.nnz == 2*mesh.nInternalFaces
+    assert (A != A.T).nnz == 0
+    # Hexahedral cells have at most six neighbours
+    nNeighbours = A @ np.ones(mesh.nCells)
+    assert nNeighbours.max() == 6
+    assert nNeighbours.min() == 3
+
+    # A constant cell field interpolates to a constant face field
+    faceValues = mesh.cellToFaceMatrix() @ np.full(mesh.nCells,2.0)
+    assert np.allclose(faceValues,2.0)
+
+    # Summing the face flux of a constant face field gives the number of
+    # boundary faces of each cell
+    netFlux = mesh.faceToCellMatrix() @ np.ones(mesh.nFaces)
+    assert math.isclose(netFlux.sum(),mesh.nFaces-mesh.nInternalFaces)
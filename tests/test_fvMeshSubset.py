@@ -0,0 +1,73 @@
+from ofReader import fvMesh, readOpenFOAMFile
+from ofReader.fvMeshSubset import fvMeshSubset, readCellZones, readCellSet, cellsInBox, cellsInSphere
+import numpy as np
+
+
+def _writeLabelFile(filePath,fileClass,body,fileFormat):
+    with open(filePath,'wb') as fp:
+        fp.write(("FoamFile\n{\n    version 2.0;\n"
+                  f"    format {fileFormat};\n"
+                  "    arch \"LSB;label=32;scalar=64\";\n"
+                  f"    class {fileClass};\n    object data;\n}}\n\n").encode())
+        fp.write(body)
+
+
+def _labelList(labels,fileFormat):
+    if fileFormat == 'binary':
+        return f"{len(labels)}\n(".encode() + np.asarray(labels,dtype=np.int32).tobytes() + b")\n"
+    return f"{len(labels)}\n(\n".encode() + "\n".join(map(str,labels)).encode() + b"\n)\n"
+
+
+def test_readCellZonesAndSets(tmp_path):
+    for fileFormat in ['ascii','binary']:
+        zones = {'inner': [4,5,9], 'outer': [0,1,2,3]}
+        body = f"{len(zones)}\n(\n".encode()
+        for name, labels in zones.items():
+            body += f"{name}\n{{\n    type cellZone;\ncellLabels      List<label> ".encode() \
+                  + _labelList(labels,fileFormat) + b";\n}\n\n"
+        body += b")\n"
+        _writeLabelFile(tmp_path/'cellZones','regIOobject',body,fileFormat)
+        result = readCellZones(tmp_path/'cellZones')
+        assert list(result.keys()) == ['inner','outer']
+        assert np.array_equal(result['outer'],zones['outer'])
+
+        _writeLabelFile(tmp_path/'set','cellSet',_labelList([7,2,3],fileFormat),fileFormat)
+        assert np.array_equal(readCellSet(tmp_path/'set'),[2,3,7])
+
+    assert readCellZones('tests/testCase/constant/polyMesh/cellZones') == {}
+
+
+def test_fvMeshSubset():
+    mesh = fvMesh('tests/testCase')
+    subset = fvMeshSubset(mesh,cellsInSphere(mesh,(0.5,0.5,0.5),0.3))
+    subMesh = subset.mesh
+    assert subMesh.nCells == len(subset.cellMap)
+    assert np.allclose(subMesh.centers(),mesh.centers()[subset.cellMap])
+    assert np.allclose(subMesh.volumes(),mesh.volumes()[subset.cellMap])
+    # All cells are closed, i.e., the exposed faces point out of the subset
+    assert np.allclose(subMesh.faceToCellMatrix() @ subMesh.faceAreas(),0.0)
+    assert subMesh.boundary['oldInternalFaces'].nFaces == subMesh.nFaces-subMesh.nInternalFaces
+
+    # Half of the cube, the cyclic patches cut by the box are no longer coupled
+    subset = fvMeshSubset(mesh,cellsInBox(mesh,(0,0,0),(1,1,0.5)))
+    assert np.isclose(subset.mesh.volumes().sum(),0.5)
+    assert subset.mesh.boundary['oldInternalFaces'].nFaces == 484
+    assert subset.mesh.boundary['cyclicLeft'].type == 'patch'
+    assert np.allclose(subset.mesh.points,mesh.points[subset.pointMap])
+
+
+def test_fvMeshSubset_readField():
+    mesh = fvMesh('tests/testCase/processor0')
+    subset = fvMeshSubset(mesh,cellsInBox(mesh,(0,0,0),(0.3,0.3,0.3)))
+    C = subset.readField('tests/testCase/processor0/0/C')
+    full = readOpenFOAMFile('tests/testCase/processor0/0/C')
+    assert np.array_equal(C.internal_data,full.internal_data[subset.cellMap])
+    assert np.array_equal(subset.subsetField(full).internal_data,C.internal_data)
+    patch = subset.mesh.boundary['procBoundary0to1throughcyclicLeft']
+    assert C.boundary.patches[patch.name].data.shape == (patch.nFaces,3)
+
+    # Ranged read of a binary block
+    points = readOpenFOAMFile('tests/testCase/constant/polyMesh/points')
+    indices = [5,3,len(points)-1,7]
+    assert np.array_equal(readOpenFOAMFile('tests/testCase/constant/polyMesh/points',cells=indices),
+                          points[indices])
@@ -0,0 +1,47 @@
+from ofReader import fvMesh, fvc
+import numpy as np
+
+mesh = fvMesh('tests/testCase')
+C = mesh.centers()
+
+# The test mesh is periodic, only cells without a cyclic face see the
+# linear fields without a jump
+interior = mesh.cellCellAdjacency() @ np.ones(mesh.nCells) == 6
+
+
+def test_fvc_grad():
+    gradX = fvc.grad(mesh,C[:,0])
+    assert np.allclose(gradX[interior],[1,0,0])
+
+    gradC = fvc.grad(mesh,C)
+    assert np.allclose(gradC[interior],np.eye(3))
+
+
+def test_fvc_div_curl():
+    assert np.allclose(fvc.div(mesh,C)[interior],3.0)
+
+    # Solid body rotation around the z-axis has a curl of (0 0 2)
+    U = np.column_stack((-C[:,1],C[:,0],np.zeros(mesh.nCells)))
+    assert np.allclose(fvc.curl(mesh,U)[interior],[0,0,2])
+
+    # The divergence of the face flux matches the divergence of U
+    phi = np.einsum('ij,ij->i',mesh.faceAreas(),fvc.interpolate(mesh,C))
+    assert np.allclose(fvc.div(mesh,phi),fvc.div(mesh,C))
+
+
+def test_fvc_chunked():
+    assert np.allclose(fvc.grad(mesh,C,chunkSize=1000),fvc.grad(mesh,C))
+    assert np.allclose(fvc.interpolate(mesh,C,chunkSize=1000),fvc.interpolate(mesh,C))
+    # Small chunks, one of them spans the last internal and first boundary faces
+    assert np.allclose(fvc.div(mesh,C,chunkSize=97),fvc.div(mesh,C))
+
+
+def test_fvc_meshFromArrays():
+    # Without patches all boundary faces are zero gradient
+    arrayMesh = fvMesh.fromArrays(mesh.points,mesh.compactFaces(),mesh.owner,mesh.neighbour)
+    assert len(arrayMesh.boundary) == 0
+    gradX = fvc.grad(arrayMesh,C[:,0])
+    assert np.allclose(gradX[interior],[1,0,0])
+    # Zero gradient faces on the x boundaries reduce the gradient
+    xBoundary = (C[:,0] < C[:,0].min()+1e-9) | (C[:,0] > C[:,0].max()-1e-9)
+    assert np.allclose(gradX[xBoundary,0],0.5)
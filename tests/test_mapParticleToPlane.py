@@ -0,0 +1,78 @@
+from ofReader import MapParticleToPlane
+import numpy as np
+import pyvista as pv
+
+
+def test_mapParticleToPlane(tmp_path):
+    rng = np.random.default_rng(0)
+    pos = rng.random((2000,3))
+    mapper = MapParticleToPlane()
+    mapper.createPlane(pos=pos,coords=(0,1),nX=4,nY=3,xBounds=(0,1),yBounds=(0,1))
+
+    # Two triangles in each lattice cell with the points ordered by x
+    assert mapper._tri.shape == (2*4*3,3)
+    assert mapper._triPoints.shape == (5*4,2)
+    assert np.allclose(mapper._triPoints[6],(0.25,2/3))
+    assert np.array_equal(mapper._tri[:2],[[0,4,5],[0,1,5]])
+    a = mapper._triPoints[mapper._tri[:,1]]-mapper._triPoints[mapper._tri[:,0]]
+    b = mapper._triPoints[mapper._tri[:,2]]-mapper._triPoints[mapper._tri[:,0]]
+    area = 0.5*np.abs(a[:,0]*b[:,1]-a[:,1]*b[:,0])
+    assert np.allclose(area,1/24)
+
+    # Mapping a constant value gives this value in all triangles
+    mapper.map(pos,np.full(len(pos),2.0))
+    assert np.allclose(mapper._triValues,2.0)
+
+    mapper.writeVTKFile(str(tmp_path / "plane.vtu"))
+    mesh = pv.read(str(tmp_path / "plane.vtu"))
+    assert mesh.n_cells == 24
+    assert np.allclose(mesh.cell_data["values"],2.0)
+
+
+def test_latticeBinning():
+    rng = np.random.default_rng(1)
+    pos = rng.uniform(-1.2,1.2,(20000,3))
+    val = rng.random(len(pos))
+    mapper = MapParticleToPlane()
+    mapper.createPlane(pos=pos,coords=(2,0),cylinderDomain=True,nX=7,nY=5,
+                       xBounds=(-1,1),yBounds=(0.1,1.1))
+
+    # The arithmetic bins are the triangles found by matplotlib
+    x = pos[:,2]
+    y = np.hypot(pos[:,0],pos[:,1])
+    assert np.array_equal(mapper._latticeTriangles(x,y),mapper._triFinder(x,y))
+
+    # Sum and mean of the values in each triangle
+    triIndex = mapper._triFinder(x,y)
+    mapper.map(pos,val,normalize=False)
+    expected = np.zeros(len(mapper._tri))
+    np.add.at(expected,triIndex[triIndex >= 0],val[triIndex >= 0])
+    assert np.allclose(mapper._triValues,expected)
+    mapper.map(pos,val)
+    counts = np.bincount(triIndex[triIndex >= 0],minlength=len(mapper._tri))
+    assert np.allclose(mapper._triValues,expected/counts)
+
+
+def test_createPlaneTwice():
+    rng = np.random.default_rng(2)
+    pos = rng.random((5000,3))
+    val = rng.random(len(pos))
+    mapper = MapParticleToPlane()
+    mapper.createPlane(pos=pos,coords=(0,1),nX=4,nY=3,xBounds=(0,1),yBounds=(0,1))
+    mapper.map(pos,val)
+
+    # New number of bins
+    mapper.createPlane(pos=pos,coords=(0,1),nX=8,nY=6,xBounds=(0,1),yBounds=(0,1))
+    assert mapper._tri.shape == (2*8*6,3)
+    mapper.map(pos,val)
+    assert len(mapper._triValues) == 96
+
+    # Same number of bins but new bounds
+    mapper.createPlane(pos=pos,coords=(0,1),nX=8,nY=6,xBounds=(0,0.5),yBounds=(0.5,1))
+    assert np.allclose(mapper._triPoints.min(axis=0),(0,0.5))
+    assert np.allclose(mapper._triPoints.max(axis=0),(0.5,1))
+    mapper.map(pos,val,normalize=False)
+    x, y = pos[:,0], pos[:,1]
+    assert np.array_equal(mapper._latticeTriangles(x,y),mapper._triFinder(x,y))
+    inside = (x <= 0.5) & (y >= 0.5)
+    assert np.isclose(mapper._triValues.sum(),val[inside].sum())
@@ -0,0 +1,77 @@
+from ofReader import fvMesh, fvMeshSubset, cellsInBox
+from ofReader import meshQuality
+from ofReader.polyBoundaryMesh import polyPatch, polyBoundaryMesh
+import numpy as np
+
+
+def test_meshQuality_uniform():
+    mesh = fvMesh('tests/testCase')
+    quality = meshQuality.cellQuality(mesh)
+    assert np.allclose(quality['nonOrthogonality'],0.0)
+    assert np.allclose(quality['skewness'],0.0)
+    assert np.allclose(quality['aspectRatio'],1.0)
+    # Each hex cell consists of six pyramids of the same volume
+    assert np.allclose(quality['minPyramidVolume'],mesh.volumes()/6.0)
+
+
+def test_meshQuality_distorted():
+    mesh = fvMesh('tests/testCase')
+    rng = np.random.default_rng(0)
+    points = mesh.points + rng.uniform(-0.01,0.01,mesh.points.shape)
+    distorted = fvMesh.fromArrays(points,mesh.faces,mesh.owner,mesh.neighbour,mesh.boundary)
+
+    # Skewness of one face following OpenFOAM's definition
+    face = 100
+    C = distorted.centers()
+    Cf = distorted.faceCenters()[face]
+    Sf = distorted.faceAreas()[face]
+    d = C[distorted.neighbour[face]]-C[distorted.owner[face]]
+    Cpf = Cf-C[distorted.owner[face]]
+    sv = Cpf-np.dot(Sf,Cpf)/np.dot(Sf,d)*d
+    fd = max(0.2*np.linalg.norm(d),
+             np.max(np.abs((points[mesh.faces[face]]-Cf) @ sv/np.linalg.norm(sv))))
+    assert np.isclose(meshQuality.faceSkewness(distorted)[face],np.linalg.norm(sv)/fd)
+    angle = np.degrees(np.arccos(np.dot(d,Sf)/np.linalg.norm(d)/np.linalg.norm(Sf)))
+    assert np.isclose(meshQuality.faceNonOrthogonality(distorted)[face],angle)
+
+    # Processing the faces in chunks gives the same result
+    quality = meshQuality.cellQuality(distorted)
+    chunked = meshQuality.cellQuality(distorted,chunkSize=777)
+    for name in quality:
+        assert np.allclose(quality[name],chunked[name])
+
+    summary = meshQuality.checkMesh(distorted,bins=5)
+    assert summary['nonOrthogonality']['max'] > 0
+    assert summary['nonOrthogonality']['counts'].sum() == mesh.nCells
+    assert summary['minPyramidVolume']['nFailed'] == 0
+
+
+def test_meshQuality_aspectRatio():
+    mesh = fvMesh('tests/testCase')
+    rng = np.random.default_rng(1)
+    points = mesh.points*(3.0,1.0,0.5) + rng.uniform(-0.005,0.005,mesh.points.shape)
+    distorted = fvMesh.fromArrays(points,mesh.faces,mesh.owner,mesh.neighbour,mesh.boundary)
+
+    # Hand computation of one cell from the sum of the face area magnitudes
+    # of each component
+    cell = 200
+    faces = np.concatenate((np.nonzero(distorted.owner == cell)[0],np.nonzero(distorted.neighbour == cell)[0]))
+    sumMagClosed = np.abs(distorted.faceAreas()[faces]).sum(axis=0)
+    expected = max(sumMagClosed.max()/sumMagClosed.min(),
+                   sumMagClosed.sum()/6.0/distorted.volumes()[cell]**(2.0/3.0))
+    assert np.isclose(meshQuality.cellAspectRatio(distorted)[cell],expected)
+
+    # One cell thick 2D mesh with empty front and back patches, only the
+    # x and y directions are used
+    subset = fvMeshSubset(mesh,cellsInBox(mesh,(0,0,0),(1,1,1/22))).mesh
+    layer = fvMesh.fromArrays(subset.points*(3.0,1.0,0.1),subset.compactFaces(),subset.owner,subset.neighbour)
+    patches = []
+    for patch in subset.boundary:
+        entries = dict(patch.entries)
+        normal = np.abs(patch.faceAreas()).sum(axis=0)
+        if patch.nFaces and normal[2] > normal[:2].sum():
+            entries['type'] = 'empty'
+        patches.append(polyPatch(patch.name,entries,len(patches),layer))
+    layer._boundary = polyBoundaryMesh(patches)
+    assert np.array_equal(meshQuality._geometricDirections(layer),[True,True,False])
+    assert np.allclose(meshQuality.cellAspectRatio(layer),3.0)
@@ -1,6 +1,9 @@
-from ofReader import readOpenFOAMFile
+from ofReader import readOpenFOAMFile, fvMesh
+from ofReader.ofFileReader import processorDirectories
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import pytest
 
 
 def test_ofFileReader_parallel():
@@ -12,3 +15,47 @@ def test_ofFileReader_parallel():
     ax.scatter(data[:,0],data[:,1],data[:,2])
     plt.savefig('test-readParallel.png',format='png')
     
+
+
+def _writeSurfaceField(filePath,internal,patchValues):
+    def valueList(values):
+        return f"nonuniform List<scalar>\n{len(values)}\n(\n" + "\n".join(f"{v:.17g}" for v in values) + "\n)\n"
+    with open(filePath,'w') as fp:
+        fp.write("FoamFile\n{\n    version 2.0;\n    format ascii;\n"
+                 "    class surfaceScalarField;\n    object phi;\n}\n\n"
+                 "dimensions [0 3 -1 0 0 0 0];\n\n"
+                 f"internalField {valueList(internal)};\n\n"
+                 "boundaryField\n{\n")
+        for name, values in patchValues.items():
+            fp.write(f"    {name}\n    {{\n        type processor;\n        value {valueList(values)};\n    }}\n")
+        fp.write("}\n")
+
+
+def test_ofFileReader_parallelSurfaceField(tmp_path):
+    # Volume flux of a uniform velocity on each processor mesh
+    U = np.array([1.0,2.0,3.0])
+    for processorPath in processorDirectories('tests/testCase'):
+        processorDir = tmp_path/os.path.basename(processorPath)
+        os.makedirs(processorDir/'0')
+        os.symlink(os.path.abspath(os.path.join(processorPath,'constant')),processorDir/'constant')
+        processorMesh = fvMesh(processorPath)
+        phi = processorMesh.faceAreas() @ U
+        patchValues = {patch.name: phi[patch.faceSlice] for patch in processorMesh.boundary
+                       if patch.type == 'processor' and patch.nFaces > 0}
+        _writeSurfaceField(processorDir/'0'/'phi',phi[:processorMesh.nInternalFaces],patchValues)
+
+    phi = readOpenFOAMFile(str(tmp_path),time=0,fileName='phi',decomposed=True,nWorkers=2)
+    mesh = fvMesh('tests/testCase')
+    assert phi.shape == (mesh.nInternalFaces,)
+    assert np.allclose(phi,mesh.faceAreas()[:mesh.nInternalFaces] @ U)
+
+    # A cell field with the wrong number of values is not taken as uniform
+    for processorPath in processorDirectories(str(tmp_path)):
+        with open(os.path.join(processorPath,'0','T'),'w') as fp:
+            fp.write("FoamFile\n{\n    version 2.0;\n    format ascii;\n"
+                     "    class volScalarField;\n    object T;\n}\n\n"
+                     "dimensions [0 0 0 1 0 0 0];\n\n"
+                     "internalField nonuniform List<scalar>\n2\n(\n300\n310\n)\n;\n\n"
+                     "boundaryField\n{\n}\n")
+    with pytest.raises(ValueError,match="Expected 1331 values"):
+        readOpenFOAMFile(str(tmp_path),time=0,fileName='T',decomposed=True,nWorkers=2)
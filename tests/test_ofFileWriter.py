@@ -0,0 +1,124 @@
+from ofReader import readOpenFOAMFile, writeOpenFOAMFile, writeOpenFOAMFiles
+from ofReader.fileHeader import FileHeader
+from ofReader.ofBoundaryData import ofBoundaryData, Patch
+import numpy as np
+import gzip
+import pytest
+
+
+def _boundary(values):
+    boundary = ofBoundaryData()
+    wall = Patch('wall')
+    wall.type = 'calculated'
+    wall.data = values[:7]
+    wall.hasValue = True
+    inlet = Patch('inlet')
+    inlet.type = 'fixedValue'
+    inlet.data = values[:1]
+    inlet.hasValue = True
+    boundary.patches['wall'] = wall
+    boundary.patches['inlet'] = inlet
+    boundary.patches['front'] = Patch('front')
+    return boundary
+
+
+@pytest.mark.parametrize("fieldType,shape", [("scalar",(100,)),("vectorField",(100,3))])
+@pytest.mark.parametrize("labelSize,scalarSize", [(32,64),(64,64),(32,32)])
+def test_writeBinary(tmp_path,fieldType,shape,labelSize,scalarSize):
+    header = FileHeader()
+    header.format = "binary"
+    header.type = fieldType
+    header.labelSize = labelSize
+    header.scalarSize = scalarSize
+    data = np.random.default_rng(0).random(shape)
+    filePath = tmp_path / 'T'
+    writeOpenFOAMFile(str(filePath),header,data,_boundary(data),[0,0,0,1,0,0,0])
+
+    written = FileHeader()
+    written.readFile(str(filePath))
+    assert written.format == "binary"
+    assert written.labelSize == labelSize and written.scalarSize == scalarSize
+    assert written.fieldType == "volField"
+
+    field = readOpenFOAMFile(str(filePath))
+    dataType = np.float32 if scalarSize == 32 else np.float64
+    assert np.array_equal(field.internal_data,data.astype(dataType))
+    wall = field.boundary.patches['wall']
+    assert wall.hasValue and np.array_equal(wall.data,data[:7].astype(dataType))
+    assert field.boundary.patches['inlet'].data.size == (1 if fieldType == "scalar" else 3)
+    assert not field.boundary.patches['front'].hasValue
+
+
+def test_writeUniform(tmp_path):
+    header = FileHeader()
+    header.format = "binary"
+    header.type = "vectorField"
+    filePath = tmp_path / 'U'
+    writeOpenFOAMFile(str(filePath),header,np.array([1.0,0.0,0.5]),ofBoundaryData(),[0,1,-1,0,0,0,0])
+    field = readOpenFOAMFile(str(filePath))
+    assert np.allclose(field.internal_data,[[1.0,0.0,0.5]])
+
+
+@pytest.mark.parametrize("fieldType,shape", [("scalar",(100,)),("vectorField",(100,3))])
+def test_writeASCII(tmp_path,fieldType,shape):
+    header = FileHeader()
+    header.type = fieldType
+    data = np.random.default_rng(1).random(shape)
+    filePath = tmp_path / 'T'
+    writeOpenFOAMFile(str(filePath),header,data,_boundary(data),[0,0,0,1,0,0,0],precision=10)
+
+    field = readOpenFOAMFile(str(filePath))
+    assert np.allclose(field.internal_data,data,rtol=1E-9,atol=0)
+    wall = field.boundary.patches['wall']
+    assert wall.hasValue and np.allclose(wall.data,data[:7],rtol=1E-9,atol=0)
+
+    # The default precision of six digits
+    writeOpenFOAMFile(str(filePath),header,data,_boundary(data),[0,0,0,1,0,0,0])
+    field = readOpenFOAMFile(str(filePath))
+    assert np.allclose(field.internal_data,data,rtol=1E-5,atol=0)
+    assert not np.allclose(field.internal_data,data,rtol=1E-9,atol=0)
+
+
+def test_writeCompressed(tmp_path):
+    header = FileHeader()
+    header.format = "binary"
+    header.type = "scalar"
+    data = np.random.default_rng(2).random(1000)
+    filePath = writeOpenFOAMFile(str(tmp_path / 'T'),header,data,_boundary(data),[0,0,0,1,0,0,0],compression=9)
+    assert filePath == str(tmp_path / 'T.gz')
+
+    with gzip.open(filePath) as fp:
+        content = fp.read()
+    assert b'object      T;' in content
+    (tmp_path / 'T').write_bytes(content)
+    assert np.array_equal(readOpenFOAMFile(str(tmp_path / 'T')).internal_data,data)
+
+
+def test_writePath(tmp_path):
+    header = FileHeader()
+    header.type = "scalar"
+    data = np.arange(10.0)
+    (tmp_path / '0').mkdir()
+    filePath = writeOpenFOAMFile(tmp_path / '0' / 'T',header,data,_boundary(data),[0,0,0,1,0,0,0])
+    assert filePath == str(tmp_path / '0' / 'T')
+    assert np.allclose(readOpenFOAMFile(filePath).internal_data,data)
+
+    filePath = writeOpenFOAMFile(tmp_path / '0' / 'U',header,data,_boundary(data),[0,0,0,1,0,0,0],
+                                 compression=True)
+    assert filePath == str(tmp_path / '0' / 'U.gz')
+    with gzip.open(filePath) as fp:
+        content = fp.read()
+    assert b'object      U;' in content and b'location    "0";' in content
+
+
+def test_writeOpenFOAMFiles(tmp_path):
+    header = FileHeader()
+    header.type = "scalar"
+    data = [np.full(10,float(i))+np.arange(10) for i in range(4)]
+    files = [(str(tmp_path / f'T{i}'),header,data[i],_boundary(data[i]),[0,0,0,1,0,0,0]) for i in range(4)]
+    written = writeOpenFOAMFiles(files,nWorkers=2,compression=True)
+    assert written == [str(tmp_path / f'T{i}.gz') for i in range(4)]
+    for i, filePath in enumerate(written):
+        with gzip.open(filePath) as fp:
+            (tmp_path / f'T{i}').write_bytes(fp.read())
+        assert np.allclose(readOpenFOAMFile(str(tmp_path / f'T{i}')).internal_data,data[i])
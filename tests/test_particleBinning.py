@@ -0,0 +1,61 @@
+from ofReader import fvMesh, readParticlePositions, particleBinning
+import numpy as np
+
+
+def _writePositions(filePath,positions,cells,fileFormat):
+    with open(filePath,'wb') as fp:
+        fp.write(("FoamFile\n{\n    version 2.0;\n"
+                  f"    format {fileFormat};\n"
+                  "    arch \"LSB;label=32;scalar=64\";\n"
+                  "    class Cloud<passiveParticle>;\n    object positions;\n}\n\n").encode())
+        fp.write(f"{len(positions)}\n(".encode())
+        for position, cell in zip(positions,cells):
+            if fileFormat == 'binary':
+                fp.write(b"\n(" + position.tobytes() + np.int32(cell).tobytes() + b")")
+            else:
+                fp.write(f"\n({position[0]} {position[1]} {position[2]}) {cell}".encode())
+        fp.write(b"\n)\n")
+
+
+def test_readParticlePositions(tmp_path):
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(0,1,(50,3))
+    cells = rng.integers(0,100,50)
+    for fileFormat in ['ascii','binary']:
+        _writePositions(tmp_path/'positions',positions,cells,fileFormat)
+        readPositions, readCells = readParticlePositions(tmp_path/'positions')
+        assert np.allclose(readPositions,positions)
+        assert np.array_equal(readCells,cells)
+
+
+def test_particleBinning():
+    mesh = fvMesh('tests/testCase')
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0,1,(2000,3))
+    cells = mesh.findCells(positions)
+    # Particles without cell label are located in the mesh
+    labels = cells.copy()
+    labels[::3] = -1
+    binning = particleBinning(mesh,np.vstack((positions,[[2,2,2]])),np.append(labels,-1))
+    assert np.array_equal(binning.particleCells[:-1],cells)
+    assert binning.nParticlesOutside == 1
+
+    d = np.append(rng.uniform(1E-5,1E-4,2000),1.0)
+    nParticle = np.append(rng.integers(1,10,2000),1)
+    count = binning.count()
+    assert count.internal_data.sum() == 2000
+    assert count.boundary.patches['cyclicLeft'].type == 'cyclic'
+
+    alpha = binning.volumeFraction(d,nParticle).internal_data
+    assert np.isclose(np.sum(alpha*mesh.volumes()),np.sum(np.pi/6*nParticle[:-1]*d[:-1]**3))
+
+    d32 = binning.sauterMeanDiameter(d,nParticle).internal_data
+    cell = cells[0]
+    inCell = cells == cell
+    assert np.isclose(d32[cell],np.sum(nParticle[:-1][inCell]*d[:-1][inCell]**3)
+                      /np.sum(nParticle[:-1][inCell]*d[:-1][inCell]**2))
+    assert np.all(d32[count.internal_data == 0] == 0)
+
+    U = binning.mean(np.vstack((positions,[[2,2,2]]))).internal_data
+    assert U.shape == (mesh.nCells,3)
+    assert np.allclose(U[cell],positions[inCell].mean(axis=0))
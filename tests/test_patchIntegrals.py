@@ -0,0 +1,70 @@
+from ofReader import fvMesh, fvMeshSubset, cellsInBox
+from ofReader.ofvolField import ofVolField
+from ofReader.patchIntegrals import patchIntegrals, patchIntegralTimeSeries
+import numpy as np
+import os
+import pytest
+
+patchNames = ['cyclicLeft','cyclicRight','cyclicTop','cyclicBottom','cyclicFront','cyclicBack']
+
+
+def _writeField(filePath,fieldClass,internalField,leftValue):
+    patches = ''.join(f"    {name}\n    {{\n        type cyclic;\n    }}\n" for name in patchNames[1:])
+    with open(filePath,'w') as fp:
+        fp.write("FoamFile\n{\n    version 2.0;\n    format ascii;\n"
+                 f"    class {fieldClass};\n    object field;\n}}\n\n"
+                 "dimensions [0 0 0 0 0 0 0];\n\n"
+                 f"internalField uniform {internalField};\n\n"
+                 "boundaryField\n{\n"
+                 f"    cyclicLeft\n    {{\n        type fixedValue;\n        value uniform {leftValue};\n    }}\n"
+                 + patches + "}\n")
+
+
+def test_patchIntegrals(tmp_path):
+    os.symlink(os.path.abspath('tests/testCase/constant'),tmp_path/'constant')
+    for time in ['0','0.5']:
+        os.mkdir(tmp_path/time)
+        _writeField(tmp_path/time/'T','volScalarField',float(time)+1,300)
+        _writeField(tmp_path/time/'U','volVectorField','(1 0 0)','(2 0 0)')
+
+    mesh = fvMesh(str(tmp_path))
+    result = patchIntegrals(mesh,{'T':np.full(mesh.nCells,5.0)},
+                            operations=['areaAverage','areaIntegrate'])
+    assert len(result['value']) == 2*len(patchNames)
+    assert np.allclose(result['value'],5.0)
+
+    series = patchIntegralTimeSeries(str(tmp_path),['T','U'],patches=['cyclicLeft','cyclicRight'],
+                                     operations=['areaAverage','areaNormalIntegrate'],
+                                     mesh=mesh,nWorkers=2)
+    T = (series['field'] == 'T') & (series['operation'] == 'areaAverage')
+    assert np.allclose(series['time'][T],[0,0,0.5,0.5])
+    # Fixed value on the left patch, cell values on the right patch
+    assert np.allclose(series['value'][T],[300,1,300,1.5])
+
+    # Volume flux of U through the left and right patch
+    flux = (series['field'] == 'U') & (series['operation'] == 'areaNormalIntegrate')
+    assert np.allclose(series['value'][flux],[-2,1,-2,1])
+
+
+def test_patchIntegrals_surfaceField():
+    # Subset of 2x2x1 cells with as many cells as internal faces
+    mesh = fvMesh('tests/testCase')
+    subset = fvMeshSubset(mesh,cellsInBox(mesh,(0,0,0),(2/22,2/22,1/22))).mesh
+    assert subset.nCells == subset.nInternalFaces == 4
+
+    # Cell field of the length of the internal faces
+    T = ofVolField()
+    T.internal_data = np.arange(4.0)
+    result = patchIntegrals(subset,{'T':T},patches=['cyclicLeft'],operations=['sum'])
+    assert np.allclose(result['value'],subset.owner[subset.boundary['cyclicLeft'].faceSlice].sum())
+
+    # Surface fields are detected by their field type, all patches need values
+    phi = ofVolField()
+    phi.internal_data = np.zeros(4)
+    phi.fieldType = "surfaceField"
+    with pytest.raises(ValueError,match="no value for patch cyclicLeft"):
+        patchIntegrals(subset,{'phi':phi},patches=['cyclicLeft'],operations=['sum'])
+
+    # Patches without faces
+    with pytest.raises(ValueError,match="no faces"):
+        patchIntegrals(subset,{'T':T},patches=['cyclicRight'])
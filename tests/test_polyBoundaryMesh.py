@@ -0,0 +1,32 @@
+from ofReader import fvMesh, readPolyBoundaryMesh
+import numpy as np
+
+
+def test_readPolyBoundaryMesh():
+    boundary = readPolyBoundaryMesh('tests/testCase/processor0/constant/polyMesh/boundary')
+    assert len(boundary) == 12
+    assert boundary.names()[0] == 'cyclicLeft'
+    assert boundary['cyclicLeft'].inGroups == ['cyclic']
+    assert boundary['cyclicLeft'].neighbourPatch == 'cyclicRight'
+    assert boundary['procBoundary0to1'].type == 'processor'
+    assert boundary['procBoundary0to1'].nFaces == 121
+    assert len(boundary.findPatches('cyclic')) == 6
+
+
+def test_polyPatch_geometry():
+    mesh = fvMesh('tests/testCase')
+    assert mesh.boundary.names() == ['cyclicLeft','cyclicRight','cyclicTop',
+                                     'cyclicBottom','cyclicFront','cyclicBack']
+    for patch in mesh.boundary:
+        assert patch.nFaces == 484
+        # Each patch is one side of the unit cube
+        assert np.isclose(patch.magFaceAreas().sum(),1.0)
+        normal = patch.faceAreas().sum(axis=0)
+        assert np.isclose(np.abs(normal).sum(),1.0)
+        # All face centers lie in the plane of the cube side
+        direction = np.argmax(np.abs(normal))
+        assert np.ptp(patch.faceCenters()[:,direction]) < 1E-12
+
+    # Boundary faces are assigned to their patch
+    left = mesh.boundary['cyclicLeft']
+    assert np.all(mesh.boundary.whichPatch(np.arange(left.startFace,left.startFace+left.nFaces)) == left.index)
@@ -0,0 +1,71 @@
+from ofReader import fvMesh, sampleLine, fvMeshSubset, cellsInBox
+import numpy as np
+
+
+def test_sampleLine():
+    mesh = fvMesh('tests/testCase')
+    C = mesh.centers()
+
+    line = sampleLine(mesh,(0.01,0.51,0.51),(0.99,0.51,0.51),nPoints=50)
+    data = line.sample({'Cx':C[:,0],'C':C})
+    assert list(data.keys()) == ['x','Cx','C']
+    assert len(data['x']) == 50
+    assert np.allclose(data['x'][[0,-1]],[0.0,0.98])
+    # The sampled cell center is at most half a cell away from the point
+    assert np.all(np.abs(data['Cx']-line.points[:,0]) <= 0.5/22+1E-12)
+    assert data['C'].shape == (50,3)
+
+    # One sample point per traversed cell
+    line = sampleLine(mesh,(0.01,0.51,0.51),(0.99,0.51,0.51),type='midPoint',axis='x')
+    data = line.sample({'Cx':C[:,0]})
+    assert len(data['x']) == 22
+    assert np.allclose(data['Cx'],(np.arange(22)+0.5)/22)
+
+    # Points outside of the mesh are removed
+    line = sampleLine(mesh,(0.5,0.5,0.51),(1.5,0.5,0.51),nPoints=11)
+    assert len(line.points) == 6
+
+
+def test_sampleLine_graded():
+    # Eleven thin cells followed by eleven long cells in x, the containing
+    # long cell is mostly not among the nearest cell centers
+    mesh = fvMesh('tests/testCase')
+    def grading(x):
+        return np.where(x < 0.5,0.022*x,0.011+(x-0.5)*0.989/0.5)
+    points = mesh.points.copy()
+    points[:,0] = grading(points[:,0])
+    graded = fvMesh.fromArrays(points,mesh.compactFaces(),mesh.owner,mesh.neighbour)
+
+    rng = np.random.default_rng(3)
+    cells = rng.integers(0,graded.nCells,500)
+    ix = np.floor(mesh.centers()[cells,0]*22)
+    lower, upper = grading(ix/22), grading((ix+1)/22)
+    samples = mesh.centers()[cells] + rng.uniform(-0.45,0.45,(500,3))/22
+    samples[:,0] = lower + rng.uniform(0.02,0.3,500)*(upper-lower)
+    assert np.array_equal(graded.findCells(samples),cells)
+
+    line = sampleLine(graded,(0.001,0.51,0.51),(0.999,0.51,0.51),nPoints=50)
+    assert len(line.points) == 50
+    data = line.sample({'Cx':graded.centers()[:,0]})
+    assert np.all(np.abs(data['Cx']-line.points[:,0]) <= 0.5*0.989/11+1E-9)
+
+
+def test_findCells_hole():
+    # Graded mesh without the cells of a central box, points in the hole
+    # leave the mesh through a boundary face
+    mesh = fvMesh('tests/testCase')
+    points = mesh.points.copy()
+    points[:,0] = points[:,0]**3
+    graded = fvMesh.fromArrays(points,mesh.compactFaces(),mesh.owner,mesh.neighbour)
+    hole = cellsInBox(graded,(0.2,0.3,0.3),(0.6,0.7,0.7))
+    subset = fvMeshSubset(graded,np.setdiff1d(np.arange(graded.nCells),hole))
+    holed = subset.mesh
+
+    rng = np.random.default_rng(5)
+    samples = rng.uniform(0,1,(2000,3))
+    expected = graded.findCells(samples)
+    inHole = np.isin(expected,hole)
+    assert np.any(inHole)
+    cells = holed.findCells(samples)
+    assert np.all(cells[inHole] == -1)
+    assert np.array_equal(subset.cellMap[cells[~inHole]],expected[~inHole])
@@ -0,0 +1,214 @@
+from ofReader import fvMesh, cuttingPlane
+from ofReader.samplePlaneReader import samplePlaneReader, planeMeanVariance, readPlaneSeries
+import numpy as np
+import pytest
+
+
+def _writePlane(fname,values,pos,faces,points,faceSize=True):
+    """Write a plane in the format of the circAverage tool"""
+    with open(fname,'w') as f:
+        f.write(f"{len(values)}\n(\n")
+        f.write("".join(f"{v:.17g}\n" for v in values) + ")\n\n")
+        f.write(f"{len(pos)}\n(\n")
+        f.write("".join(f"({x:.17g} {y:.17g})\n" for x, y in pos) + ")\n\n")
+        f.write(f"{len(faces)}\n(\n")
+        f.write("".join((f"{len(face)}" if faceSize else "") + "(" + " ".join(map(str,face)) + ")\n"
+                        for face in faces) + ")\n\n")
+        f.write(f"{len(points)}\n(\n")
+        f.write("".join(f"({x:.17g} {y:.17g})\n" for x, y in points) + ")\n")
+
+
+def test_samplePlaneReader(tmp_path):
+    mesh = fvMesh('tests/testCase')
+    # Oblique plane with triangles, quadrilaterals and polygons
+    plane = cuttingPlane(mesh,(0.5,0.5,0.5),(1,2,3))
+    values = mesh.centers()[plane.cutCells,2]
+    offsets, labels = plane.compactFaces()
+
+    for faceSize in [True, False]:
+        fname = tmp_path / f"plane{faceSize}"
+        _writePlane(fname,values,plane.pos,plane.faces,plane.points,faceSize)
+        reader = samplePlaneReader()
+        reader.readFromFile(fname)
+
+        assert np.array_equal(reader.values,values)
+        assert np.array_equal(reader.pos,plane.pos)
+        assert np.array_equal(reader.points,plane.points)
+        readOffsets, readLabels = reader.compactFaces()
+        assert np.array_equal(readOffsets,offsets)
+        assert np.array_equal(readLabels,labels)
+        assert all(np.array_equal(a,b) for a, b in zip(reader.faces,plane.faces))
+
+    # Same plane as sampled directly
+    sampled = plane.sample(mesh.centers()[:,2])
+    assert len(sampled.triangles) == len(reader.triangles)
+    assert np.allclose(sampled.triValues,reader.triValues)
+
+
+def test_sharedGeometry():
+    mesh = fvMesh('tests/testCase')
+    # Plane coordinates are (x-0.5,0.5-z)
+    plane = cuttingPlane(mesh,(0.5,0.5,0.5),(0,1,0),e1=(1,0,0))
+    z = plane.sample(mesh.centers()[:,2])
+    x = plane.sample(mesh.centers()[:,0])
+
+    # The interpolators are built on first use and shared by both readers
+    assert z._geometry is x._geometry
+    assert z._geometry._delaunay is None and z._geometry._tri is None
+    _, vz = z.plotAlongLine((-0.3,0.4),(0.3,-0.4),nPoints=10)
+    _, vx = x.plotAlongLine((-0.3,0.4),(0.3,-0.4),nPoints=10)
+    assert np.allclose(vz,np.linspace(0.1,0.9,10))
+    assert np.allclose(vx,np.linspace(0.2,0.8,10))
+    assert x._geometry._tri is None
+
+    # Results of operators keep the geometry
+    product = 2*z
+    assert product._geometry is z._geometry
+    assert np.allclose(product.plotAlongLine((-0.3,0.4),(0.3,-0.4),nPoints=10)[1],2*vz)
+    assert np.allclose(product.triValues,2*z.triValues)
+
+
+def test_operators(tmp_path):
+    mesh = fvMesh('tests/testCase')
+    plane = cuttingPlane(mesh,(0.5,0.5,0.5),(1,2,3))
+    a = plane.sample(mesh.centers()[:,0]+1)
+    b = plane.sample(mesh.centers()[:,1]+2)
+    va, vb = a.values.copy(), b.values.copy()
+
+    for result, expected in [(a+b,va+vb), (a-b,va-vb), (a*b,va*vb), (a/b,va/vb), (a**2,va**2),
+                             (1+a,1+va), (1-a,1-va), (2*a,2*va), (2/a,2/va), (-a,-va), (abs(-a),va),
+                             (a*vb,va*vb)]:
+        assert result._geometry is a._geometry
+        assert np.allclose(result.values,expected)
+    # The geometry is shared and cannot be changed
+    assert not a.pos.flags.writeable and not a.points.flags.writeable
+
+    c = a*1
+    c += b
+    c -= 1
+    c *= 2
+    c /= b
+    c **= 2
+    assert np.allclose(c.values,(2*(va+vb-1)/vb)**2)
+    assert np.allclose(a.values,va)
+
+    # Integer values are converted if the result is not an integer
+    counts = samplePlaneReader()
+    counts.setData([1,2],[(0,0),(1,0)],[[0,1,2],[1,3,2]],[(0,0),(1,0),(0,1),(1,1)])
+    counts += 1
+    assert counts.values.dtype.kind == 'i'
+    counts /= 2
+    counts **= 0.5
+    assert np.allclose(counts.values,np.sqrt([1.0,1.5]))
+
+    other = cuttingPlane(mesh,(0.5,0.5,0.5),(0,0,1)).sample(mesh.centers()[:,0])
+    with pytest.raises(ValueError):
+        a + other
+
+    # Mean and variance of readers and of files
+    planes = [a, b, a*b]
+    mean, variance = planeMeanVariance(planes)
+    stacked = np.array([p.values for p in planes])
+    assert mean._geometry is a._geometry
+    assert np.allclose(mean.values,stacked.mean(axis=0))
+    assert np.allclose(variance.values,stacked.var(axis=0))
+
+    fnames = []
+    for i, p in enumerate(planes):
+        fnames.append(tmp_path / f"plane{i}")
+        _writePlane(fnames[-1],p.values,p.pos,p.faces,p.points)
+    mean, variance = planeMeanVariance(fnames,ddof=1)
+    assert np.allclose(mean.values,stacked.mean(axis=0))
+    assert np.allclose(variance.values,stacked.var(axis=0,ddof=1))
+
+    # The variance requires more planes than the delta degrees of freedom
+    with pytest.raises(ValueError):
+        planeMeanVariance([a],ddof=1)
+
+
+def test_readPlaneSeries(tmp_path):
+    mesh = fvMesh('tests/testCase')
+    plane = cuttingPlane(mesh,(0.5,0.5,0.5),(1,2,3))
+    values = [mesh.centers()[plane.cutCells,i] for i in range(3)]
+    for i, v in enumerate(values):
+        (tmp_path / f"{i}").mkdir()
+        _writePlane(tmp_path / f"{i}" / "T",v,plane.pos,plane.faces,plane.points)
+
+    reader, T = readPlaneSeries(str(tmp_path / "*" / "T"),nWorkers=2)
+    assert T.shape == (3,len(plane.cutCells))
+    assert np.array_equal(T,np.array(values))
+    assert np.array_equal(reader.pos,plane.pos)
+
+    # Files with a different number of faces
+    _writePlane(tmp_path / "other",values[0][:-1],plane.pos[:-1],plane.faces[:-1],plane.points)
+    with pytest.raises(ValueError):
+        readPlaneSeries([tmp_path / "0" / "T",tmp_path / "other"])
+
+
+def test_sampleLines():
+    mesh = fvMesh('tests/testCase')
+    # Plane coordinates are (x-0.5,0.5-z)
+    plane = cuttingPlane(mesh,(0.5,0.5,0.5),(0,1,0),e1=(1,0,0))
+    reader = plane.sample(mesh.centers()[:,2])
+    U = plane.sample(mesh.centers())
+
+    # Vertical profiles at several x positions
+    u = np.linspace(-0.3,0.3,7)
+    starts = np.column_stack((u,np.full(7,0.4)))
+    ends = np.column_stack((u,np.full(7,-0.4)))
+    x, v = reader.sampleLines(starts,ends,nPoints=20)
+    assert x.shape == v.shape == (7,20)
+    assert np.allclose(x,np.linspace(0,0.8,20)[None,:])
+    assert np.allclose(v,np.linspace(0.1,0.9,20)[None,:])
+
+    # Same as single lines
+    for i in range(7):
+        xi, vi = reader.plotAlongLine(starts[i],ends[i],nPoints=20)
+        assert np.allclose(xi,x[i]) and np.allclose(vi,v[i])
+
+    # Vector values
+    _, vU = U.sampleLines(starts,ends,nPoints=20)
+    assert vU.shape == (7,20,3)
+    assert np.allclose(vU[...,0],(u+0.5)[:,None])
+
+    # Face values are the cell values of the cells containing the points
+    _, vFace = reader.sampleLines(starts,ends,nPoints=20,interpolation='face')
+    assert np.allclose(vFace,(np.floor(np.linspace(0.1,0.9,20)*22)+0.5)/22)
+
+    # Points outside of the plane
+    _, vOut = reader.sampleLines([(0,0)],[(2,0)],nPoints=5,interpolation='face')
+    assert np.all(np.isnan(vOut[0,3:]))
+
+
+def test_triangulation():
+    # Triangle, quadrilateral and a hexagon with the reflex point 5
+    points = np.array([(0,0),(1,0),(0,1),(1,1),(2,0),(2,1),(3,0.5),(2.5,2),(1.5,2)],dtype=float)
+    faces = [[0,1,2],[1,4,5,3],[4,6,5,7,8,3]]
+    reader = samplePlaneReader()
+    reader.setData([1.0,2.0,3.0],[(0.3,0.3),(1.5,0.5),(2.2,1.0)],faces,points)
+
+    assert reader.triangles.shape == (1+2+4,3)
+    assert np.array_equal(reader.triFaces,[0,1,1,2,2,2,2])
+    assert np.array_equal(reader.triangles[3:],[[3,4,6],[3,6,5],[3,5,7],[7,8,3]])
+    assert np.array_equal(reader.triValues,[1,2,2,3,3,3,3])
+
+
+def test_triangulationNonConvex():
+    # L-shaped hexagon with a reflex point and a clockwise arrow head, the
+    # fan from the first point would leave the faces
+    points = np.array([(0,0),(2,0),(2,1),(1,1),(1,2),(0,2),
+                       (3,0),(4,1),(5,0),(4,3)],dtype=float)
+    faces = [[2,3,4,5,0,1],[6,9,8,7]]
+    reader = samplePlaneReader()
+    reader.setData([1.0,2.0],[(0.5,0.5),(4,1.5)],faces,points)
+
+    assert reader.triangles.shape == (4+2,3)
+    assert np.array_equal(reader.triFaces,[0,0,0,0,1,1])
+    # The triangles cover the faces with their orientation
+    p = points[reader.triangles]
+    area = 0.5*((p[:,1,0]-p[:,0,0])*(p[:,2,1]-p[:,0,1])-(p[:,1,1]-p[:,0,1])*(p[:,2,0]-p[:,0,0]))
+    assert np.allclose(np.bincount(reader.triFaces,area),[3,-2])
+    assert np.all(area[:4] > 0) and np.all(area[4:] < 0)
+    # Convex faces are still fan-triangulated
+    reader.setData([1.0],[(0.5,0.5)],[[0,1,2,3,4,5]],np.array([(0,0),(2,0),(3,1),(2,2),(0,2),(-1,1)],dtype=float))
+    assert np.array_equal(reader.triangles,[[0,1,2],[0,2,3],[0,3,4],[0,4,5]])
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import subprocess
+import sys
+from ofReader import fvMesh, sharedMesh, attachSharedMesh
+import numpy as np
+
+
+def _meshSummary(descriptor):
+    mesh = attachSharedMesh(descriptor)
+    return mesh.nCells, mesh.volumes().sum(), mesh.centers().mean(axis=0), mesh.boundary.names()
+
+
+def test_sharedMesh():
+    mesh = fvMesh('tests/testCase')
+    with sharedMesh(mesh) as shared:
+        attached = attachSharedMesh(shared.descriptor)
+        assert attached is attachSharedMesh(shared.descriptor)
+        assert np.array_equal(attached.owner,mesh.owner)
+        assert np.array_equal(attached.compactFaces()[1],mesh.compactFaces()[1])
+        assert not attached.points.flags.writeable
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_meshSummary,[shared.descriptor]*4))
+        for nCells, volume, center, names in results:
+            assert nCells == mesh.nCells
+            assert np.isclose(volume,1.0)
+            assert np.allclose(center,mesh.centers().mean(axis=0))
+            assert names == mesh.boundary.names()
+    assert shared.closed
+
+
+def test_sharedMeshWithoutGeometry():
+    mesh = fvMesh('tests/testCase')
+    with sharedMesh(mesh,geometry=False) as shared:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            nCells, volume, _, _ = executor.submit(_meshSummary,shared.descriptor).result()
+    assert nCells == mesh.nCells
+    assert np.isclose(volume,1.0)
+
+
+_trackerScript = """
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from ofReader import fvMesh, sharedMesh, attachSharedMesh
+
+def nCells(descriptor):
+    return attachSharedMesh(descriptor).nCells
+
+if __name__ == '__main__':
+    mesh = fvMesh('tests/testCase')
+    with sharedMesh(mesh) as shared:
+        attachSharedMesh(shared.descriptor)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=2,mp_context=context) as executor:
+            print(sum(executor.map(nCells,[shared.descriptor]*4)))
+"""
+
+
+def test_sharedMeshResourceTracker(tmp_path):
+    # Attaching in the parent and in the workers must neither unlink the
+    # blocks early nor make the resource tracker report errors or leaks
+    script = tmp_path / 'attach.py'
+    script.write_text(_trackerScript)
+    env = dict(os.environ,PYTHONPATH=os.getcwd())
+    result = subprocess.run([sys.executable,str(script)],capture_output=True,text=True,env=env)
+    assert result.returncode == 0
+    assert result.stdout.strip() == str(4*fvMesh('tests/testCase').nCells)
+    assert 'KeyError' not in result.stderr
+    assert 'leaked' not in result.stderr
@@ -0,0 +1,17 @@
+from ofReader import fvMesh, volPointInterpolation
+import numpy as np
+
+
+def test_volPointInterpolation():
+    mesh = fvMesh('tests/testCase')
+    interpolator = volPointInterpolation(mesh)
+
+    # Points inside the periodic box are surrounded by eight cells and
+    # reproduce a linear field exactly
+    interior = np.diff(mesh.pointCells().indptr) == 8
+    pointC = interpolator.interpolate(mesh.centers())
+    assert pointC.shape == (mesh.nPoints,3)
+    assert np.allclose(pointC[interior],mesh.points[interior])
+
+    # A constant field stays constant on all points
+    assert np.allclose(interpolator.interpolate(np.full(mesh.nCells,3.0)),3.0)